@@ -0,0 +1,160 @@
+"""
+Message Memory Benchmark
+
+Compares the memory used by DiscordMessage with the plain dataclass it
+replaced, for messages parsed from JSON API pages the way the reader does.
+
+Run from the repository root:
+    python -m benchmarks.message_memory [message count]
+"""
+
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from models.message import DiscordMessage
+
+@dataclass
+class LegacyDiscordMessage:
+    """
+    The previous message model: a dataclass with a datetime and no slots.
+    """
+    id: str
+    content: str
+    username: str
+    user_id: str
+    timestamp: datetime
+    channel_id: str
+    attachments_count: int = 0
+    embeds_count: int = 0
+    mentions_count: int = 0
+
+def build_pages(count: int, page_size: int = 100, authors: int = 200, channels: int = 20) -> List[str]:
+    """
+    Build raw API pages of messages, serialized like Discord's responses.
+
+    Args:
+        count: Number of messages
+        page_size: Messages per page
+        authors: Number of distinct authors
+        channels: Number of distinct channels
+
+    Returns:
+        List of JSON pages
+    """
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    words = ["gm", "eth", "btc", "liquidity", "airdrop", "pool", "bridge", "wen", "launch", "staking"]
+    pages = []
+
+    for page_start in range(0, count, page_size):
+        page = []
+        for index in range(page_start, min(count, page_start + page_size)):
+            author = rng.randrange(authors)
+            page.append({
+                "id": str(1300000000000000000 + index),
+                "channel_id": str(1200000000000000000 + index % channels),
+                "content": " ".join(rng.choices(words, k=rng.randint(1, 30))),
+                "timestamp": (start + timedelta(seconds=index * 7)).isoformat() + "+00:00",
+                "author": {"id": str(1100000000000000000 + author), "username": f"crypto_user_{author}"},
+                "attachments": [],
+                "embeds": [],
+                "mentions": []
+            })
+        pages.append(json.dumps(page))
+
+    return pages
+
+def convert(message_class: Callable, raw: dict):
+    """
+    Convert a raw API message like DiscordReaderClient does.
+
+    Args:
+        message_class: Message model to create
+        raw: Raw message data
+
+    Returns:
+        Message object
+    """
+    author = raw["author"]
+    return message_class(
+        id=raw["id"],
+        content=raw["content"],
+        username=author["username"],
+        user_id=author["id"],
+        timestamp=datetime.fromisoformat(raw["timestamp"]).replace(tzinfo=None),
+        channel_id=raw["channel_id"],
+        attachments_count=len(raw["attachments"]),
+        embeds_count=len(raw["embeds"]),
+        mentions_count=len(raw["mentions"])
+    )
+
+def build_messages(message_class: Callable, pages: List[str]) -> list:
+    """
+    Parse every page into messages.
+
+    Args:
+        message_class: Message model to create
+        pages: JSON pages to parse
+
+    Returns:
+        List of messages
+    """
+    messages = []
+    for page in pages:
+        messages.extend(convert(message_class, raw) for raw in json.loads(page))
+    return messages
+
+def measure(message_class: Callable, pages: List[str]) -> tuple:
+    """
+    Measure the time to build the messages and the memory they retain.
+
+    Args:
+        message_class: Message model to create
+        pages: JSON pages to parse
+
+    Returns:
+        Tuple of (retained bytes, seconds to build)
+    """
+    # Timed without tracing, which slows allocations down
+    gc.collect()
+    start_time = time.perf_counter()
+    messages = build_messages(message_class, pages)
+    elapsed = time.perf_counter() - start_time
+    del messages
+
+    gc.collect()
+    tracemalloc.start()
+    messages = build_messages(message_class, pages)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del messages
+    return retained, elapsed
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    pages = build_pages(count)
+
+    print(f"{count} messages")
+    results = {}
+    for message_class in (LegacyDiscordMessage, DiscordMessage):
+        retained, elapsed = measure(message_class, pages)
+        results[message_class] = retained
+        print(
+            f"{message_class.__name__:<22} {retained / 2**20:8.1f} MiB "
+            f"({retained / count:6.0f} bytes/message), built in {elapsed:.2f} s"
+        )
+
+    saved = 1 - results[DiscordMessage] / results[LegacyDiscordMessage]
+    print(f"DiscordMessage uses {saved:.0%} less memory")
+
+if __name__ == "__main__":
+    main()
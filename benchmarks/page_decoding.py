@@ -0,0 +1,173 @@
+"""
+Page Decoding Benchmark
+
+Measures the CPU time spent turning one 100-message API page into messages:
+the previous path (standard json, ISO timestamp parsing, one object per
+message) against the page decoder (orjson when installed, snowflake times,
+columnar batch).
+
+Pages are generated with every field Discord returns for a message, so the
+decoder has as much to skip as on real responses.
+
+Run from the repository root:
+    python -m benchmarks.page_decoding [page count]
+"""
+
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from clients.page_decoder import JSON_BACKEND, decode_message_pages
+from models.message import DiscordMessage
+from utils.snowflake import datetime_to_snowflake
+
+def build_raw_message(rng: random.Random, moment: datetime, channel_id: str) -> Dict[str, Any]:
+    """
+    Build a raw message with the fields of a real API response.
+
+    Args:
+        rng: Random generator
+        moment: Creation time of the message
+        channel_id: ID of the channel
+
+    Returns:
+        Raw message data
+    """
+    words = ["gm", "eth", "btc", "liquidity", "airdrop", "pool", "bridge", "wen", "launch", "staking"]
+    author = rng.randrange(200)
+    snowflake = datetime_to_snowflake(moment) + rng.randrange(1 << 22)
+    return {
+        "type": 0,
+        "content": " ".join(rng.choices(words, k=rng.randint(1, 30))),
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "timestamp": moment.isoformat(timespec="microseconds") + "+00:00",
+        "edited_timestamp": None,
+        "flags": 0,
+        "components": [],
+        "id": str(snowflake),
+        "channel_id": channel_id,
+        "author": {
+            "id": str(1100000000000000000 + author),
+            "username": f"crypto_user_{author}",
+            "avatar": "%032x" % rng.getrandbits(128),
+            "discriminator": "0",
+            "public_flags": 0,
+            "flags": 0,
+            "banner": None,
+            "accent_color": None,
+            "global_name": f"Crypto User {author}",
+            "avatar_decoration_data": None,
+            "banner_color": None,
+            "clan": None
+        },
+        "pinned": False,
+        "mention_everyone": False,
+        "tts": False
+    }
+
+def build_pages(count: int) -> List[bytes]:
+    """
+    Build JSON bodies of 100-message pages, newest message first like the API.
+
+    Args:
+        count: Number of pages
+
+    Returns:
+        List of page bodies
+    """
+    rng = random.Random(42)
+    moment = datetime(2025, 1, 1)
+    pages = []
+    for _ in range(count):
+        page = []
+        for _ in range(100):
+            moment -= timedelta(seconds=rng.randint(1, 30))
+            page.append(build_raw_message(rng, moment, "1200000000000000000"))
+        pages.append(json.dumps(page).encode("utf-8"))
+    return pages
+
+def legacy_convert(raw_message: Dict[str, Any]) -> Optional[DiscordMessage]:
+    """
+    Convert a raw message the way the reader did before the page decoder.
+
+    Args:
+        raw_message: Raw message data
+
+    Returns:
+        DiscordMessage object, or None for messages without content
+    """
+    content = raw_message.get('content', '')
+    if not content:
+        return None
+    author = raw_message.get('author', {})
+    return DiscordMessage(
+        id=raw_message.get('id', '0'),
+        content=content,
+        username=author.get('username', 'Unknown'),
+        user_id=author.get('id', '0'),
+        timestamp=datetime.fromisoformat(raw_message['timestamp'].rstrip('Z')).replace(tzinfo=None),
+        channel_id=raw_message.get('channel_id', '0'),
+        attachments_count=len(raw_message.get('attachments', [])),
+        embeds_count=len(raw_message.get('embeds', [])),
+        mentions_count=len(raw_message.get('mentions', []))
+    )
+
+def legacy_decode(body: bytes) -> List[DiscordMessage]:
+    """
+    Decode a page with the standard library, checking the threshold on the oldest message.
+
+    Args:
+        body: Page body
+
+    Returns:
+        List of messages
+    """
+    page = json.loads(body)
+    datetime.fromisoformat(page[-1]['timestamp'].rstrip('Z')).replace(tzinfo=None)
+    return [message for message in map(legacy_convert, page) if message]
+
+def measure(decode: Callable[[bytes], Any], pages: List[bytes], rounds: int = 3) -> float:
+    """
+    Measure the CPU time to decode a page.
+
+    Args:
+        decode: Function decoding one page body
+        pages: Page bodies
+        rounds: Number of passes over the pages; the fastest one counts
+
+    Returns:
+        Microseconds of CPU time per page
+    """
+    best = float("inf")
+    for _ in range(rounds):
+        start_time = time.process_time()
+        for body in pages:
+            decode(body)
+        best = min(best, time.process_time() - start_time)
+    return best / len(pages) * 1e6
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    pages = build_pages(count)
+
+    # The new decoder and the old one must agree on every message
+    for body in pages[:20]:
+        assert decode_message_pages([body]).to_messages() == legacy_decode(body)
+
+    before = measure(legacy_decode, pages)
+    after = measure(lambda body: decode_message_pages([body]), pages)
+    after_objects = measure(lambda body: decode_message_pages([body]).to_messages(), pages)
+
+    print(f"{count} pages of 100 messages, JSON backend: {JSON_BACKEND}")
+    print(f"before (json, ISO timestamps, objects): {before:8.0f} us/page")
+    print(f"after (page decoder, batch):            {after:8.0f} us/page ({before / after:.1f}x faster)")
+    print(f"after, converted to objects:            {after_objects:8.0f} us/page ({before / after_objects:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
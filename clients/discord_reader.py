@@ -3,31 +3,54 @@ Discord Reader Client
 
 This module provides a client for reading messages from Discord using a user token.
 It handles API communication, rate limiting, and data extraction.
+
+All requests are made asynchronously over a single long-lived aiohttp session,
+so message collection never blocks the event loop shared with the Discord writer.
 """
 
+import asyncio
 import logging
-import random
-import time
-from datetime import datetime, timedelta
-import requests
+from datetime import timedelta
 from typing import List, Dict, Optional, Any, Tuple
 
+import aiohttp
+
+from clients.page_decoder import JSON_BACKEND, loads
+from clients.rate_limiter import RateLimiter
 from models.message import DiscordMessage
+from models.message_batch import MessageBatch
+from utils.snowflake import datetime_to_snowflake, split_snowflake_range, utc_now
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of message pages requested per channel and collection
+MAX_REQUESTS_PER_CHANNEL = 500
+
+# Maximum number of times a rate limited request is retried
+MAX_RATE_LIMIT_RETRIES = 5
+
 class DiscordReaderClient:
     """
     Client for interacting with Discord API to read messages.
     Uses a user token for authentication.
     """
     
-    def __init__(self, user_token: str):
+    def __init__(
+        self,
+        user_token: str,
+        max_connections: int = 10,
+        request_timeout: float = 30.0,
+        max_range_fetches: int = 4
+    ):
         """
         Initialize the Discord reader client.
         
         Args:
             user_token: Discord user token for authentication
+            max_connections: Maximum number of pooled keep-alive connections
+            request_timeout: Total timeout in seconds for a single request
+            max_range_fetches: Maximum number of sub-ranges of one channel's
+                time window fetched in parallel
         """
         self.base_url = "https://discord.com/api/v9"
         self.headers = {
@@ -36,23 +59,52 @@ class DiscordReaderClient:
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.81 Safari/537.36"
         }
         
-        # Rate limiting state
-        self.rate_limit_remaining = 5
-        self.rate_limit_reset = 0
+        # Connection pool settings; the session itself is created lazily
+        # because aiohttp sessions must be created inside a running event loop
+        self.max_connections = max_connections
+        self.request_timeout = request_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Per-route bucket and global rate limit tracking
+        self.rate_limiter = RateLimiter()
+        self.max_range_fetches = max(1, max_range_fetches)
+        logger.debug(f"Decoding API responses with {JSON_BACKEND}")
     
-    def _handle_rate_limit(self) -> None:
+    async def _get_session(self) -> aiohttp.ClientSession:
         """
-        Handle Discord API rate limits by waiting if necessary.
+        Get the shared HTTP session, creating it on first use.
+        
+        Returns:
+            Long-lived aiohttp session backed by a keep-alive connection pool
         """
-        if self.rate_limit_remaining <= 1:
-            current_time = time.time()
-            sleep_time = max(0, self.rate_limit_reset - current_time) + 0.5
-            
-            if sleep_time > 0:
-                logger.info(f"Rate limit reached. Sleeping for {sleep_time:.2f} seconds...")
-                time.sleep(sleep_time)
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout)
+            )
+        return self._session
     
-    def _make_request(self, endpoint: str, method: str = "GET", payload: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+    async def close(self) -> None:
+        """
+        Close the underlying HTTP session and its connection pool.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self) -> 'DiscordReaderClient':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def _make_request(self, endpoint: str, method: str = "GET", payload: Optional[Dict[str, Any]] = None) -> Optional[Any]:
         """
         Make a request to the Discord API with rate limit handling.
         
@@ -64,51 +116,57 @@ class DiscordReaderClient:
         Returns:
             Response data if successful, None otherwise
         """
-        self._handle_rate_limit()
+        if method not in ("GET", "POST"):
+            logger.error(f"Unsupported HTTP method: {method}")
+            return None
         
         url = f"{self.base_url}{endpoint}"
         
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=self.headers)
-            elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=payload)
-            else:
-                logger.error(f"Unsupported HTTP method: {method}")
-                return None
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await self.rate_limiter.acquire(method, endpoint)
             
-            # Update rate limit information from headers
-            self.rate_limit_remaining = int(response.headers.get("X-RateLimit-Remaining", 5))
-            self.rate_limit_reset = float(response.headers.get("X-RateLimit-Reset", time.time() + 5))
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                retry_after = response.json().get("retry_after", 1)
-                logger.warning(f"Rate limited. Retrying after {retry_after} seconds")
-                time.sleep(retry_after)
-                return self._make_request(endpoint, method, payload)
-            
-            # Handle errors
-            if response.status_code != 200:
-                logger.error(f"API error: {response.status_code} - {response.text}")
+            try:
+                session = await self._get_session()
+                async with session.request(method, url, json=payload) as response:
+                    # Update the route's bucket from the response headers
+                    self.rate_limiter.update(method, endpoint, response.headers)
+                    
+                    # Handle rate limiting
+                    if response.status == 429:
+                        data = await response.json(content_type=None)
+                        retry_after = float(data.get("retry_after", 1))
+                        is_global = bool(data.get("global")) or response.headers.get("X-RateLimit-Scope") == "global"
+                        
+                        # The limiter makes the retry (and every other request in the bucket) wait
+                        self.rate_limiter.on_rate_limited(method, endpoint, retry_after, is_global)
+                        if attempt < MAX_RATE_LIMIT_RETRIES:
+                            logger.warning(f"Rate limited{' (global)' if is_global else ''}. Retrying after {retry_after} seconds")
+                        continue
+                    
+                    # Handle errors
+                    if response.status != 200:
+                        logger.error(f"API error: {response.status} - {await response.text()}")
+                        return None
+                    
+                    return loads(await response.read())
+                
+            except Exception as e:
+                logger.error(f"Request error: {str(e)}")
                 return None
-            
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Request error: {str(e)}")
-            return None
+        
+        logger.error(f"Still rate limited on {endpoint} after {MAX_RATE_LIMIT_RETRIES} retries, giving up")
+        return None
     
-    def get_user_guilds(self) -> List[Dict[str, Any]]:
+    async def get_user_guilds(self) -> List[Dict[str, Any]]:
         """
         Get all guilds (servers) the user is a member of.
         
         Returns:
             List of guild objects
         """
-        return self._make_request("/users/@me/guilds") or []
+        return await self._make_request("/users/@me/guilds") or []
     
-    def get_guild_channels(self, guild_id: str) -> List[Dict[str, Any]]:
+    async def get_guild_channels(self, guild_id: str) -> List[Dict[str, Any]]:
         """
         Get all channels in a guild.
         
@@ -118,9 +176,9 @@ class DiscordReaderClient:
         Returns:
             List of channel objects
         """
-        return self._make_request(f"/guilds/{guild_id}/channels") or []
+        return await self._make_request(f"/guilds/{guild_id}/channels") or []
     
-    def get_channel_info(self, channel_id: str) -> Optional[Dict[str, Any]]:
+    async def get_channel_info(self, channel_id: str) -> Optional[Dict[str, Any]]:
         """
         Get information about a channel.
         
@@ -130,9 +188,15 @@ class DiscordReaderClient:
         Returns:
             Channel information if successful, None otherwise
         """
-        return self._make_request(f"/channels/{channel_id}")
+        return await self._make_request(f"/channels/{channel_id}")
     
-    def get_messages(self, channel_id: str, limit: int = 100, before: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_messages(
+        self,
+        channel_id: str,
+        limit: int = 100,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get messages from a channel with pagination.
         
@@ -140,6 +204,7 @@ class DiscordReaderClient:
             channel_id: ID of the channel
             limit: Maximum number of messages to retrieve (max 100)
             before: Message ID to get messages before
+            after: Message ID to get messages after
             
         Returns:
             List of message objects
@@ -147,126 +212,248 @@ class DiscordReaderClient:
         endpoint = f"/channels/{channel_id}/messages?limit={limit}"
         if before:
             endpoint += f"&before={before}"
+        if after:
+            endpoint += f"&after={after}"
         
-        return self._make_request(endpoint) or []
+        return await self._make_request(endpoint) or []
     
-    def collect_messages(self, channel_id: str, days: int = 1) -> Tuple[List[DiscordMessage], str]:
+    async def collect_messages(
+        self,
+        channel_id: str,
+        days: int = 1,
+        after: Optional[str] = None
+    ) -> Tuple[List[DiscordMessage], str]:
         """
         Collect messages from a channel for a specified time period.
         
         Args:
             channel_id: ID of the channel
             days: Number of days to look back
+            after: Only collect messages newer than this message ID. When given,
+                pages forward from the cursor instead of backwards from now.
             
         Returns:
             Tuple of (list of message objects, channel name)
+        
+        Raises:
+            RuntimeError: If part of the window could not be fetched
+        """
+        batch, channel_name = await self.collect_message_batch(channel_id, days, after=after)
+        return batch.to_messages(), channel_name
+    
+    async def collect_message_batch(
+        self,
+        channel_id: str,
+        days: int = 1,
+        after: Optional[str] = None
+    ) -> Tuple[MessageBatch, str]:
+        """
+        Collect messages from a channel for a specified time period into a columnar batch.
+        
+        Snowflakes encode their creation time, so instead of paging backwards
+        from the newest message until a page crosses the window boundary, the
+        boundary is turned into a snowflake and the window is paged forward
+        from it: a window of N messages takes ceil(N / 100) requests, plus one
+        if the last page is full. The raw pages are packed into the batch
+        directly, without creating a message object per message.
+        
+        Args:
+            channel_id: ID of the channel
+            days: Number of days to look back
+            after: Only collect messages newer than this message ID, e.g. the
+                last message seen by a previous run
+            
+        Returns:
+            Tuple of (message batch, channel name)
+        
+        Raises:
+            RuntimeError: If part of the window could not be fetched. Nothing is
+                returned then, so callers never mistake a window with a hole
+                for a complete one.
         """
-
-        MAX_TOTAL_REQUESTS = 500
-        total_requests = 0
-
         # Get channel information to include in the return value
-        channel_info = self.get_channel_info(channel_id)
+        channel_info = await self.get_channel_info(channel_id)
         channel_name = channel_info.get('name', f"Channel {channel_id}") if channel_info else f"Channel {channel_id}"
         
-        # Calculate time threshold
-        time_threshold = datetime.now() - timedelta(days=days)
+        if after:
+            start = int(after) + 1
+        else:
+            start = datetime_to_snowflake(utc_now() - timedelta(days=days))
+        
+        batch = MessageBatch.from_pages(await self._collect_window(channel_id, start))
+        logger.info(f"Collected {len(batch)} {'new ' if after else ''}messages from channel {channel_name}")
+        return batch, channel_name
+    
+    async def _collect_window(self, channel_id: str, start: int) -> List[List[Dict[str, Any]]]:
+        """
+        Page through a channel from a snowflake up to the newest message, in parallel if it is busy.
+        
+        The first page is fetched on its own: a short one is the whole window.
+        Otherwise the time it covers gives an estimate of the pages left, and
+        the rest of the window is split into that many sub-ranges, at most
+        max_range_fetches and at most the requests left in the channel's rate
+        limit bucket. The sub-ranges are paged concurrently, then their pages
+        are merged in order. Each extra sub-range costs at most one request
+        more than paging the window serially.
+        
+        Args:
+            channel_id: ID of the channel
+            start: First snowflake of the window, inclusive
+            
+        Returns:
+            Pages of raw message data, oldest first, without duplicate messages
+        
+        Raises:
+            RuntimeError: If a page request fails or a sub-range other than the
+                newest one hits its request cap
+        """
+        messages = await self._get_page(channel_id, after=str(start - 1))
+        first_page = sorted(messages, key=lambda m: int(m['id']))
+        if len(first_page) < 100:
+            return [first_page] if first_page else []
+        
+        rest_start = int(first_page[-1]['id']) + 1
+        rest_end = datetime_to_snowflake(utc_now()) + (1 << 22)
+        parts = self._count_range_fetches(channel_id, first_page, rest_start, rest_end)
+        max_requests = -(-(MAX_REQUESTS_PER_CHANNEL - 1) // parts)
         
-        # Collect messages
-        all_messages = []
-        last_id = None
+        if parts == 1:
+            return [first_page] + await self._collect_range(channel_id, rest_start, max_requests=max_requests)
         
+        logger.info(f"Fetching channel {channel_id} in {parts} parallel sub-ranges")
+        ranges = split_snowflake_range(rest_start, rest_end, parts)
+        tasks = [
+            # The newest sub-range stays open so messages posted meanwhile are not cut off
+            asyncio.create_task(self._collect_range(channel_id, low, high if index < len(ranges) - 1 else None, max_requests))
+            for index, (low, high) in enumerate(ranges)
+        ]
         try:
-            while True:
-                # Increment request counter
-                total_requests += 1
-                
-                # Check if we've reached the request cap
-                if total_requests >= MAX_TOTAL_REQUESTS:
-                    logger.warning(f"Request cap reached ({MAX_TOTAL_REQUESTS}). Stopping further requests for channel {channel_id}.")
-                    break
-                
-                # Get batch of messages
-                messages = self.get_messages(channel_id, limit=100, before=last_id)
-                
-                # Stop if no messages returned
-                if not messages or len(messages) == 0:
-                    break
-                
-                # Check if we've reached messages older than our threshold
-                # Convert ISO string to datetime and ensure timezone awareness is consistent
-                oldest_msg_time = datetime.fromisoformat(messages[-1]['timestamp'].rstrip('Z')).replace(tzinfo=None)
-                if oldest_msg_time < time_threshold:
-                    # Process messages until we hit the threshold
-                    for msg in messages:
-                        msg_time = datetime.fromisoformat(msg['timestamp'].rstrip('Z')).replace(tzinfo=None)
-                        if msg_time >= time_threshold:
-                            message = self._convert_to_message_model(msg)
-                            if message:
-                                all_messages.append(message)
-                    break
-                
-                # Process all messages in this batch
-                for msg in messages:
-                    message = self._convert_to_message_model(msg)
-                    if message:
-                        all_messages.append(message)
-                
-                # Update last_id for pagination
-                last_id = messages[-1]['id']
-                
-                # Add a small delay to be gentle with the API
-                time.sleep(0.5 + random.random())
+            results = await asyncio.gather(*tasks)
+        finally:
+            # One failed sub-range fails the window, so stop fetching the others
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return self._merge_pages([[first_page]] + results)
+    
+    def _count_range_fetches(self, channel_id: str, first_page: List[Dict[str, Any]], start: int, end: int) -> int:
+        """
+        Choose the number of sub-ranges to fetch the rest of a window with.
+        
+        Args:
+            channel_id: ID of the channel
+            first_page: First page of the window, oldest first
+            start: First snowflake of the rest of the window, inclusive
+            end: Snowflake ending the window, exclusive
             
-            logger.info(f"Collected {len(all_messages)} messages from channel {channel_name}")
-            return all_messages, channel_name
+        Returns:
+            Number of sub-ranges, at least 1
+        """
+        # The first page's message rate predicts the number of pages left
+        page_span_ms = max(1, (int(first_page[-1]['id']) >> 22) - (int(first_page[0]['id']) >> 22))
+        estimated_pages = -(-((end >> 22) - (start >> 22)) // page_span_ms)
+        parts = min(self.max_range_fetches, estimated_pages)
+        
+        # Never start more fetches than the channel's bucket allows without waiting
+        budget = self.rate_limiter.remaining_budget("GET", f"/channels/{channel_id}/messages")
+        if budget is not None:
+            parts = min(parts, budget)
+        
+        return max(1, parts)
+    
+    @staticmethod
+    def _merge_pages(results: List[List[List[Dict[str, Any]]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Merge the pages of consecutive sub-ranges, dropping messages seen twice.
+        
+        Args:
+            results: Pages of each sub-range, sub-ranges and pages oldest first
             
-        except Exception as e:
-            logger.error(f"Error collecting messages from channel {channel_id}: {str(e)}")
-            return [], channel_name
+        Returns:
+            Merged pages, oldest first
+        """
+        seen = set()
+        merged = []
+        for pages in results:
+            for page in pages:
+                page = [message for message in page if message['id'] not in seen]
+                seen.update(message['id'] for message in page)
+                if page:
+                    merged.append(page)
+        return merged
     
-    def _convert_to_message_model(self, raw_message: Dict[str, Any]) -> Optional[DiscordMessage]:
+    async def _get_page(self, channel_id: str, after: str) -> List[Dict[str, Any]]:
         """
-        Convert a raw API message to a DiscordMessage model.
+        Get the page of messages following a message ID.
+        
+        Unlike get_messages, a failed request raises instead of looking like an
+        empty page, which would mean the channel has no newer messages.
         
         Args:
-            raw_message: Raw message data from the API
+            channel_id: ID of the channel
+            after: Message ID to get messages after
             
         Returns:
-            DiscordMessage object or None if conversion fails
+            List of raw message data, newest first
+        
+        Raises:
+            RuntimeError: If the request fails
         """
-        try:
-            # Skip messages without content
-            content = raw_message.get('content', '')
-            if not content:
-                return None
+        messages = await self._make_request(f"/channels/{channel_id}/messages?limit=100&after={after}")
+        if messages is None:
+            raise RuntimeError(f"Failed to fetch messages after {after} from channel {channel_id}")
+        return messages
+    
+    async def _collect_range(
+        self,
+        channel_id: str,
+        start: int,
+        end: Optional[int] = None,
+        max_requests: int = MAX_REQUESTS_PER_CHANNEL
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Page forward through a snowflake range of a channel.
+        
+        Args:
+            channel_id: ID of the channel
+            start: First snowflake of the range, inclusive
+            end: Snowflake ending the range, exclusive; None to page up to the newest message
+            max_requests: Maximum number of page requests to make
             
-            # Get user info
-            author = raw_message.get('author', {})
-            username = author.get('username', 'Unknown')
-            user_id = author.get('id', '0')
+        Returns:
+            Pages of raw message data in the range, oldest first. When the request
+            cap is hit on an open range, the pages fetched so far, which are
+            still contiguous from its start.
+        
+        Raises:
+            RuntimeError: If a page request fails, or the request cap is hit
+                before the end of a bounded range, which would leave a hole
+                before the next range
+        """
+        pages = []
+        cursor = str(start - 1)
+        
+        for _ in range(max_requests):
+            messages = await self._get_page(channel_id, after=cursor)
+            if not messages:
+                break
             
-            # Get timestamp
-            timestamp_str = raw_message.get('timestamp', '')
-            if timestamp_str:
-                # Ensure consistent timezone handling by removing the Z and any tzinfo
-                timestamp = datetime.fromisoformat(timestamp_str.rstrip('Z')).replace(tzinfo=None)
-            else:
-                timestamp = datetime.now()
+            # Pages are returned newest first, so keep them in chronological order
+            page = sorted(messages, key=lambda m: int(m['id']))
+            cursor = page[-1]['id']
             
-            # Create message object
-            return DiscordMessage(
-                id=raw_message.get('id', '0'),
-                content=content,
-                username=username,
-                user_id=user_id,
-                timestamp=timestamp,
-                channel_id=raw_message.get('channel_id', '0'),
-                attachments_count=len(raw_message.get('attachments', [])),
-                embeds_count=len(raw_message.get('embeds', [])),
-                mentions_count=len(raw_message.get('mentions', [])),
-            )
+            if end is not None and int(cursor) >= end:
+                pages.append([m for m in page if int(m['id']) < end])
+                break
+            pages.append(page)
             
-        except Exception as e:
-            logger.error(f"Error converting message: {str(e)}")
-            return None
\ No newline at end of file
+            # A short page means we have caught up with the newest message
+            if len(messages) < 100:
+                break
+        else:
+            if end is not None:
+                raise RuntimeError(f"Request cap reached ({max_requests}) before the end of a sub-range of channel {channel_id}")
+            logger.warning(f"Request cap reached ({max_requests}). Stopping further requests for channel {channel_id}.")
+        
+        return pages
@@ -8,14 +8,21 @@ debugging to help identify connection issues, with event loop detection fixed.
 import logging
 import asyncio
 import sys
+import time
 from datetime import datetime
-from typing import Optional, List, Callable, Any
+from typing import Optional, List, Callable, Any, AsyncIterator
 import discord
 
 from models.summary import DiscordSummary
 
 logger = logging.getLogger(__name__)
 
+# Maximum length of an embed description
+EMBED_DESCRIPTION_LIMIT = 4096
+
+# Appended to the description while a streamed summary is still being generated
+STREAMING_CURSOR = " ▌"
+
 class DiscordWriterClient:
     """
     Client for posting summaries to Discord channels using a bot token.
@@ -228,6 +235,99 @@ class DiscordWriterClient:
             logger.error(f"Error posting summary to Discord: {str(e)}", exc_info=True)
             return False
     
+    async def post_summary_stream(
+        self,
+        channel_id: int,
+        summary: DiscordSummary,
+        deltas: AsyncIterator[str],
+        edit_interval: float = 1.5
+    ) -> bool:
+        """
+        Post a summary while it is being generated.
+        
+        A placeholder embed is posted right away and edited as text arrives.
+        Text beyond the embed description limit continues in a new message.
+        
+        Args:
+            channel_id: ID of the channel to post to
+            summary: Summary information; its provider and message count are read
+                after the stream ends, for the footer
+            deltas: Async iterator of summary text deltas
+            edit_interval: Minimum number of seconds between edits of a message
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        message = None
+        text = ""
+        try:
+            # Wait until client is ready
+            await self.wait_until_ready()
+            
+            channel = self.client.get_channel(channel_id)
+            if not channel:
+                channel = await self.client.fetch_channel(channel_id)
+            
+            title = f"{summary.title} ({summary.date})"
+            message = await channel.send(embed=discord.Embed(
+                title=title,
+                description="*Generating summary...*",
+                color=0x3498db
+            ))
+            
+            last_edit = time.monotonic()
+            async for delta in deltas:
+                text += delta
+                
+                while len(text) + len(STREAMING_CURSOR) > EMBED_DESCRIPTION_LIMIT:
+                    # Close the current message at a line break and continue in a new one
+                    split_at = text.rfind("\n", 0, EMBED_DESCRIPTION_LIMIT)
+                    if split_at <= 0:
+                        split_at = EMBED_DESCRIPTION_LIMIT
+                    head, text = text[:split_at], text[split_at:].lstrip("\n")
+                    
+                    await message.edit(embed=discord.Embed(title=title, description=head, color=0x3498db))
+                    title = f"{summary.title} (continued)"
+                    message = await channel.send(embed=discord.Embed(
+                        title=title,
+                        description=(text or "...") + STREAMING_CURSOR,
+                        color=0x3498db
+                    ))
+                    last_edit = time.monotonic()
+                
+                if time.monotonic() - last_edit >= edit_interval:
+                    await message.edit(embed=discord.Embed(
+                        title=title,
+                        description=text + STREAMING_CURSOR,
+                        color=0x3498db
+                    ))
+                    last_edit = time.monotonic()
+            
+            # Final edit with the complete text and metadata
+            embed = discord.Embed(title=title, description=text, color=0x3498db)
+            embed.set_footer(text=f"Summary by {summary.provider_name} • {summary.message_count} messages analyzed")
+            await message.edit(embed=embed)
+            
+            logger.info(f"Successfully streamed summary '{summary.title}' to channel {channel_id}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error streaming summary to Discord: {str(e)}")
+            
+            # Don't leave a placeholder that looks like it is still being generated
+            if message is not None:
+                try:
+                    failure_note = "*Summary generation failed.*"
+                    partial_text = text[:EMBED_DESCRIPTION_LIMIT - len(failure_note) - 2]
+                    await message.edit(embed=discord.Embed(
+                        title=title,
+                        description=(partial_text + "\n\n" if partial_text else "") + failure_note,
+                        color=discord.Color.red()
+                    ))
+                except Exception as edit_error:
+                    logger.error(f"Error marking streamed summary as failed: {str(edit_error)}")
+            return False
+    
     async def post_error(self, channel_id: int, error_message: str, title: str = "Error Generating Summary") -> bool:
         """
         Post an error message to a Discord channel.
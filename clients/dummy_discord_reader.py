@@ -11,6 +11,7 @@ import logging
 from typing import List, Dict, Tuple, Optional, Any
 
 from models.message import DiscordMessage
+from models.message_batch import MessageBatch
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +53,7 @@ class DummyDiscordReaderClient:
             # Convert dictionaries back to DiscordMessage objects
             for channel_id, channel_data in data.items():
                 channel_data["messages"] = [
-                    DiscordMessage(**msg_dict) if isinstance(msg_dict, dict) else msg_dict
+                    DiscordMessage.from_dict(msg_dict) if isinstance(msg_dict, dict) else msg_dict
                     for msg_dict in channel_data["messages"]
                 ]
             
@@ -62,7 +63,7 @@ class DummyDiscordReaderClient:
             logger.error(f"Error loading data from {PICKLE_FILE}: {e}")
             return {}
     
-    def get_my_guilds(self) -> List[Dict[str, Any]]:
+    async def get_my_guilds(self) -> List[Dict[str, Any]]:
         """
         Simulate getting all guilds (servers) the user is in.
         
@@ -71,7 +72,7 @@ class DummyDiscordReaderClient:
         """
         return [{"id": "dummy_guild_id", "name": "Dummy Guild"}]
     
-    def get_guild_channels(self, guild_id: str) -> List[Dict[str, Any]]:
+    async def get_guild_channels(self, guild_id: str) -> List[Dict[str, Any]]:
         """
         Simulate getting all channels in a guild.
         
@@ -90,7 +91,7 @@ class DummyDiscordReaderClient:
             })
         return channels
     
-    def get_channel_info(self, channel_id: str) -> Optional[Dict[str, Any]]:
+    async def get_channel_info(self, channel_id: str) -> Optional[Dict[str, Any]]:
         """
         Simulate getting information about a channel.
         
@@ -108,7 +109,7 @@ class DummyDiscordReaderClient:
             }
         return None
     
-    def get_messages(self, channel_id: str, limit: int = 100, before: Optional[str] = None) -> List[Dict[str, Any]]:
+    async def get_messages(self, channel_id: str, limit: int = 100, before: Optional[str] = None, after: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Simulate getting messages from a channel.
         
@@ -116,19 +117,21 @@ class DummyDiscordReaderClient:
             channel_id: ID of the channel
             limit: Maximum number of messages to retrieve (not used)
             before: Message ID to get messages before (not used)
+            after: Message ID to get messages after (not used)
             
         Returns:
             Empty list - this method isn't used by collect_messages in dummy mode
         """
         return []
     
-    def collect_messages(self, channel_id: str, days: int = 1) -> Tuple[List[DiscordMessage], str]:
+    async def collect_messages(self, channel_id: str, days: int = 1, after: Optional[str] = None) -> Tuple[List[DiscordMessage], str]:
         """
         Get messages from the loaded data instead of from Discord.
         
         Args:
             channel_id: ID of the channel
             days: Number of days to look back (not used, returns all loaded data)
+            after: Only return messages newer than this message ID
             
         Returns:
             Tuple of (list of messages, channel name)
@@ -141,5 +144,29 @@ class DummyDiscordReaderClient:
         messages = channel_data["messages"]
         channel_name = channel_data["channel_name"]
         
+        if after:
+            messages = [message for message in messages if int(message.id) > int(after)]
+        
         logger.info(f"Retrieved {len(messages)} messages from {channel_name} (dummy mode)")
-        return messages, channel_name
\ No newline at end of file
+        return messages, channel_name
+    
+    async def collect_message_batch(self, channel_id: str, days: int = 1, after: Optional[str] = None) -> Tuple[MessageBatch, str]:
+        """
+        Get messages from the loaded data as a columnar batch.
+        
+        Args:
+            channel_id: ID of the channel
+            days: Number of days to look back (not used, returns all loaded data)
+            after: Only return messages newer than this message ID
+            
+        Returns:
+            Tuple of (message batch, channel name)
+        """
+        messages, channel_name = await self.collect_messages(channel_id, days, after=after)
+        return MessageBatch.from_messages(messages), channel_name
+    
+    async def close(self) -> None:
+        """
+        No-op, kept for interface compatibility with DiscordReaderClient.
+        """
+        pass
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Discord Page Decoder
+
+This module decodes the JSON bodies of Discord API responses, using orjson
+when it is installed and the standard library otherwise, and turns raw
+message pages into columnar message batches without parsing any ISO
+timestamps: message times come from the snowflake IDs.
+"""
+
+import json
+from typing import Any, Iterable, Union
+
+from models.message_batch import MessageBatch
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Name of the JSON library in use, for logging
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+def loads(body: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document with the fastest available backend.
+
+    Args:
+        body: JSON document
+
+    Returns:
+        Decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def decode_message_pages(bodies: Iterable[Union[bytes, str]]) -> MessageBatch:
+    """
+    Decode raw message page bodies into a message batch.
+
+    Args:
+        bodies: JSON bodies of message list responses
+
+    Returns:
+        MessageBatch object, in page order
+    """
+    return MessageBatch.from_pages(loads(body) for body in bodies)
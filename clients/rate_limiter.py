@@ -0,0 +1,262 @@
+"""
+Discord Rate Limiter
+
+This module tracks Discord's per-route rate limit buckets and the global
+request limit. Buckets are identified by the X-RateLimit-Bucket header and the
+major route parameters (channel_id, guild_id, webhook_id), so header updates
+from one endpoint never overwrite the state of an unrelated one.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from typing import Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Path segments whose following ID is a "major parameter" in Discord's model
+MAJOR_PARAMETERS = ("channels", "guilds", "webhooks")
+
+SNOWFLAKE_PATTERN = re.compile(r"^\d{15,21}$")
+
+class RateLimitBucket:
+    """
+    State of a single Discord rate limit bucket.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty bucket. The limit is unknown until the first response.
+        """
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self.lock = asyncio.Lock()
+
+    def delay(self, now: float) -> float:
+        """
+        Get the time to wait before the next request in this bucket may be sent.
+
+        Args:
+            now: Current time as a Unix timestamp
+
+        Returns:
+            Number of seconds to wait, 0 if a request may be sent right away
+        """
+        if self.remaining is None or self.remaining > 0 or now >= self.reset_at:
+            return 0.0
+        return self.reset_at - now
+
+class RateLimiter:
+    """
+    Registry of Discord rate limit buckets with a separately modelled global limit.
+    """
+
+    def __init__(self, global_limit: int = 50, global_period: float = 1.0):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            global_limit: Maximum number of requests per global period
+            global_period: Length of the global window in seconds
+        """
+        self.global_limit = global_limit
+        self.global_period = global_period
+
+        # Route template -> bucket hash reported by Discord
+        self._route_hashes: Dict[str, str] = {}
+        # "<bucket hash or route>:<major parameter>" -> bucket state
+        self._buckets: Dict[str, RateLimitBucket] = {}
+
+        # Global limit state
+        self._global_reset_at = 0.0
+        self._global_window: deque = deque()
+        self._global_lock = asyncio.Lock()
+
+    @staticmethod
+    def parse_route(method: str, endpoint: str) -> Tuple[str, str]:
+        """
+        Split an endpoint into its route template and major parameter.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint, optionally including a query string
+
+        Returns:
+            Tuple of (route template such as "GET /channels/{channel_id}/messages",
+            major parameter value or an empty string)
+        """
+        path = endpoint.split("?", 1)[0]
+        segments = path.strip("/").split("/")
+
+        major = ""
+        template = []
+        for index, segment in enumerate(segments):
+            previous = segments[index - 1] if index > 0 else ""
+            if previous in MAJOR_PARAMETERS and not major:
+                major = segment
+                template.append(f"{{{previous[:-1]}_id}}")
+            elif SNOWFLAKE_PATTERN.match(segment):
+                template.append("{id}")
+            else:
+                template.append(segment)
+
+        return f"{method.upper()} /{'/'.join(template)}", major
+
+    def _bucket_key(self, method: str, endpoint: str) -> str:
+        """
+        Get the registry key of the bucket an endpoint belongs to.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+
+        Returns:
+            Bucket key
+        """
+        route, major = self.parse_route(method, endpoint)
+        return f"{self._route_hashes.get(route, route)}:{major}"
+
+    def get_bucket(self, method: str, endpoint: str) -> RateLimitBucket:
+        """
+        Get (or create) the bucket an endpoint belongs to.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+
+        Returns:
+            Bucket state for the endpoint
+        """
+        key = self._bucket_key(method, endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = RateLimitBucket()
+            self._buckets[key] = bucket
+        return bucket
+
+    def remaining_budget(self, method: str, endpoint: str) -> Optional[int]:
+        """
+        Get the number of requests an endpoint's bucket still allows before it must wait.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+
+        Returns:
+            Remaining requests in the current window (the full limit once it
+            has reset), or None if no response has reported the bucket yet
+        """
+        bucket = self.get_bucket(method, endpoint)
+        if bucket.remaining is None:
+            return None
+        if time.time() >= bucket.reset_at and bucket.limit is not None:
+            return bucket.limit
+        return bucket.remaining
+
+    async def _acquire_global(self) -> None:
+        """
+        Wait until a request may be sent under the global limit.
+        """
+        async with self._global_lock:
+            while True:
+                now = time.time()
+
+                if self._global_reset_at > now:
+                    wait = self._global_reset_at - now
+                    logger.info(f"Global rate limit active. Sleeping for {wait:.2f} seconds...")
+                    await asyncio.sleep(wait)
+                    continue
+
+                # Drop requests that have left the sliding window
+                while self._global_window and self._global_window[0] <= now - self.global_period:
+                    self._global_window.popleft()
+
+                if len(self._global_window) < self.global_limit:
+                    self._global_window.append(now)
+                    return
+
+                await asyncio.sleep(self._global_window[0] + self.global_period - now)
+
+    async def acquire(self, method: str, endpoint: str) -> None:
+        """
+        Wait exactly as long as the endpoint's bucket and the global limit require.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+        """
+        bucket = self.get_bucket(method, endpoint)
+
+        async with bucket.lock:
+            wait = bucket.delay(time.time())
+            if wait > 0:
+                logger.info(f"Rate limit bucket exhausted for {endpoint}. Sleeping for {wait:.2f} seconds...")
+                await asyncio.sleep(wait)
+
+            if bucket.remaining is not None:
+                # A new window starts once the reset time has passed
+                if time.time() >= bucket.reset_at and bucket.limit is not None:
+                    bucket.remaining = bucket.limit
+                bucket.remaining = max(0, bucket.remaining - 1)
+
+        await self._acquire_global()
+
+    def update(self, method: str, endpoint: str, headers: Mapping[str, str]) -> None:
+        """
+        Update bucket state from the rate limit headers of a response.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            headers: Response headers
+        """
+        route, major = self.parse_route(method, endpoint)
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+
+        if bucket_hash and self._route_hashes.get(route) != bucket_hash:
+            # Move any state tracked under the route template to the real bucket
+            old_bucket = self._buckets.pop(f"{self._route_hashes.get(route, route)}:{major}", None)
+            self._route_hashes[route] = bucket_hash
+            if old_bucket is not None:
+                self._buckets.setdefault(f"{bucket_hash}:{major}", old_bucket)
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+
+        bucket = self.get_bucket(method, endpoint)
+        bucket.remaining = int(remaining)
+
+        limit = headers.get("X-RateLimit-Limit")
+        if limit is not None:
+            bucket.limit = int(limit)
+
+        # Prefer the relative reset to avoid depending on clock synchronisation
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        reset = headers.get("X-RateLimit-Reset")
+        if reset_after is not None:
+            bucket.reset_at = time.time() + float(reset_after)
+        elif reset is not None:
+            bucket.reset_at = float(reset)
+
+    def on_rate_limited(self, method: str, endpoint: str, retry_after: float, is_global: bool = False) -> None:
+        """
+        Record a 429 response so that subsequent requests wait for the reset.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            retry_after: Seconds to wait as reported by Discord
+            is_global: Whether the global limit was hit
+        """
+        reset_at = time.time() + retry_after
+        if is_global:
+            self._global_reset_at = max(self._global_reset_at, reset_at)
+            return
+
+        bucket = self.get_bucket(method, endpoint)
+        bucket.remaining = 0
+        bucket.reset_at = max(bucket.reset_at, reset_at)
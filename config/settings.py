@@ -8,8 +8,8 @@ to the rest of the application.
 
 import os
 from enum import Enum
-from typing import List, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
 
 class LLMProvider(Enum):
@@ -27,6 +27,10 @@ class DiscordReaderConfig:
     user_token: str
     guild_id: Optional[str]
     channel_ids: List[str]
+    max_concurrent_channels: int = 4  # Channels collected in parallel
+    max_range_fetches: int = 4  # Sub-ranges of one channel's window fetched in parallel
+    incremental: bool = False  # Only fetch messages newer than the last run
+    realtime_ingestion: bool = False  # Store messages from gateway events as they are posted
     
 @dataclass
 class DiscordWriterConfig:
@@ -43,6 +47,14 @@ class LLMConfig:
     """
     provider: LLMProvider
     api_key: str
+    max_concurrent_requests: int = 4  # In-flight request cap for this provider
+    fallback_api_keys: Dict[LLMProvider, str] = field(default_factory=dict)  # Keys of the other providers
+    request_timeout: float = 120.0  # Seconds before a single request is abandoned
+    breaker_failure_rate: float = 0.5  # Failure rate that trips the provider's circuit breaker
+    breaker_cooldown_seconds: float = 60.0  # Time a tripped provider is skipped
+    hedging: bool = False  # Also send slow requests to the next provider
+    hedge_percentile: float = 95.0  # Latency percentile after which a request is hedged
+    transcript_formats: Dict[LLMProvider, str] = field(default_factory=dict)  # "full" (default) or "compact", per provider
 
 @dataclass
 class SchedulerConfig:
@@ -52,6 +64,35 @@ class SchedulerConfig:
     summary_hour: int
     summary_minute: int
     days_to_collect: int = 1  # Default to 1 day
+    combined_summary_mode: str = "hierarchical"  # "hierarchical" or "transcript"
+    summary_concurrency: int = 8  # Channels summarized in parallel
+    rolling_summaries: bool = False  # Fold new messages into each channel's previous summary
+    rolling_summary_max_age_days: int = 7  # Regenerate rolling summaries from scratch after this
+    stream_summaries: bool = False  # Post channel summaries while they are being generated
+    batch_mode: bool = False  # Submit all channel summaries as one provider batch job
+    batch_poll_seconds: int = 60  # Seconds between batch job status checks
+
+@dataclass
+class StorageConfig:
+    """
+    Configuration for local persistent storage.
+    """
+    data_dir: str = "data"
+    message_store_enabled: bool = False  # Write collected messages to the local database
+    summary_cache_enabled: bool = False  # Reuse summaries of identical requests
+    summary_cache_ttl_hours: float = 72.0
+    summary_cache_max_entries: int = 1000
+
+@dataclass
+class FilterConfig:
+    """
+    Configuration for filtering messages before summarization.
+    """
+    enabled: bool = False
+    allowed_authors: List[str] = field(default_factory=list)  # User IDs or usernames; empty keeps everyone
+    denied_authors: List[str] = field(default_factory=list)  # User IDs or usernames, e.g. bots
+    min_information_chars: int = 3  # Drop messages with fewer letters and digits (0 disables)
+    near_duplicate_distance: int = 3  # SimHash bits near-duplicates may differ by (-1 disables)
 
 @dataclass
 class AppConfig:
@@ -62,6 +103,8 @@ class AppConfig:
     discord_writer: DiscordWriterConfig
     llm: LLMConfig
     scheduler: SchedulerConfig
+    storage: StorageConfig = field(default_factory=StorageConfig)
+    filters: FilterConfig = field(default_factory=FilterConfig)
     debug_mode: bool = False
 
 def _parse_channel_ids(channel_ids_str: str) -> List[str]:
@@ -125,6 +168,10 @@ def load_config() -> AppConfig:
     
     discord_guild_id = os.getenv('DISCORD_SOURCE_GUILD_ID')
     discord_channel_ids = _parse_channel_ids(os.getenv('DISCORD_SOURCE_CHANNEL_IDS', ''))
+    max_concurrent_channels = max(1, int(os.getenv('COLLECTION_CONCURRENCY', '4')))
+    max_range_fetches = max(1, int(os.getenv('CHANNEL_FETCH_CONCURRENCY', '4')))
+    incremental_collection = os.getenv('INCREMENTAL_COLLECTION', 'false').lower() == 'true'
+    realtime_ingestion = os.getenv('REALTIME_INGESTION', 'false').lower() == 'true'
     
     # If no guild ID and no channel IDs, we can't know what to monitor
     if not discord_guild_id and not discord_channel_ids:
@@ -149,11 +196,67 @@ def load_config() -> AppConfig:
     
     # Get LLM API key
     llm_api_key = _get_llm_api_key(llm_provider)
+    llm_max_concurrent_requests = max(1, int(os.getenv('LLM_MAX_CONCURRENCY', '4')))
+    llm_request_timeout = float(os.getenv('LLM_REQUEST_TIMEOUT', '120'))
+    llm_breaker_failure_rate = float(os.getenv('LLM_BREAKER_FAILURE_RATE', '0.5'))
+    llm_breaker_cooldown_seconds = float(os.getenv('LLM_BREAKER_COOLDOWN_SECONDS', '60'))
+    llm_hedging = os.getenv('LLM_HEDGING', 'false').lower() == 'true'
+    llm_hedge_percentile = float(os.getenv('LLM_HEDGE_PERCENTILE', '95'))
+    
+    # Transcript format per provider, e.g. ANTHROPIC_TRANSCRIPT_FORMAT=compact,
+    # defaulting to TRANSCRIPT_FORMAT for every provider
+    default_transcript_format = os.getenv('TRANSCRIPT_FORMAT', 'full').strip().lower()
+    llm_transcript_formats = {}
+    for provider in LLMProvider:
+        transcript_format = os.getenv(f'{provider.name}_TRANSCRIPT_FORMAT', default_transcript_format).strip().lower()
+        if transcript_format not in ('full', 'compact'):
+            print(f"WARNING: Invalid transcript format '{transcript_format}' for {provider.value}. Defaulting to full.")
+            transcript_format = 'full'
+        llm_transcript_formats[provider] = transcript_format
+    
+    # API keys of the other providers, used for fallback
+    llm_fallback_api_keys = {}
+    for provider in LLMProvider:
+        fallback_api_key = os.getenv(f'{provider.name}_API_KEY')
+        if provider != llm_provider and fallback_api_key:
+            llm_fallback_api_keys[provider] = fallback_api_key
     
     # Get scheduler configuration
     summary_hour = int(os.getenv('SUMMARY_HOUR', '23'))
     summary_minute = int(os.getenv('SUMMARY_MINUTE', '0'))
     days_to_collect = int(os.getenv('DAYS_TO_COLLECT', '1'))
+    combined_summary_mode = os.getenv('COMBINED_SUMMARY_MODE', 'hierarchical').strip().lower()
+    if combined_summary_mode not in ('hierarchical', 'transcript'):
+        print(f"WARNING: Invalid combined summary mode '{combined_summary_mode}'. Defaulting to hierarchical.")
+        combined_summary_mode = 'hierarchical'
+    summary_concurrency = max(1, int(os.getenv('SUMMARY_CONCURRENCY', '8')))
+    rolling_summaries = os.getenv('ROLLING_SUMMARIES', 'false').lower() == 'true'
+    rolling_summary_max_age_days = int(os.getenv('ROLLING_SUMMARY_MAX_AGE_DAYS', '7'))
+    stream_summaries = os.getenv('STREAM_SUMMARIES', 'false').lower() == 'true'
+    batch_mode = os.getenv('SUMMARY_BATCH_MODE', 'false').lower() == 'true'
+    batch_poll_seconds = max(1, int(os.getenv('BATCH_POLL_SECONDS', '60')))
+    
+    # Local storage
+    data_dir = os.getenv('DATA_DIR', 'data')
+    message_store_enabled = os.getenv('MESSAGE_STORE', 'false').lower() == 'true'
+    summary_cache_enabled = os.getenv('SUMMARY_CACHE', 'false').lower() == 'true'
+    summary_cache_ttl_hours = float(os.getenv('SUMMARY_CACHE_TTL_HOURS', '72'))
+    summary_cache_max_entries = int(os.getenv('SUMMARY_CACHE_MAX_ENTRIES', '1000'))
+    
+    # Ingested messages are kept in the message store
+    if realtime_ingestion and not message_store_enabled:
+        raise ValueError("REALTIME_INGESTION requires MESSAGE_STORE=true")
+    
+    # Incremental runs read the messages of earlier runs back from the message store
+    if incremental_collection and not message_store_enabled:
+        raise ValueError("INCREMENTAL_COLLECTION requires MESSAGE_STORE=true")
+    
+    # Message filtering
+    filters_enabled = os.getenv('MESSAGE_FILTERS', 'false').lower() == 'true'
+    filter_allowed_authors = _parse_channel_ids(os.getenv('FILTER_ALLOWED_AUTHORS', ''))
+    filter_denied_authors = _parse_channel_ids(os.getenv('FILTER_DENIED_AUTHORS', ''))
+    filter_min_information_chars = int(os.getenv('FILTER_MIN_INFORMATION_CHARS', '3'))
+    filter_near_duplicate_distance = int(os.getenv('FILTER_NEAR_DUPLICATE_DISTANCE', '3'))
     
     # Debug mode
     debug_mode = os.getenv('DEBUG', 'false').lower() == 'true'
@@ -163,7 +266,11 @@ def load_config() -> AppConfig:
         discord_reader=DiscordReaderConfig(
             user_token=discord_user_token,
             guild_id=discord_guild_id,
-            channel_ids=discord_channel_ids
+            channel_ids=discord_channel_ids,
+            max_concurrent_channels=max_concurrent_channels,
+            max_range_fetches=max_range_fetches,
+            incremental=incremental_collection,
+            realtime_ingestion=realtime_ingestion
         ),
         discord_writer=DiscordWriterConfig(
             bot_token=discord_bot_token,
@@ -171,12 +278,41 @@ def load_config() -> AppConfig:
         ),
         llm=LLMConfig(
             provider=llm_provider,
-            api_key=llm_api_key
+            api_key=llm_api_key,
+            max_concurrent_requests=llm_max_concurrent_requests,
+            fallback_api_keys=llm_fallback_api_keys,
+            request_timeout=llm_request_timeout,
+            breaker_failure_rate=llm_breaker_failure_rate,
+            breaker_cooldown_seconds=llm_breaker_cooldown_seconds,
+            hedging=llm_hedging,
+            hedge_percentile=llm_hedge_percentile,
+            transcript_formats=llm_transcript_formats
         ),
         scheduler=SchedulerConfig(
             summary_hour=summary_hour,
             summary_minute=summary_minute,
-            days_to_collect=days_to_collect
+            days_to_collect=days_to_collect,
+            combined_summary_mode=combined_summary_mode,
+            summary_concurrency=summary_concurrency,
+            rolling_summaries=rolling_summaries,
+            rolling_summary_max_age_days=rolling_summary_max_age_days,
+            stream_summaries=stream_summaries,
+            batch_mode=batch_mode,
+            batch_poll_seconds=batch_poll_seconds
+        ),
+        storage=StorageConfig(
+            data_dir=data_dir,
+            message_store_enabled=message_store_enabled,
+            summary_cache_enabled=summary_cache_enabled,
+            summary_cache_ttl_hours=summary_cache_ttl_hours,
+            summary_cache_max_entries=summary_cache_max_entries
+        ),
+        filters=FilterConfig(
+            enabled=filters_enabled,
+            allowed_authors=filter_allowed_authors,
+            denied_authors=filter_denied_authors,
+            min_information_chars=filter_min_information_chars,
+            near_duplicate_distance=filter_near_duplicate_distance
         ),
         debug_mode=debug_mode
     )
\ No newline at end of file
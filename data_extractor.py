@@ -9,7 +9,6 @@ import os
 import json
 import asyncio
 import logging
-from datetime import datetime
 import pickle
 from dotenv import load_dotenv
 
@@ -24,6 +23,7 @@ logger = logging.getLogger("discord_data_extractor")
 from config.settings import load_config
 from clients.discord_reader import DiscordReaderClient
 from models.message import DiscordMessage
+from storage.message_store import MessageStore
 
 # Directory for storing extracted data
 DATA_DIR = "extracted_data"
@@ -46,7 +46,13 @@ async def extract_messages(days: int = 4):
     os.makedirs(DATA_DIR, exist_ok=True)
     
     # Initialize Discord reader client
-    discord_reader = DiscordReaderClient(config.discord_reader.user_token)
+    discord_reader = DiscordReaderClient(
+        config.discord_reader.user_token,
+        max_range_fetches=config.discord_reader.max_range_fetches
+    )
+    
+    # Also keep the messages in the indexed local store so they can be summarized offline
+    message_store = MessageStore(os.path.join(config.storage.data_dir, "messages.db"))
     
     # Store all extracted data
     all_data = {}
@@ -57,7 +63,7 @@ async def extract_messages(days: int = 4):
     if not channel_ids and config.discord_reader.guild_id:
         # Get all channels in the guild
         logger.info(f"Getting all channels in guild {config.discord_reader.guild_id}")
-        guild_channels = discord_reader.get_guild_channels(config.discord_reader.guild_id)
+        guild_channels = await discord_reader.get_guild_channels(config.discord_reader.guild_id)
         
         # Filter for text channels (type 0)
         channel_ids = [channel['id'] for channel in guild_channels if channel.get('type') == 0]
@@ -68,45 +74,41 @@ async def extract_messages(days: int = 4):
         logger.info(f"Collecting messages from channel {channel_id} for the past {days} day(s)")
         
         # Get channel info
-        channel_info = discord_reader.get_channel_info(channel_id)
+        channel_info = await discord_reader.get_channel_info(channel_id)
         channel_name = channel_info.get('name', f"Channel {channel_id}") if channel_info else f"Channel {channel_id}"
         
         # Collect messages
-        messages, _ = discord_reader.collect_messages(channel_id, days=days)
+        try:
+            messages, _ = await discord_reader.collect_messages(channel_id, days=days)
+        except Exception as e:
+            logger.error(f"Error collecting messages from channel {channel_id}: {str(e)}")
+            continue
         
         logger.info(f"Collected {len(messages)} messages from {channel_name}")
         
+        message_store.set_channel_name(channel_id, channel_name)
+        message_store.upsert_messages(messages)
+        
         # Store messages for this channel
         all_data[channel_id] = {
             "channel_name": channel_name,
-            "messages": [message.__dict__ for message in messages]  # Convert to dict for serialization
+            "messages": [message.to_dict() for message in messages]  # Convert to dict for serialization
         }
         
         # Add a small delay to avoid rate limiting
         await asyncio.sleep(1)
     
-    # Save data in pickle format (preserves DiscordMessage objects)
+    # Release the reader's connection pool and the message store
+    await discord_reader.close()
+    message_store.close()
+    
+    # Save data in pickle format (read back by DummyDiscordReaderClient)
     with open(PICKLE_FILE, 'wb') as f:
         pickle.dump(all_data, f)
     
-    # Save data in JSON format (for human readability)
-    json_data = {}
-    for channel_id, channel_data in all_data.items():
-        # Convert datetime objects to ISO format strings for JSON serialization
-        json_data[channel_id] = {
-            "channel_name": channel_data["channel_name"],
-            "messages": []
-        }
-        
-        for msg_dict in channel_data["messages"]:
-            msg_copy = msg_dict.copy()
-            # Convert datetime to string
-            if isinstance(msg_copy.get('timestamp'), datetime):
-                msg_copy['timestamp'] = msg_copy['timestamp'].isoformat()
-            json_data[channel_id]["messages"].append(msg_copy)
-    
+    # Save data in JSON format (for human readability); timestamps are already ISO strings
     with open(JSON_FILE, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, ensure_ascii=False, indent=2)
+        json.dump(all_data, f, ensure_ascii=False, indent=2)
     
     logger.info(f"Successfully extracted and saved data from {len(all_data)} channels")
     logger.info(f"Data saved to {PICKLE_FILE} (for program use) and {JSON_FILE} (for review)")
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import os
 import signal
 import sys
 from typing import Dict, Any, Optional
@@ -8,8 +9,15 @@ from config.settings import load_config
 from utils.logging_config import setup_logging
 from clients.discord_reader import DiscordReaderClient
 from clients.discord_writer import DiscordWriterClient
-from summarizers import create_summarizer
+from summarizers import create_summarizer_pool
 from services.message_collector import MessageCollectorService
+from services.message_filter import create_filter_pipeline
+from services.message_ingestion import MessageIngestionService
+from storage.message_store import MessageStore
+from storage.batch_jobs import BatchJobStore
+from storage.rolling_summaries import RollingSummaryStore
+from storage.summary_cache import SummaryCache
+from storage.watermarks import WatermarkStore
 from services.summary_generator import SummaryGeneratorService
 from services.summary_scheduler import SummarySchedulerService
 
@@ -32,20 +40,77 @@ async def initialize_components() -> Dict[str, Any]:
     logger.info("Starting Discord Summary Bot")
     
     # Initialize clients
-    discord_reader = DiscordReaderClient(config.discord_reader.user_token)
+    discord_reader = DiscordReaderClient(
+        config.discord_reader.user_token,
+        max_range_fetches=config.discord_reader.max_range_fetches
+    )
     discord_writer = DiscordWriterClient(config.discord_writer.bot_token)
     
-    # Initialize summarizer
-    summarizer = create_summarizer(config.llm)
+    # Initialize summarizers for every configured provider
+    summarizer_pool = create_summarizer_pool(config.llm)
     
     # Initialize services
-    message_collector = MessageCollectorService(discord_reader, config.discord_reader)
-    summary_generator = SummaryGeneratorService(message_collector, summarizer)
+    # Initialize local storage
+    watermarks = None
+    if config.discord_reader.incremental:
+        watermarks = WatermarkStore(os.path.join(config.storage.data_dir, "collection_state.json"))
+    
+    message_store = None
+    if config.storage.message_store_enabled:
+        message_store = MessageStore(os.path.join(config.storage.data_dir, "messages.db"))
+    
+    rolling_summaries = None
+    if config.scheduler.rolling_summaries:
+        rolling_summaries = RollingSummaryStore(os.path.join(config.storage.data_dir, "rolling_summaries.json"))
+    
+    summary_cache = None
+    if config.storage.summary_cache_enabled:
+        summary_cache = SummaryCache(
+            os.path.join(config.storage.data_dir, "summary_cache.db"),
+            ttl_seconds=config.storage.summary_cache_ttl_hours * 3600,
+            max_entries=config.storage.summary_cache_max_entries
+        )
+    
+    batch_jobs = None
+    if config.scheduler.batch_mode:
+        batch_jobs = BatchJobStore(os.path.join(config.storage.data_dir, "batch_jobs.json"))
+    
+    message_ingestion = None
+    if config.discord_reader.realtime_ingestion:
+        message_ingestion = MessageIngestionService(
+            discord_writer,
+            discord_reader,
+            message_store,
+            WatermarkStore(os.path.join(config.storage.data_dir, "ingestion_state.json")),
+            channel_ids=config.discord_reader.channel_ids,
+            guild_id=config.discord_reader.guild_id,
+            days=config.scheduler.days_to_collect,
+            max_concurrency=config.discord_reader.max_concurrent_channels
+        )
+    
+    message_collector = MessageCollectorService(
+        discord_reader,
+        config.discord_reader,
+        watermarks=watermarks,
+        message_store=message_store,
+        ingestion=message_ingestion
+    )
+    summary_generator = SummaryGeneratorService(
+        message_collector,
+        summarizer_pool,
+        message_store=message_store,
+        max_concurrent_summaries=config.scheduler.summary_concurrency,
+        summary_cache=summary_cache,
+        rolling_summaries=rolling_summaries,
+        rolling_summary_max_age_days=config.scheduler.rolling_summary_max_age_days,
+        message_filter=create_filter_pipeline(config.filters)
+    )
     summary_scheduler = SummarySchedulerService(
         config=config.scheduler,
         summary_generator=summary_generator,
         discord_writer=discord_writer,
-        destination_channel_id=config.discord_writer.destination_channel_id
+        destination_channel_id=config.discord_writer.destination_channel_id,
+        batch_jobs=batch_jobs
     )
     
     # Store components
@@ -54,7 +119,10 @@ async def initialize_components() -> Dict[str, Any]:
         'logger': logger,
         'discord_reader': discord_reader,
         'discord_writer': discord_writer,
-        'summarizer': summarizer,
+        'summarizer_pool': summarizer_pool,
+        'message_store': message_store,
+        'message_ingestion': message_ingestion,
+        'summary_cache': summary_cache,
         'message_collector': message_collector,
         'summary_generator': summary_generator,
         'summary_scheduler': summary_scheduler
@@ -94,6 +162,9 @@ async def run_once(components: Dict[str, Any]) -> None:
         logger.info("One-time summary generation completed")
     except Exception as e:
         logger.error(f"Error in run_once: {e}")
+    finally:
+        await components['discord_reader'].close()
+        await components['summarizer_pool'].close()
 
 async def run_scheduled(components: Dict[str, Any]) -> None:
     """
@@ -122,6 +193,10 @@ async def run_scheduled(components: Dict[str, Any]) -> None:
     # Add ready callback and start discord client
     discord_writer.add_on_ready_callback(on_ready)
     
+    # Listen to message events on the same gateway connection
+    if components['message_ingestion']:
+        await components['message_ingestion'].start()
+    
     # Wait for shutdown signal
     try:
         await discord_writer.start()
@@ -155,7 +230,37 @@ async def shutdown() -> None:
     scheduler = app_components.get('summary_scheduler')
     if scheduler:
         await scheduler.stop()
-
+    
+    # Close the Discord reader's HTTP session
+    discord_reader = app_components.get('discord_reader')
+    if discord_reader:
+        try:
+            await discord_reader.close()
+        except Exception as e:
+            logger.error(f"Error closing Discord reader: {e}")
+    
+    # Close the LLM API clients
+    summarizer_pool = app_components.get('summarizer_pool')
+    if summarizer_pool:
+        await summarizer_pool.close()
+    
+    # Write the messages ingested so far before closing the local databases
+    message_ingestion = app_components.get('message_ingestion')
+    if message_ingestion:
+        try:
+            await message_ingestion.stop()
+        except Exception as e:
+            logger.error(f"Error stopping message ingestion: {e}")
+    
+    # Close the local databases
+    message_store = app_components.get('message_store')
+    if message_store:
+        message_store.close()
+    
+    summary_cache = app_components.get('summary_cache')
+    if summary_cache:
+        summary_cache.close()
+    
     # Close Discord client gracefully
     discord_writer = app_components.get('discord_writer')
     if discord_writer and hasattr(discord_writer, 'client'):
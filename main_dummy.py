@@ -14,8 +14,9 @@ from config.settings import load_config
 from utils.logging_config import setup_logging
 from clients.dummy_discord_reader import DummyDiscordReaderClient  # Use dummy client
 from clients.discord_writer import DiscordWriterClient
-from summarizers import create_summarizer
+from summarizers import create_summarizer_pool
 from services.message_collector import MessageCollectorService
+from services.message_filter import create_filter_pipeline
 from services.summary_generator import SummaryGeneratorService
 from services.summary_scheduler import SummarySchedulerService
 
@@ -63,6 +64,13 @@ async def initialize_components() -> Dict[str, Any]:
                 logger.info(f"Content length: {len(summary.content)} characters")
                 return True
             
+            async def post_summary_stream(self, channel_id, summary, deltas):
+                text = "".join([delta async for delta in deltas])
+                logger.info(f"DUMMY: Would stream summary to channel {channel_id}")
+                logger.info(f"Summary title: {summary.title}")
+                logger.info(f"Content length: {len(text)} characters")
+                return True
+            
             # Add this method
             async def post_error(self, channel_id, error_message, title="Error"):
                 logger.info(f"DUMMY: Would post error to channel {channel_id}")
@@ -72,12 +80,16 @@ async def initialize_components() -> Dict[str, Any]:
         
         discord_writer = DummyWriter()
         
-    # Initialize summarizer
-    summarizer = create_summarizer(config.llm)
+    # Initialize summarizers for every configured provider
+    summarizer_pool = create_summarizer_pool(config.llm)
     
     # Initialize services
     message_collector = MessageCollectorService(discord_reader, config.discord_reader)
-    summary_generator = SummaryGeneratorService(message_collector, summarizer)
+    summary_generator = SummaryGeneratorService(
+        message_collector,
+        summarizer_pool,
+        message_filter=create_filter_pipeline(config.filters)
+    )
     summary_scheduler = SummarySchedulerService(
         config=config.scheduler,
         summary_generator=summary_generator,
@@ -91,7 +103,7 @@ async def initialize_components() -> Dict[str, Any]:
         'logger': logger,
         'discord_reader': discord_reader,
         'discord_writer': discord_writer,
-        'summarizer': summarizer,
+        'summarizer_pool': summarizer_pool,
         'message_collector': message_collector,
         'summary_generator': summary_generator,
         'summary_scheduler': summary_scheduler
@@ -2,13 +2,45 @@
 Discord Message Model
 
 This module defines the data model for Discord messages.
+
+Messages are held in memory by the hundred thousand during a guild backfill,
+so the model is slotted, interns the author and channel strings shared by
+many messages, and stores its timestamp as integer epoch milliseconds.
 """
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Union
+
+# Naive UTC datetimes are used throughout, like in the rest of the models
+EPOCH = datetime(1970, 1, 1)
+
+def datetime_to_epoch_ms(moment: datetime) -> int:
+    """
+    Convert a datetime to epoch milliseconds. Naive datetimes are treated as UTC.
+    
+    Args:
+        moment: Datetime to convert
+    
+    Returns:
+        Milliseconds since the Unix epoch
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - EPOCH) // timedelta(milliseconds=1)
+
+def epoch_ms_to_datetime(milliseconds: int) -> datetime:
+    """
+    Convert epoch milliseconds to a naive UTC datetime.
+    
+    Args:
+        milliseconds: Milliseconds since the Unix epoch
+    
+    Returns:
+        Naive datetime in UTC
+    """
+    return EPOCH + timedelta(milliseconds=milliseconds)
 
-@dataclass
 class DiscordMessage:
     """
     Represents a Discord message.
@@ -16,15 +48,68 @@ class DiscordMessage:
     This model contains essential information about a Discord message,
     including content, sender information, and metadata.
     """
-    id: str
-    content: str
-    username: str
-    user_id: str
-    timestamp: datetime
-    channel_id: str
-    attachments_count: int = 0
-    embeds_count: int = 0
-    mentions_count: int = 0
+    __slots__ = (
+        "id",
+        "content",
+        "username",
+        "user_id",
+        "timestamp_ms",
+        "channel_id",
+        "attachments_count",
+        "embeds_count",
+        "mentions_count",
+    )
+    
+    def __init__(
+        self,
+        id: str,
+        content: str,
+        username: str,
+        user_id: str,
+        timestamp: Union[datetime, int],
+        channel_id: str,
+        attachments_count: int = 0,
+        embeds_count: int = 0,
+        mentions_count: int = 0
+    ):
+        """
+        Initialize a message.
+        
+        Args:
+            id: Message snowflake ID
+            content: Message text
+            username: Author's username
+            user_id: Author's user ID
+            timestamp: Creation time, as a naive UTC datetime or epoch milliseconds
+            channel_id: ID of the channel the message was posted in
+            attachments_count: Number of attachments
+            embeds_count: Number of embeds
+            mentions_count: Number of user mentions
+        """
+        self.id = id
+        self.content = content
+        # A few authors and channels are shared by every message, so keep one copy of each
+        self.username = sys.intern(username)
+        self.user_id = sys.intern(user_id)
+        self.timestamp_ms = timestamp if isinstance(timestamp, int) else datetime_to_epoch_ms(timestamp)
+        self.channel_id = sys.intern(channel_id)
+        self.attachments_count = attachments_count
+        self.embeds_count = embeds_count
+        self.mentions_count = mentions_count
+    
+    @property
+    def timestamp(self) -> datetime:
+        """
+        Get the creation time of the message.
+        
+        Returns:
+            Naive datetime in UTC
+        """
+        return epoch_ms_to_datetime(self.timestamp_ms)
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self.timestamp_ms = datetime_to_epoch_ms(value)
     
     @property
     def formatted_time(self) -> str:
@@ -46,6 +131,18 @@ class DiscordMessage:
         """
         return f"[{self.formatted_time}] {self.username}: {self.content}"
     
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    # Mutable, so unhashable like the dataclass it replaces
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+    
     def to_dict(self) -> dict:
         """
         Convert the message to a dictionary for serialization.
@@ -72,7 +169,7 @@ class DiscordMessage:
         
         Args:
             data: Dictionary representation of a message
-            
+        
         Returns:
             DiscordMessage object
         """
@@ -92,4 +189,4 @@ class DiscordMessage:
             attachments_count=data.get('attachments_count', 0),
             embeds_count=data.get('embeds_count', 0),
             mentions_count=data.get('mentions_count', 0)
-        )
\ No newline at end of file
+        )
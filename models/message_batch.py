@@ -0,0 +1,476 @@
+"""
+Message Batch Model
+
+This module defines a columnar container for many Discord messages.
+
+Instead of one object per message, a batch keeps each field in a contiguous
+array: snowflake IDs, author IDs, channel IDs and epoch-millisecond
+timestamps as 64-bit integers, and every message's content in one string
+addressed by an array of offsets. Usernames are stored once and referenced
+by index. Sorting, time-window filtering, per-author counts and formatting
+run over the arrays without creating message objects, and a batch converts
+losslessly to and from a list of DiscordMessage.
+"""
+
+import logging
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from models.message import DiscordMessage, datetime_to_epoch_ms
+from utils.snowflake import DISCORD_EPOCH_MS
+
+logger = logging.getLogger(__name__)
+
+def _to_epoch_ms(moment: Union[datetime, int]) -> int:
+    """
+    Convert a datetime or epoch milliseconds to epoch milliseconds.
+    
+    Args:
+        moment: Naive UTC datetime, aware datetime or epoch milliseconds
+    
+    Returns:
+        Milliseconds since the Unix epoch
+    """
+    return moment if isinstance(moment, int) else datetime_to_epoch_ms(moment)
+
+class MessageBatch:
+    """
+    Columnar batch of Discord messages.
+    
+    Batches are immutable: sorting and filtering return new batches.
+    Message, author and channel IDs must be Discord snowflakes.
+    """
+    
+    def __init__(
+        self,
+        ids: array,
+        author_ids: array,
+        channel_ids: array,
+        timestamps: array,
+        username_indexes: array,
+        usernames: List[str],
+        text: str,
+        content_offsets: array,
+        attachments_counts: array,
+        embeds_counts: array,
+        mentions_counts: array,
+        is_sorted: bool = False
+    ):
+        """
+        Initialize a batch from its columns.
+        
+        Args:
+            ids: Message snowflake IDs ('Q' array)
+            author_ids: Author user IDs ('Q' array)
+            channel_ids: Channel IDs ('Q' array)
+            timestamps: Creation times in epoch milliseconds ('q' array)
+            username_indexes: Index of each message's username in usernames ('I' array)
+            usernames: Distinct usernames
+            text: Contents of every message, concatenated
+            content_offsets: Start of each message's content in text, plus the
+                end of the last one ('Q' array, one longer than the batch)
+            attachments_counts: Number of attachments per message ('I' array)
+            embeds_counts: Number of embeds per message ('I' array)
+            mentions_counts: Number of user mentions per message ('I' array)
+            is_sorted: Whether the messages are in chronological order
+        """
+        self.ids = ids
+        self.author_ids = author_ids
+        self.channel_ids = channel_ids
+        self.timestamps = timestamps
+        self.username_indexes = username_indexes
+        self.usernames = usernames
+        self.text = text
+        self.content_offsets = content_offsets
+        self.attachments_counts = attachments_counts
+        self.embeds_counts = embeds_counts
+        self.mentions_counts = mentions_counts
+        self.is_sorted = is_sorted
+    
+    @classmethod
+    def _from_columns(
+        cls,
+        ids: Sequence[int],
+        author_ids: Sequence[int],
+        channel_ids: Sequence[int],
+        timestamps: Sequence[int],
+        username_indexes: Sequence[int],
+        usernames: List[str],
+        contents: List[str],
+        attachments_counts: Sequence[int],
+        embeds_counts: Sequence[int],
+        mentions_counts: Sequence[int],
+        is_sorted: bool = False
+    ) -> 'MessageBatch':
+        """
+        Create a batch from per-message columns, packing them into arrays.
+        
+        Args:
+            ids: Message snowflake IDs
+            author_ids: Author user IDs
+            channel_ids: Channel IDs
+            timestamps: Creation times in epoch milliseconds
+            username_indexes: Index of each message's username in usernames
+            usernames: Distinct usernames
+            contents: Content of each message
+            attachments_counts: Number of attachments per message
+            embeds_counts: Number of embeds per message
+            mentions_counts: Number of user mentions per message
+            is_sorted: Whether the messages are in chronological order
+        
+        Returns:
+            MessageBatch object
+        """
+        offsets = array('Q', [0])
+        position = 0
+        for content in contents:
+            position += len(content)
+            offsets.append(position)
+        
+        return cls(
+            ids=array('Q', ids),
+            author_ids=array('Q', author_ids),
+            channel_ids=array('Q', channel_ids),
+            timestamps=array('q', timestamps),
+            username_indexes=array('I', username_indexes),
+            usernames=usernames,
+            text="".join(contents),
+            content_offsets=offsets,
+            attachments_counts=array('I', attachments_counts),
+            embeds_counts=array('I', embeds_counts),
+            mentions_counts=array('I', mentions_counts),
+            is_sorted=is_sorted
+        )
+    
+    @classmethod
+    def empty(cls) -> 'MessageBatch':
+        """
+        Create a batch without messages.
+        
+        Returns:
+            Empty MessageBatch object
+        """
+        return cls._from_columns([], [], [], [], [], [], [], [], [], [], is_sorted=True)
+    
+    @classmethod
+    def from_pages(cls, pages: Iterable[List[Dict[str, Any]]]) -> 'MessageBatch':
+        """
+        Create a batch directly from raw message pages returned by the API.
+        
+        Only the fields of DiscordMessage are read. Creation times are taken
+        from the snowflake IDs rather than parsed from the ISO timestamps;
+        both agree to the millisecond.
+        Messages without content are skipped, and so are malformed messages,
+        with a warning.
+        
+        Args:
+            pages: Pages of raw message data
+        
+        Returns:
+            MessageBatch object, in page order
+        """
+        ids, author_ids, channel_ids, timestamps, username_indexes = [], [], [], [], []
+        contents, attachments_counts, embeds_counts, mentions_counts = [], [], [], []
+        username_table: Dict[str, int] = {}
+        
+        for page in pages:
+            for raw_message in page:
+                # Read every field before appending any, so the columns stay aligned
+                try:
+                    content = raw_message.get('content', '')
+                    if not content:
+                        continue
+                    
+                    author = raw_message.get('author', {})
+                    username = author.get('username', 'Unknown')
+                    message_id = int(raw_message.get('id', 0))
+                    author_id = int(author.get('id', 0))
+                    channel_id = int(raw_message.get('channel_id', 0))
+                    attachments_count = len(raw_message.get('attachments', []))
+                    embeds_count = len(raw_message.get('embeds', []))
+                    mentions_count = len(raw_message.get('mentions', []))
+                except Exception as e:
+                    logger.warning(f"Skipping malformed message: {str(e)}")
+                    continue
+                
+                username_index = username_table.get(username)
+                if username_index is None:
+                    username_index = username_table[username] = len(username_table)
+                
+                ids.append(message_id)
+                author_ids.append(author_id)
+                channel_ids.append(channel_id)
+                timestamps.append((message_id >> 22) + DISCORD_EPOCH_MS)
+                username_indexes.append(username_index)
+                contents.append(content)
+                attachments_counts.append(attachments_count)
+                embeds_counts.append(embeds_count)
+                mentions_counts.append(mentions_count)
+        
+        return cls._from_columns(
+            ids, author_ids, channel_ids, timestamps, username_indexes, list(username_table), contents,
+            attachments_counts, embeds_counts, mentions_counts
+        )
+    
+    @classmethod
+    def from_messages(cls, messages: Iterable[DiscordMessage]) -> 'MessageBatch':
+        """
+        Create a batch from message objects.
+        
+        Args:
+            messages: Messages to pack
+        
+        Returns:
+            MessageBatch object, in the order of the messages
+        
+        Raises:
+            ValueError: If a message, author or channel ID is not a Discord snowflake
+        """
+        messages = list(messages)
+        username_table: Dict[str, int] = {}
+        username_indexes = []
+        for message in messages:
+            username_index = username_table.get(message.username)
+            if username_index is None:
+                username_index = username_table[message.username] = len(username_table)
+            username_indexes.append(username_index)
+        
+        try:
+            ids = array('Q', [int(message.id) for message in messages])
+            author_ids = array('Q', [int(message.user_id) for message in messages])
+            channel_ids = array('Q', [int(message.channel_id) for message in messages])
+        except (ValueError, OverflowError) as e:
+            raise ValueError(f"Message batches need snowflake IDs: {str(e)}") from e
+        
+        return cls._from_columns(
+            ids=ids,
+            author_ids=author_ids,
+            channel_ids=channel_ids,
+            timestamps=[message.timestamp_ms for message in messages],
+            username_indexes=username_indexes,
+            usernames=list(username_table),
+            contents=[message.content for message in messages],
+            attachments_counts=[message.attachments_count for message in messages],
+            embeds_counts=[message.embeds_count for message in messages],
+            mentions_counts=[message.mentions_count for message in messages]
+        )
+    
+    def to_messages(self) -> List[DiscordMessage]:
+        """
+        Convert the batch to message objects.
+        
+        Returns:
+            List of DiscordMessage objects, in batch order
+        """
+        usernames = self.usernames
+        return [
+            DiscordMessage(
+                id=str(message_id),
+                content=content,
+                username=usernames[username_index],
+                user_id=str(author_id),
+                timestamp=timestamp,
+                channel_id=str(channel_id),
+                attachments_count=attachments_count,
+                embeds_count=embeds_count,
+                mentions_count=mentions_count
+            )
+            for message_id, content, username_index, author_id, timestamp, channel_id,
+                attachments_count, embeds_count, mentions_count in zip(
+                self.ids, self.contents(), self.username_indexes, self.author_ids, self.timestamps,
+                self.channel_ids, self.attachments_counts, self.embeds_counts, self.mentions_counts
+            )
+        ]
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __getitem__(self, index: int) -> DiscordMessage:
+        """
+        Get one message of the batch as a message object.
+        
+        Args:
+            index: Position of the message
+        
+        Returns:
+            DiscordMessage object
+        """
+        index = range(len(self))[index]
+        return DiscordMessage(
+            id=str(self.ids[index]),
+            content=self.text[self.content_offsets[index]:self.content_offsets[index + 1]],
+            username=self.usernames[self.username_indexes[index]],
+            user_id=str(self.author_ids[index]),
+            timestamp=self.timestamps[index],
+            channel_id=str(self.channel_ids[index]),
+            attachments_count=self.attachments_counts[index],
+            embeds_count=self.embeds_counts[index],
+            mentions_count=self.mentions_counts[index]
+        )
+    
+    def __iter__(self) -> Iterator[DiscordMessage]:
+        return iter(self.to_messages())
+    
+    def contents(self) -> List[str]:
+        """
+        Get the content of every message.
+        
+        Returns:
+            List of message contents, in batch order
+        """
+        text, offsets = self.text, self.content_offsets
+        return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+    
+    def take(self, indexes: Sequence[int], is_sorted: bool = False) -> 'MessageBatch':
+        """
+        Create a batch of the messages at the given positions.
+        
+        Args:
+            indexes: Positions of the messages to keep, in the order to keep them in
+            is_sorted: Whether the resulting messages are in chronological order
+        
+        Returns:
+            New MessageBatch object
+        """
+        text, offsets = self.text, self.content_offsets
+        return self._from_columns(
+            ids=[self.ids[i] for i in indexes],
+            author_ids=[self.author_ids[i] for i in indexes],
+            channel_ids=[self.channel_ids[i] for i in indexes],
+            timestamps=[self.timestamps[i] for i in indexes],
+            username_indexes=[self.username_indexes[i] for i in indexes],
+            usernames=self.usernames,
+            contents=[text[offsets[i]:offsets[i + 1]] for i in indexes],
+            attachments_counts=[self.attachments_counts[i] for i in indexes],
+            embeds_counts=[self.embeds_counts[i] for i in indexes],
+            mentions_counts=[self.mentions_counts[i] for i in indexes],
+            is_sorted=is_sorted
+        )
+    
+    def _slice(self, start: int, end: int) -> 'MessageBatch':
+        """
+        Create a batch of a contiguous range of messages without copying them one by one.
+        
+        Args:
+            start: Position of the first message
+            end: Position after the last message
+        
+        Returns:
+            New MessageBatch object
+        """
+        text_start = self.content_offsets[start]
+        offsets = self.content_offsets[start:end + 1]
+        if text_start:
+            offsets = array('Q', [offset - text_start for offset in offsets])
+        
+        return MessageBatch(
+            ids=self.ids[start:end],
+            author_ids=self.author_ids[start:end],
+            channel_ids=self.channel_ids[start:end],
+            timestamps=self.timestamps[start:end],
+            username_indexes=self.username_indexes[start:end],
+            usernames=self.usernames,
+            text=self.text[text_start:self.content_offsets[end]],
+            content_offsets=offsets,
+            attachments_counts=self.attachments_counts[start:end],
+            embeds_counts=self.embeds_counts[start:end],
+            mentions_counts=self.mentions_counts[start:end],
+            is_sorted=self.is_sorted
+        )
+    
+    def sorted(self) -> 'MessageBatch':
+        """
+        Sort the messages in chronological order, keeping the order of equal timestamps.
+        
+        Returns:
+            Sorted MessageBatch object
+        """
+        if self.is_sorted:
+            return self
+        
+        timestamps = self.timestamps
+        order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+        if order == list(range(len(order))):
+            return self._slice(0, len(order)) if order else MessageBatch.empty()
+        return self.take(order, is_sorted=True)
+    
+    def window(
+        self,
+        start: Optional[Union[datetime, int]] = None,
+        end: Optional[Union[datetime, int]] = None
+    ) -> 'MessageBatch':
+        """
+        Keep the messages created in a time window.
+        
+        On a sorted batch the window bounds are found by binary search and
+        the messages in between are sliced out in one step.
+        
+        Args:
+            start: Earliest creation time to keep, inclusive; unbounded if None
+            end: Latest creation time to keep, exclusive; unbounded if None
+        
+        Returns:
+            MessageBatch object with the messages in the window, in batch order
+        """
+        start_ms = None if start is None else _to_epoch_ms(start)
+        end_ms = None if end is None else _to_epoch_ms(end)
+        timestamps = self.timestamps
+        
+        if self.is_sorted:
+            low = 0 if start_ms is None else bisect_left(timestamps, start_ms)
+            high = len(timestamps) if end_ms is None else bisect_left(timestamps, end_ms, low)
+            if low == 0 and high == len(timestamps):
+                return self
+            return self._slice(low, high)
+        
+        indexes = [
+            i for i, timestamp in enumerate(timestamps)
+            if (start_ms is None or timestamp >= start_ms) and (end_ms is None or timestamp < end_ms)
+        ]
+        if len(indexes) == len(timestamps):
+            return self
+        return self.take(indexes)
+    
+    def author_counts(self) -> Dict[str, int]:
+        """
+        Count the messages of every author.
+        
+        Returns:
+            Dictionary mapping author user IDs to message counts, most active first
+        """
+        return {str(author_id): count for author_id, count in Counter(self.author_ids).most_common()}
+    
+    def username_counts(self) -> Dict[str, int]:
+        """
+        Count the messages posted under every username.
+        
+        Returns:
+            Dictionary mapping usernames to message counts, most active first
+        """
+        usernames = self.usernames
+        return {usernames[index]: count for index, count in Counter(self.username_indexes).most_common()}
+    
+    def format_lines(self) -> List[str]:
+        """
+        Format every message as "[YYYY-MM-DD HH:MM:SS] username: content".
+        
+        Produces the same lines as DiscordMessage.formatted_content, formatting
+        each minute and username once instead of once per message.
+        
+        Returns:
+            List of formatted lines, in batch order
+        """
+        usernames = self.usernames
+        minutes: Dict[int, str] = {}
+        lines = []
+        for timestamp, username_index, content in zip(self.timestamps, self.username_indexes, self.contents()):
+            minute, milliseconds = divmod(timestamp, 60000)
+            prefix = minutes.get(minute)
+            if prefix is None:
+                prefix = minutes[minute] = "[" + time.strftime("%Y-%m-%d %H:%M", time.gmtime(minute * 60))
+            lines.append(f"{prefix}:{milliseconds // 1000:02d}] {usernames[username_index]}: {content}")
+        return lines
@@ -101,4 +101,27 @@ class DiscordSummary:
             provider_name=data.get('provider_name', 'AI'),
             generation_time=generation_time,
             date=data.get('date')
-        )
\ No newline at end of file
+        )
+
+@dataclass
+class SummaryResult:
+    """
+    Outcome of a summarization request, successful or not.
+    
+    Failures carry the error instead of raising or returning an error
+    string, so callers can tell a summary from a failure and fall back.
+    """
+    text: Optional[str]
+    provider_name: Optional[str]
+    error: Optional[str] = None
+    latency: float = 0.0  # Seconds spent on the request
+    
+    @property
+    def ok(self) -> bool:
+        """
+        Check whether the request produced a summary.
+        
+        Returns:
+            True if summary text is available
+        """
+        return bool(self.text) and self.error is None
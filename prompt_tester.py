@@ -22,9 +22,10 @@ logger = logging.getLogger("prompt_tester")
 
 # Import from the main project
 from config.settings import load_config
-from summarizers import create_summarizer
+from summarizers import create_summarizer_pool
 from clients.dummy_discord_reader import DummyDiscordReaderClient
 from services.message_collector import MessageCollectorService
+from services.message_filter import create_filter_pipeline
 from services.summary_generator import SummaryGeneratorService
 from models.message import DiscordMessage
 
@@ -50,21 +51,32 @@ async def test_prompts(channel_id: Optional[str] = None, prompt_type: Optional[s
     
     # Initialize components with dummy reader
     dummy_reader = DummyDiscordReaderClient()
-    summarizer = create_summarizer(config.llm)
+    summarizer_pool = create_summarizer_pool(config.llm)
     message_collector = MessageCollectorService(dummy_reader, config.discord_reader)
-    summary_generator = SummaryGeneratorService(message_collector, summarizer)
+    summary_generator = SummaryGeneratorService(
+        message_collector,
+        summarizer_pool,
+        message_filter=create_filter_pipeline(config.filters)
+    )
     
     # Create timestamp for result files
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
+    # Share one collection between the channel and combined summaries
+    snapshot = summary_generator.create_snapshot(days=1)  # Days not used in dummy mode
+    
     # Test mode - single channel or all channels
+    channel_summaries = None
     if channel_id:
         await test_single_channel(channel_id, prompt_type, summary_generator, timestamp)
     else:
-        await test_all_channels(prompt_type, summary_generator, timestamp)
+        channel_summaries = await test_all_channels(prompt_type, summary_generator, timestamp, snapshot)
+    
+    # Test combined summary, reducing the channel summaries when we have them
+    await test_combined_summary(prompt_type, summary_generator, timestamp, snapshot, channel_summaries)
     
-    # Test combined summary
-    await test_combined_summary(prompt_type, summary_generator, timestamp)
+    summarizer_pool.log_usage()
+    await summarizer_pool.close()
     
     logger.info("Prompt testing completed. Results saved to the 'prompt_test_results' directory.")
 
@@ -104,7 +116,7 @@ async def test_single_channel(channel_id: str, prompt_type: Optional[str], summa
     else:
         logger.error(f"Failed to generate summary for channel {channel_id}")
 
-async def test_all_channels(prompt_type: Optional[str], summary_generator, timestamp: str):
+async def test_all_channels(prompt_type: Optional[str], summary_generator, timestamp: str, snapshot=None):
     """
     Test prompts on all available channels.
     
@@ -112,11 +124,15 @@ async def test_all_channels(prompt_type: Optional[str], summary_generator, times
         prompt_type: Prompt type to use
         summary_generator: SummaryGeneratorService instance
         timestamp: Timestamp for result files
+        snapshot: Collection snapshot to reuse (optional)
+        
+    Returns:
+        Dictionary mapping channel IDs to summary objects
     """
     logger.info("Testing prompts on all channels")
     
     # Get all channel summaries
-    channel_summaries = await summary_generator.generate_all_channel_summaries(days=1)  # Days not used in dummy mode
+    channel_summaries = await summary_generator.generate_all_channel_summaries(days=1, snapshot=snapshot)  # Days not used in dummy mode
     
     for channel_id, summary in channel_summaries.items():
         if summary:
@@ -135,8 +151,10 @@ async def test_all_channels(prompt_type: Optional[str], summary_generator, times
             logger.info(f"Saved channel summary to {filepath}")
         else:
             logger.error(f"Failed to generate summary for channel {channel_id}")
+    
+    return channel_summaries
 
-async def test_combined_summary(prompt_type: Optional[str], summary_generator, timestamp: str):
+async def test_combined_summary(prompt_type: Optional[str], summary_generator, timestamp: str, snapshot=None, channel_summaries=None):
     """
     Test the combined summary.
     
@@ -144,11 +162,17 @@ async def test_combined_summary(prompt_type: Optional[str], summary_generator, t
         prompt_type: Prompt type to use
         summary_generator: SummaryGeneratorService instance
         timestamp: Timestamp for result files
+        snapshot: Collection snapshot to reuse (optional)
+        channel_summaries: Channel summaries to reduce hierarchically (optional)
     """
     logger.info("Testing combined summary")
     
     # Generate combined summary
-    combined_summary = await summary_generator.generate_combined_summary(days=1)  # Days not used in dummy mode
+    combined_summary = await summary_generator.generate_combined_summary(
+        days=1,  # Days not used in dummy mode
+        snapshot=snapshot,
+        channel_summaries=channel_summaries
+    )
     
     if combined_summary:
         # Save the result
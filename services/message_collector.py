@@ -7,36 +7,185 @@ from multiple channels and provides processing of the collected messages.
 """
 
 import logging
-from typing import List, Dict, Tuple, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Tuple, Optional, AsyncIterator
 import asyncio
 
+from datetime import timedelta
+
 from clients.discord_reader import DiscordReaderClient
 from models.message import DiscordMessage
 from config.settings import DiscordReaderConfig
+from services.message_ingestion import MessageIngestionService
+from storage.message_store import MessageStore
+from storage.watermarks import WatermarkStore
+from utils.snowflake import snowflake_to_datetime, utc_now
 
 logger = logging.getLogger(__name__)
 
+class CollectionSnapshot:
+    """
+    Run-scoped snapshot of collected messages.
+    
+    Wraps a stream of collection results so that a single run collects every
+    channel once: a single task drives the stream and records each channel as
+    it completes, and every consumer, concurrent or later, receives the
+    recorded channels in order without calling Discord again.
+    """
+    
+    def __init__(self, source: AsyncIterator[Tuple[str, List[DiscordMessage], str]]):
+        """
+        Initialize the snapshot.
+        
+        Args:
+            source: Stream of (channel ID, list of messages, channel name) tuples
+        """
+        self._source = source
+        self._collection: Optional[asyncio.Task] = None
+        self._results: List[Tuple[str, List[DiscordMessage], str]] = []
+        self._changed: Optional[asyncio.Event] = None
+        self._error: Optional[Exception] = None
+        self._complete = False
+        self.channels: Dict[str, Tuple[List[DiscordMessage], str]] = {}
+    
+    def _notify(self) -> None:
+        """
+        Wake the consumers waiting for the next channel.
+        """
+        self._changed.set()
+        self._changed = asyncio.Event()
+    
+    async def _collect(self) -> None:
+        """
+        Drive the source to exhaustion, recording every channel.
+        """
+        try:
+            async for channel_id, messages, channel_name in self._source:
+                self.channels[channel_id] = (messages, channel_name)
+                self._results.append((channel_id, messages, channel_name))
+                self._notify()
+            self._complete = True
+        except Exception as e:
+            self._error = e
+        finally:
+            self._notify()
+    
+    async def iter_channels(self) -> AsyncIterator[Tuple[str, List[DiscordMessage], str]]:
+        """
+        Iterate over the snapshot, starting collection on the first pass.
+        
+        Consumers can stop early without affecting collection or each other.
+        
+        Yields:
+            Tuples of (channel ID, list of messages, channel name)
+        
+        Raises:
+            Exception: The error that stopped collection, if any
+        """
+        if self._collection is None:
+            self._changed = asyncio.Event()
+            self._collection = asyncio.create_task(self._collect())
+        
+        index = 0
+        while True:
+            # Replay whatever has been recorded so far
+            while index < len(self._results):
+                yield self._results[index]
+                index += 1
+            
+            if self._complete:
+                return
+            if self._error is not None:
+                raise self._error
+            if self._collection.done():
+                raise RuntimeError("Message collection was cancelled")
+            
+            await self._changed.wait()
+    
+    async def get_all(self) -> Dict[str, Tuple[List[DiscordMessage], str]]:
+        """
+        Get every channel in the snapshot, finishing collection if needed.
+        
+        Returns:
+            Dictionary mapping channel IDs to tuples of (list of messages, channel name)
+        """
+        if not self._complete:
+            async for _ in self.iter_channels():
+                pass
+        
+        return dict(self.channels)
+
 class MessageCollectorService:
     """
     Service for collecting messages from Discord channels.
     """
     
-    def __init__(self, client: DiscordReaderClient, config: DiscordReaderConfig):
+    def __init__(
+        self,
+        client: DiscordReaderClient,
+        config: DiscordReaderConfig,
+        watermarks: Optional[WatermarkStore] = None,
+        message_store: Optional[MessageStore] = None,
+        ingestion: Optional[MessageIngestionService] = None
+    ):
         """
         Initialize the message collector service.
         
         Args:
             client: Discord reader client
             config: Discord reader configuration
+            watermarks: Store of per-channel high-water marks. When provided
+                along with a message store, collection is incremental and only
+                fetches messages newer than the last message stored in a
+                previous run.
+            message_store: Local message database. When provided, collected
+                messages are written through to it.
+            ingestion: Realtime ingestion service. Channels it keeps up to date
+                are read from its message store instead of Discord.
         """
         self.client = client
         self.config = config
+        self.watermarks = watermarks
+        self.message_store = message_store
+        self.ingestion = ingestion
+        self.max_concurrency = max(1, getattr(config, 'max_concurrent_channels', 1))
+    
+    def _get_incremental_cursor(self, channel_id: str, days: int) -> Optional[str]:
+        """
+        Get the message ID to resume collection after, if incremental collection applies.
+        
+        A watermark older than the collection window is ignored, since paging
+        forward from it would fetch messages outside the window.
+        
+        Args:
+            channel_id: ID of the channel
+            days: Number of days to look back
+            
+        Returns:
+            Message ID to collect after, or None for a full window collection
+        """
+        # Older messages are read back from the store, so without one every run is a full one
+        if self.watermarks is None or self.message_store is None:
+            return None
+        
+        watermark = self.watermarks.get(channel_id)
+        if watermark is None:
+            return None
+        
+        if snowflake_to_datetime(watermark) < utc_now() - timedelta(days=days):
+            return None
+        
+        return watermark
     
     async def collect_from_channel(self, channel_id: str, days: int = 1) -> Tuple[List[DiscordMessage], str]:
         """
         Collect messages from a single channel.
         
+        In incremental mode only messages newer than the channel's high-water
+        mark are fetched, and the mark is advanced once they are in the message
+        store. If a message store is configured, the fetched messages are written
+        through to it and an incremental collection returns the full window read
+        back from the store.
+        
         Args:
             channel_id: ID of the channel to collect from
             days: Number of days to look back
@@ -44,8 +193,135 @@ class MessageCollectorService:
         Returns:
             Tuple of (list of messages, channel name)
         """
-        logger.info(f"Collecting messages from channel {channel_id} for the past {days} day(s)")
-        return self.client.collect_messages(channel_id, days)
+        if self.ingestion is not None and self.ingestion.is_live(channel_id):
+            return await self._read_ingested(channel_id, days)
+        
+        after = self._get_incremental_cursor(channel_id, days)
+        if after:
+            logger.info(f"Collecting messages from channel {channel_id} newer than message {after}")
+        else:
+            logger.info(f"Collecting messages from channel {channel_id} for the past {days} day(s)")
+        
+        messages, channel_name = await self.client.collect_messages(channel_id, days, after=after)
+        
+        if self.message_store is not None:
+            # SQLite calls are blocking, so keep them off the event loop
+            loop = asyncio.get_running_loop()
+            stored = await loop.run_in_executor(None, self._store_messages, channel_id, channel_name, messages)
+            
+            # Only advance the mark past messages a later run can read back
+            if stored and self.watermarks is not None and messages:
+                self.watermarks.update(channel_id, max(messages, key=lambda m: int(m.id)).id)
+                await loop.run_in_executor(None, self.watermarks.save)
+            
+            if after and stored:
+                since = utc_now() - timedelta(days=days)
+                messages = await loop.run_in_executor(None, self.message_store.get_messages, channel_id, since)
+            elif after:
+                logger.warning(f"Only the {len(messages)} new messages of channel {channel_id} are available this run")
+        
+        return messages, channel_name
+    
+    async def _read_ingested(self, channel_id: str, days: int) -> Tuple[List[DiscordMessage], str]:
+        """
+        Read a channel's window from the messages ingested in real time, without calling Discord.
+        
+        Args:
+            channel_id: ID of the channel
+            days: Number of days to look back
+            
+        Returns:
+            Tuple of (list of messages, channel name)
+        """
+        store = self.ingestion.message_store
+        since = utc_now() - timedelta(days=days)
+        
+        # SQLite calls are blocking, so keep them off the event loop
+        loop = asyncio.get_running_loop()
+        messages = await loop.run_in_executor(None, store.get_messages, channel_id, since)
+        channel_name = await loop.run_in_executor(None, store.get_channel_name, channel_id)
+        
+        logger.info(f"Read {len(messages)} ingested messages from channel {channel_id}")
+        return messages, channel_name or f"Channel {channel_id}"
+    
+    def _store_messages(self, channel_id: str, channel_name: str, messages: List[DiscordMessage]) -> bool:
+        """
+        Write collected messages and the channel name through to the message store.
+        
+        Args:
+            channel_id: ID of the channel
+            channel_name: Name of the channel
+            messages: Messages collected from the channel
+            
+        Returns:
+            True if the messages were stored, False otherwise
+        """
+        try:
+            self.message_store.set_channel_name(channel_id, channel_name)
+            written = self.message_store.upsert_messages(messages)
+            logger.debug(f"Stored {written} messages from channel {channel_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error storing messages from channel {channel_id}: {str(e)}")
+            return False
+    
+    async def collect_concurrently(
+        self,
+        channel_ids: List[str],
+        days: int = 1,
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, List[DiscordMessage], str]]:
+        """
+        Collect messages from several channels in parallel with a bounded worker pool.
+        
+        Results are yielded in completion order, so callers can start processing
+        a channel as soon as it has been collected. Rate limits are enforced by
+        the shared reader client, so concurrent workers back off together.
+        
+        Args:
+            channel_ids: IDs of the channels to collect from
+            days: Number of days to look back
+            max_concurrency: Maximum number of channels collected at once,
+                defaults to the configured limit
+            
+        Yields:
+            Tuples of (channel ID, list of messages, channel name)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        
+        async def worker(channel_id: str) -> Tuple[str, List[DiscordMessage], str]:
+            async with semaphore:
+                try:
+                    messages, channel_name = await self.collect_from_channel(channel_id, days)
+                except Exception as e:
+                    logger.error(f"Error collecting messages from channel {channel_id}: {str(e)}")
+                    messages, channel_name = [], f"Channel {channel_id}"
+                return channel_id, messages, channel_name
+        
+        tasks = [asyncio.create_task(worker(channel_id)) for channel_id in channel_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding workers if the consumer stops early
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def get_text_channel_ids(self, guild_id: str) -> List[str]:
+        """
+        Get the IDs of all text channels in a guild.
+        
+        Args:
+            guild_id: ID of the guild
+            
+        Returns:
+            List of text channel IDs
+        """
+        channels = await self.client.get_guild_channels(guild_id)
+        
+        # Filter for text channels only (type 0)
+        return [channel.get('id') for channel in channels if channel.get('type') == 0]
     
     async def collect_from_guild(self, guild_id: str, days: int = 1) -> List[Tuple[List[DiscordMessage], str]]:
         """
@@ -60,64 +336,71 @@ class MessageCollectorService:
         """
         logger.info(f"Collecting messages from all text channels in guild {guild_id}")
         
-        # Get all channels in the guild
-        channels = self.client.get_guild_channels(guild_id)
-        
-        # Filter for text channels only (type 0)
-        text_channels = [channel for channel in channels if channel.get('type') == 0]
+        text_channel_ids = await self.get_text_channel_ids(guild_id)
         
-        if not text_channels:
+        if not text_channel_ids:
             logger.warning(f"No text channels found in guild {guild_id}")
             return []
         
-        logger.info(f"Found {len(text_channels)} text channels in guild {guild_id}")
+        logger.info(f"Found {len(text_channel_ids)} text channels in guild {guild_id}")
         
-        # Collect messages from each channel
+        # Collect messages from all channels concurrently
         results = []
-        for channel in text_channels:
-            channel_id = channel.get('id')
-            messages, channel_name = await self.collect_from_channel(channel_id, days)
+        async for _, messages, channel_name in self.collect_concurrently(text_channel_ids, days):
             results.append((messages, channel_name))
         
         return results
     
-    async def collect_from_config(self, days: Optional[int] = None) -> Dict[str, Tuple[List[DiscordMessage], str]]:
+    async def iter_from_config(self, days: Optional[int] = None) -> AsyncIterator[Tuple[str, List[DiscordMessage], str]]:
         """
-        Collect messages based on the configuration.
+        Collect messages based on the configuration, yielding each channel as it completes.
+        
+        Channels from a guild that have no messages in the window are skipped.
         
         Args:
-            days: Number of days to look back, defaults to config value
+            days: Number of days to look back, defaults to 1
             
-        Returns:
-            Dictionary mapping channel IDs to tuples of (list of messages, channel name)
+        Yields:
+            Tuples of (channel ID, list of messages, channel name)
         """
         if days is None:
             days = 1  # Default to 1 day if not specified
         
-        results = {}
-        
         # If specific channel IDs are configured, collect from those
         if self.config.channel_ids:
             logger.info(f"Collecting messages from {len(self.config.channel_ids)} configured channels")
             
-            for channel_id in self.config.channel_ids:
-                messages, channel_name = await self.collect_from_channel(channel_id, days)
-                results[channel_id] = (messages, channel_name)
+            async for result in self.collect_concurrently(self.config.channel_ids, days):
+                yield result
         
         # If a guild ID is configured and we don't have specific channels, collect from the guild
         elif self.config.guild_id:
             logger.info(f"Collecting messages from all text channels in guild {self.config.guild_id}")
             
-            guild_results = await self.collect_from_guild(self.config.guild_id, days)
+            text_channel_ids = await self.get_text_channel_ids(self.config.guild_id)
+            if not text_channel_ids:
+                logger.warning(f"No text channels found in guild {self.config.guild_id}")
+                return
             
-            # Convert the list of results to a dictionary
-            for messages, channel_name in guild_results:
-                if messages:  # Only add channels with messages
-                    # Use the first message's channel_id
-                    channel_id = messages[0].channel_id if messages else "unknown"
-                    results[channel_id] = (messages, channel_name)
+            async for channel_id, messages, channel_name in self.collect_concurrently(text_channel_ids, days):
+                if messages:  # Only yield channels with messages
+                    yield channel_id, messages, channel_name
         
         else:
             logger.warning("No channels or guild configured for message collection")
+    
+    async def collect_from_config(self, days: Optional[int] = None) -> Dict[str, Tuple[List[DiscordMessage], str]]:
+        """
+        Collect messages based on the configuration.
+        
+        Args:
+            days: Number of days to look back, defaults to config value
+            
+        Returns:
+            Dictionary mapping channel IDs to tuples of (list of messages, channel name)
+        """
+        results = {}
+        async for channel_id, messages, channel_name in self.iter_from_config(days):
+            results[channel_id] = (messages, channel_name)
         
-        return results
\ No newline at end of file
+        return results
@@ -0,0 +1,422 @@
+"""
+Message Filter Service
+
+This service removes noise from collected messages before they are
+summarized: messages by denied (or not allowed) authors, messages carrying
+almost no information such as "gm" spam, and copy-pasted or near-duplicate
+messages such as repeated shill and bot posts. Filters are pluggable and
+run in order, each one only seeing the messages the previous ones kept.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from config.settings import FilterConfig
+from models.message import DiscordMessage
+
+logger = logging.getLogger(__name__)
+
+class MessageFilter(ABC):
+    """
+    Abstract base class for message filters.
+    """
+    
+    # Name used in the drop counts
+    name: str = "filter"
+    
+    @property
+    def settings(self) -> str:
+        """
+        Describe the filter and its parameters, the same way in every process.
+        
+        Returns:
+            Name and public attributes of the filter, e.g. "near_duplicate(max_distance=3, min_tokens=5)"
+        """
+        parameters = []
+        for key, value in vars(self).items():
+            if key.startswith("_"):
+                continue
+            if isinstance(value, (set, frozenset)):
+                value = sorted(value)
+            parameters.append(f"{key}={value!r}")
+        return f"{self.name}({', '.join(parameters)})"
+    
+    @abstractmethod
+    def filter(self, messages: List[DiscordMessage]) -> List[DiscordMessage]:
+        """
+        Filter the messages of one channel.
+        
+        Args:
+            messages: Messages in chronological order
+        
+        Returns:
+            Messages kept, in the same order
+        """
+        pass
+
+class AuthorFilter(MessageFilter):
+    """
+    Keeps only allowed authors and drops denied ones, matched by user ID or username.
+    """
+    
+    name = "authors"
+    
+    def __init__(self, allowed: Iterable[str] = (), denied: Iterable[str] = ()):
+        """
+        Initialize the filter.
+        
+        Args:
+            allowed: User IDs or usernames to keep; if empty, every author not denied is kept
+            denied: User IDs or usernames to drop, e.g. bots
+        """
+        self.allowed = {author.strip().lower() for author in allowed if author.strip()}
+        self.denied = {author.strip().lower() for author in denied if author.strip()}
+    
+    def _is_kept(self, message: DiscordMessage) -> bool:
+        user_id, username = message.user_id, message.username.lower()
+        if user_id in self.denied or username in self.denied:
+            return False
+        return not self.allowed or user_id in self.allowed or username in self.allowed
+    
+    def filter(self, messages: List[DiscordMessage]) -> List[DiscordMessage]:
+        if not self.allowed and not self.denied:
+            return messages
+        return [message for message in messages if self._is_kept(message)]
+
+# Messages made only of these words carry nothing worth summarizing
+LOW_INFORMATION_WORDS = frozenset({
+    "gm", "gn", "gmgm", "gg", "lfg", "wagmi", "ngmi", "lol", "lmao", "lmfao", "kek", "ser", "sers",
+    "fren", "frens", "ok", "okay", "k", "ty", "thx", "thanks", "wen", "moon", "soon", "this", "same",
+    "nice", "based", "yes", "no", "yep", "nope", "ya", "yo", "hi", "hey", "hello", "bullish",
+    "bearish", "pump", "it", "wow", "haha", "hahaha", "xd", "all", "everyone", "fam", "morning", "night"
+})
+
+URL_PATTERN = re.compile(r"https?://\S+")
+# Mentions, channel links and custom emoji
+DISCORD_MARKUP_PATTERN = re.compile(r"<(?:@[!&]?|#|a?:\w+:)\d+>")
+# Words in any script, so non-English messages are measured and fingerprinted too
+WORD_PATTERN = re.compile(r"\w[\w']*")
+# Number of leading characters in which the low-information filter first counts words
+WORD_COUNT_PREFIX = 64
+
+class LowInformationFilter(MessageFilter):
+    """
+    Drops messages with too little text or made only of filler words such as "gm".
+    
+    Messages containing a link are always kept, since the link is the information.
+    """
+    
+    name = "low_information"
+    
+    def __init__(self, min_chars: int = 3, max_filler_words: int = 4):
+        """
+        Initialize the filter.
+        
+        Args:
+            min_chars: Minimum number of letters and digits a message must contain
+            max_filler_words: Longest message of only filler words that is dropped
+        """
+        self.min_chars = min_chars
+        self.max_filler_words = max_filler_words
+    
+    def _is_kept(self, content: str) -> bool:
+        if "http" in content and URL_PATTERN.search(content):
+            return True
+        
+        if "<" in content:
+            content = DISCORD_MARKUP_PATTERN.sub(" ", content)
+        
+        # Most messages have enough words in their first characters to be kept
+        # without splitting the whole text
+        words = WORD_PATTERN.findall(content, 0, WORD_COUNT_PREFIX)
+        if len(words) <= self.max_filler_words and len(content) > WORD_COUNT_PREFIX:
+            words = WORD_PATTERN.findall(content)
+        if len(words) > self.max_filler_words:
+            return True
+        return sum(map(len, words)) >= self.min_chars and not LOW_INFORMATION_WORDS.issuperset(map(str.lower, words))
+    
+    def filter(self, messages: List[DiscordMessage]) -> List[DiscordMessage]:
+        return [message for message in messages if self._is_kept(message.content)]
+
+# Number of bits of a SimHash fingerprint
+FINGERPRINT_BITS = 64
+
+# Most words a fingerprint is computed from; one-byte bit counters hold up to 255
+MAX_WORDS = 255
+
+# Turns every ASCII character other than letters, digits and underscores into
+# a space in UTF-8 text. Bytes of other characters are kept, so words in any
+# script survive
+WORD_SEPARATORS = bytes(code for code in range(128) if not (chr(code).isalnum() or chr(code) == "_"))
+SEPARATORS_TO_SPACES = bytes.maketrans(WORD_SEPARATORS, b" " * len(WORD_SEPARATORS))
+
+# Keeps the lowest bit of every byte
+LOWEST_BITS = bytes(value & 1 for value in range(256))
+
+# For n words, turns a bit counter into the binary digit "1" if the bit was
+# set in more than half of the words, and "0" otherwise
+MAJORITY_DIGITS = [
+    bytes(ord("1") if count > word_count // 2 else ord("0") for count in range(256))
+    for word_count in range(MAX_WORDS + 1)
+]
+
+def _normalize(content: str) -> bytes:
+    """
+    Normalize a message to its lowercase words separated by single spaces.
+    
+    Args:
+        content: Message text
+    
+    Returns:
+        UTF-8 encoded words
+    """
+    return b" ".join(content.lower().encode("utf-8").translate(SEPARATORS_TO_SPACES).split())
+
+def _bit_counters(token: bytes) -> int:
+    """
+    Hash a token to 64 bits, the same way in every process, as 64 one-byte
+    bit counters packed into one integer.
+    
+    Counter i holds bit i of the hash, so adding the counters of several
+    tokens counts how many of them have each bit set, for all 64 bits in one
+    integer addition. Each bit is the lowest bit of one byte of a 64-byte hash.
+    
+    Args:
+        token: Word to hash
+    
+    Returns:
+        Integer whose byte i is 1 if bit i of the token's hash is set, 0 otherwise
+    """
+    digest = hashlib.blake2b(token, digest_size=FINGERPRINT_BITS).digest()
+    return int.from_bytes(digest.translate(LOWEST_BITS), "big")
+
+class BitCounters(dict):
+    """
+    Bit counters of the hash of every word looked up, see _bit_counters.
+    
+    Each word is hashed on its first lookup only.
+    """
+    
+    def __missing__(self, token: bytes) -> int:
+        counters = self[token] = _bit_counters(token)
+        return counters
+
+def simhash(words: Set[bytes], bit_counters: Dict[bytes, int]) -> int:
+    """
+    Compute the 64-bit SimHash fingerprint of a set of words.
+    
+    Bit i of the fingerprint is set if bit i is set in the hashes of more
+    than half of the words, so messages sharing most of their words get
+    fingerprints differing in few bits. Words count once however often they
+    are repeated, so that a common word repeated in many messages doesn't
+    pull all of their fingerprints together.
+    
+    Args:
+        words: Distinct words of a message
+        bit_counters: Bit counters of the hash of every word, see _bit_counters
+    
+    Returns:
+        SimHash fingerprint
+    """
+    if len(words) > MAX_WORDS:
+        words = sorted(words)[:MAX_WORDS]
+    counts = sum(map(bit_counters.__getitem__, words)).to_bytes(FINGERPRINT_BITS, "big")
+    return int(counts.translate(MAJORITY_DIGITS[len(words)]), 2)
+
+class NearDuplicateFilter(MessageFilter):
+    """
+    Drops messages that repeat an earlier message of the channel, exactly or nearly.
+    
+    Short messages are compared after normalization (case, punctuation and
+    whitespace); longer ones by the Hamming distance of their SimHash
+    fingerprints, so copy-pasted messages with small edits are caught too.
+    Fingerprints are indexed by bands of bits, so each one is only compared
+    with the fingerprints sharing one of its bands.
+    """
+    
+    name = "near_duplicate"
+    
+    def __init__(self, max_distance: int = 3, min_tokens: int = 5):
+        """
+        Initialize the filter.
+        
+        Args:
+            max_distance: Maximum number of differing fingerprint bits of near-duplicates
+            min_tokens: Messages with fewer words are only dropped on a normalized exact match
+        """
+        self.max_distance = max(0, min(max_distance, 15))
+        
+        # Fingerprints differing in at most max_distance bits are identical in
+        # at least one of max_distance + 1 bands of bits, selected by these masks
+        band_count = self.max_distance + 1
+        band_bits = FINGERPRINT_BITS // band_count
+        self._band_masks = [
+            ((1 << (band_bits if band < band_count - 1 else FINGERPRINT_BITS - band * band_bits)) - 1) << band * band_bits
+            for band in range(band_count)
+        ]
+        self.min_tokens = min_tokens
+    
+    def _has_near_duplicate(self, index: Dict[int, Union[int, List[int]]], fingerprint: int) -> bool:
+        """
+        Check whether an indexed fingerprint is within the maximum distance of a fingerprint.
+        
+        Args:
+            index: Fingerprints kept so far, see _add_to_index
+            fingerprint: Fingerprint to look up
+        
+        Returns:
+            True if a near-duplicate was found
+        """
+        for mask in self._band_masks:
+            candidates = index.get(fingerprint & mask)
+            if candidates is None:
+                continue
+            if isinstance(candidates, int):
+                candidates = (candidates,)
+            for candidate in candidates:
+                if (candidate ^ fingerprint).bit_count() <= self.max_distance:
+                    return True
+        return False
+    
+    def _add_to_index(self, index: Dict[int, Union[int, List[int]]], fingerprint: int) -> None:
+        """
+        Index a fingerprint by its bits in each band.
+        
+        Args:
+            index: Maps the bits of a fingerprint in one band, the others
+                cleared, to the fingerprints having them: a single
+                fingerprint as is, so that the garbage collector has no list
+                to track for most keys, and several as a list. Keys of
+                different bands only meet when all their bits are clear,
+                which at worst adds candidates to compare
+            fingerprint: Fingerprint to add
+        """
+        for mask in self._band_masks:
+            key = fingerprint & mask
+            candidates = index.get(key)
+            if candidates is None:
+                index[key] = fingerprint
+            elif isinstance(candidates, int):
+                index[key] = [candidates, fingerprint]
+            else:
+                candidates.append(fingerprint)
+    
+    def filter(self, messages: List[DiscordMessage]) -> List[DiscordMessage]:
+        # Verbatim copies, the most common case, are dropped before tokenizing
+        first_messages: Dict[str, DiscordMessage] = {}
+        for message in messages:
+            first_messages.setdefault(message.content, message)
+        
+        # Every distinct word of the run is hashed once; the counters are
+        # dropped with the run, so memory doesn't grow across runs
+        bit_counters = BitCounters()
+        
+        seen_texts = set()
+        index: Dict[int, Union[int, List[int]]] = {}
+        kept = []
+        
+        for content, message in first_messages.items():
+            # Copies differing only in case, punctuation or whitespace. Texts
+            # are kept as strings rather than lists of words so that the
+            # garbage collector has fewer objects to track
+            text = _normalize(content)
+            normalized = text or content
+            if normalized in seen_texts:
+                continue
+            seen_texts.add(normalized)
+            
+            # Too few words for a meaningful fingerprint
+            if text.count(b" ") + 1 < self.min_tokens:
+                kept.append(message)
+                continue
+            
+            fingerprint = simhash(set(text.split()), bit_counters)
+            if self._has_near_duplicate(index, fingerprint):
+                continue
+            
+            self._add_to_index(index, fingerprint)
+            kept.append(message)
+        
+        return kept
+
+class MessageFilterPipeline:
+    """
+    Runs message filters in order and counts the messages each one drops.
+    """
+    
+    def __init__(self, filters: List[MessageFilter]):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            filters: Filters to run, in order
+        """
+        self.filters = filters
+        self.dropped: Dict[str, int] = {message_filter.name: 0 for message_filter in filters}
+    
+    @property
+    def settings(self) -> str:
+        """
+        Describe the filters and their parameters, e.g. for summary cache keys.
+        
+        Returns:
+            Settings of every filter, in order
+        """
+        return "; ".join(message_filter.settings for message_filter in self.filters)
+    
+    def apply(self, messages: List[DiscordMessage], channel_name: str = "") -> List[DiscordMessage]:
+        """
+        Filter the messages of one channel.
+        
+        Args:
+            messages: Messages to filter
+            channel_name: Name of the channel, for logging
+        
+        Returns:
+            Messages kept by every filter, in chronological order
+        """
+        if not messages or not self.filters:
+            return messages
+        
+        start_time = time.perf_counter()
+        kept = sorted(messages, key=lambda m: m.timestamp_ms)
+        counts = []
+        for message_filter in self.filters:
+            before = len(kept)
+            kept = message_filter.filter(kept)
+            self.dropped[message_filter.name] += before - len(kept)
+            counts.append(f"{message_filter.name}={before - len(kept)}")
+        
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            f"Filtered {channel_name}: kept {len(kept)} of {len(messages)} messages "
+            f"(dropped {', '.join(counts)}) in {elapsed_ms:.0f} ms"
+        )
+        return kept
+
+def create_filter_pipeline(config: FilterConfig) -> Optional[MessageFilterPipeline]:
+    """
+    Create the filter pipeline from the configuration.
+    
+    Args:
+        config: Filter configuration
+    
+    Returns:
+        Filter pipeline, or None if filtering is disabled
+    """
+    if not config.enabled:
+        return None
+    
+    filters: List[MessageFilter] = []
+    if config.allowed_authors or config.denied_authors:
+        filters.append(AuthorFilter(config.allowed_authors, config.denied_authors))
+    if config.min_information_chars > 0:
+        filters.append(LowInformationFilter(config.min_information_chars))
+    if config.near_duplicate_distance >= 0:
+        filters.append(NearDuplicateFilter(config.near_duplicate_distance))
+    
+    return MessageFilterPipeline(filters)
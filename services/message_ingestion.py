@@ -0,0 +1,446 @@
+"""
+Message Ingestion Service
+
+This service keeps the local message store up to date in real time. It
+listens to the MESSAGE_CREATE, MESSAGE_UPDATE and MESSAGE_DELETE gateway
+events received by the Discord writer's bot client, so at summary time the
+messages of every channel the bot can see are already stored and collecting
+them costs no API calls.
+
+Events are only delivered while the gateway is connected. Each time a new
+gateway session starts, the messages posted since the newest one ingested
+in each channel are fetched over REST to heal the gap. Until a channel has
+been healed, and whenever the gateway is disconnected, the collector falls
+back to REST for it.
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set
+
+import discord
+
+from clients.discord_reader import DiscordReaderClient
+from clients.discord_writer import DiscordWriterClient
+from models.message import DiscordMessage
+from storage.message_store import MessageStore
+from storage.watermarks import WatermarkStore
+from utils.snowflake import snowflake_to_datetime, utc_now
+
+logger = logging.getLogger(__name__)
+
+class MessageIngestionService:
+    """
+    Writes gateway message events to the message store and heals gaps over REST.
+    """
+    
+    def __init__(
+        self,
+        writer: DiscordWriterClient,
+        reader: DiscordReaderClient,
+        message_store: MessageStore,
+        watermarks: WatermarkStore,
+        channel_ids: Optional[List[str]] = None,
+        guild_id: Optional[str] = None,
+        days: int = 1,
+        max_concurrency: int = 4,
+        flush_interval: float = 1.0
+    ):
+        """
+        Initialize the ingestion service.
+        
+        Args:
+            writer: Discord writer whose bot client receives the gateway events
+            reader: Discord reader used to heal gaps over REST
+            message_store: Local message database the events are written to
+            watermarks: Store of the newest message ingested per channel
+            channel_ids: IDs of the channels to ingest
+            guild_id: ID of the guild whose text channels are ingested when no
+                channel IDs are given
+            days: Number of days to backfill for a channel without a watermark
+            max_concurrency: Maximum number of channels healed at once
+            flush_interval: Seconds between writes of buffered events to the store
+        """
+        self.writer = writer
+        self.reader = reader
+        self.message_store = message_store
+        self.watermarks = watermarks
+        self.channel_ids = set(channel_ids or [])
+        self.guild_id = guild_id
+        self.days = days
+        self.max_concurrency = max(1, max_concurrency)
+        self.flush_interval = flush_interval
+        
+        self.connected = False
+        # Channels whose stored messages are complete up to now
+        self._live_channels: Set[str] = set()
+        # Store operations waiting to be written, in the order the events arrived,
+        # as [kind, arguments] lists
+        self._pending: List[List[Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._heal_task: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """
+        Register the gateway event handlers and start writing events to the store.
+        
+        Must be called before the writer's client connects.
+        """
+        client = self.writer.client
+        
+        # discord.py keeps a single handler per event, so only events the writer does not use are registered
+        # here; the writer's on_ready handler runs the callback below
+        @client.event
+        async def on_message(message: discord.Message) -> None:
+            self.on_message(message)
+        
+        @client.event
+        async def on_raw_message_edit(payload: discord.RawMessageUpdateEvent) -> None:
+            self.on_message_edit(payload.channel_id, payload.message_id, payload.data)
+        
+        @client.event
+        async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent) -> None:
+            self.on_messages_deleted(payload.channel_id, [payload.message_id])
+        
+        @client.event
+        async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent) -> None:
+            self.on_messages_deleted(payload.channel_id, payload.message_ids)
+        
+        @client.event
+        async def on_disconnect() -> None:
+            if self.connected:
+                logger.warning("Gateway disconnected, collecting over REST until it is back")
+            self.connected = False
+        
+        @client.event
+        async def on_resumed() -> None:
+            # A resumed session replays the events missed while disconnected
+            logger.info("Gateway session resumed")
+            self.connected = True
+        
+        async def on_ready() -> None:
+            # A new session does not replay anything, so the gap must be healed over REST
+            self.connected = True
+            self._live_channels.clear()
+            if self._heal_task is not None and not self._heal_task.done():
+                self._heal_task.cancel()
+            self._heal_task = asyncio.create_task(self.heal_gaps())
+        
+        self.writer.add_on_ready_callback(on_ready)
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+        logger.info("Realtime message ingestion enabled")
+    
+    async def stop(self) -> None:
+        """
+        Stop ingestion, writing any buffered events to the store.
+        """
+        for task in (self._heal_task, self._flush_task):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        
+        await self.flush()
+        self.connected = False
+        self._live_channels.clear()
+    
+    def is_live(self, channel_id: str) -> bool:
+        """
+        Check whether a channel's stored messages are complete, so it can be read from the store.
+        
+        Args:
+            channel_id: ID of the channel
+        
+        Returns:
+            True if the gateway is connected and the channel has been healed since it connected
+        """
+        return self.connected and channel_id in self._live_channels
+    
+    def _is_ingested(self, channel: Any) -> bool:
+        """
+        Check whether messages of a channel should be ingested.
+        
+        Args:
+            channel: discord.py channel the event happened in
+        
+        Returns:
+            True if the channel is configured, or is a text channel of the configured guild
+        """
+        if self.channel_ids:
+            return str(channel.id) in self.channel_ids
+        
+        guild = getattr(channel, 'guild', None)
+        return (
+            bool(self.guild_id)
+            and isinstance(channel, discord.TextChannel)
+            and guild is not None
+            and str(guild.id) == self.guild_id
+        )
+    
+    def _convert_message(self, message: discord.Message) -> DiscordMessage:
+        """
+        Convert a discord.py message to a DiscordMessage model.
+        
+        Args:
+            message: Message received from the gateway
+        
+        Returns:
+            DiscordMessage object
+        """
+        return DiscordMessage(
+            id=str(message.id),
+            content=message.content,
+            username=message.author.name,
+            user_id=str(message.author.id),
+            timestamp=message.created_at,
+            channel_id=str(message.channel.id),
+            attachments_count=len(message.attachments),
+            embeds_count=len(message.embeds),
+            mentions_count=len(message.mentions)
+        )
+    
+    def on_message(self, message: discord.Message) -> None:
+        """
+        Buffer a newly posted message for the store.
+        
+        Args:
+            message: Message received from the gateway
+        """
+        # Messages without content are skipped, like when collecting over REST
+        if not message.content or not self._is_ingested(message.channel):
+            return
+        
+        self._pending.append(["upsert", self._convert_message(message)])
+    
+    def on_message_edit(self, channel_id: int, message_id: int, data: Dict[str, Any]) -> None:
+        """
+        Buffer the edit of a message for the store.
+        
+        Args:
+            channel_id: ID of the channel
+            message_id: ID of the edited message
+            data: Raw MESSAGE_UPDATE payload, with only the changed fields for some edits
+        """
+        channel_id, message_id = str(channel_id), str(message_id)
+        if 'content' not in data or not self._is_channel_known(channel_id):
+            return
+        
+        if not data['content']:
+            # Messages without content are not stored
+            self._pending.append(["delete", (channel_id, [message_id])])
+            return
+        
+        counts = {
+            f"{field}_count": len(data[field]) for field in ("attachments", "embeds", "mentions") if field in data
+        }
+        self._pending.append(["update", (channel_id, message_id, data['content'], counts)])
+    
+    def on_messages_deleted(self, channel_id: int, message_ids: Any) -> None:
+        """
+        Buffer the deletion of messages for the store.
+        
+        Args:
+            channel_id: ID of the channel
+            message_ids: IDs of the deleted messages
+        """
+        channel_id = str(channel_id)
+        if self._is_channel_known(channel_id):
+            self._pending.append(["delete", (channel_id, [str(message_id) for message_id in message_ids])])
+    
+    def _is_channel_known(self, channel_id: str) -> bool:
+        """
+        Check whether a channel of a raw event is ingested.
+        
+        Args:
+            channel_id: ID of the channel
+        
+        Returns:
+            True if the channel's messages are ingested
+        """
+        channel = self.writer.client.get_channel(int(channel_id))
+        return self._is_ingested(channel) if channel is not None else channel_id in self.channel_ids
+    
+    async def flush(self) -> None:
+        """
+        Write the buffered events to the store and persist the watermarks.
+        
+        Operations queued after a channel whose REST fetch is still running
+        wait for it, so fetched messages are always written before the events
+        received while they were fetched.
+        """
+        # Flushes run one at a time so their writes keep the order of the events
+        async with self._flush_lock:
+            ready = next(
+                (index for index, (kind, arguments) in enumerate(self._pending) if kind == "heal" and arguments[1] is None),
+                len(self._pending)
+            )
+            operations, self._pending = self._pending[:ready], self._pending[ready:]
+            if not operations:
+                return
+            
+            # SQLite calls are blocking, so keep them off the event loop
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, self._apply, operations):
+                # The store may now miss messages of these channels, so read them over REST again
+                self._live_channels.difference_update(self._channels_of(operations))
+                return
+            
+            # Watermarks only advance once the messages before them are stored
+            for kind, arguments in operations:
+                if kind == "heal" and arguments[1] is not False:
+                    channel_id, (channel_name, messages) = arguments
+                    if messages:
+                        self.watermarks.update(channel_id, max(messages, key=lambda m: int(m.id)).id)
+                    self._live_channels.add(channel_id)
+                    logger.info(f"Healed {channel_name}: {len(messages)} messages fetched over REST")
+                elif kind == "upsert" and arguments.channel_id in self._live_channels:
+                    self.watermarks.update(arguments.channel_id, arguments.id)
+            await loop.run_in_executor(None, self.watermarks.save)
+    
+    @staticmethod
+    def _channels_of(operations: List[List[Any]]) -> Set[str]:
+        """
+        Get the channels touched by store operations.
+        
+        Args:
+            operations: Store operations as [kind, arguments] lists
+        
+        Returns:
+            Set of channel IDs
+        """
+        return {arguments.channel_id if kind == "upsert" else arguments[0] for kind, arguments in operations}
+    
+    def _apply(self, operations: List[List[Any]]) -> bool:
+        """
+        Apply buffered store operations in order, batching consecutive inserts.
+        
+        Args:
+            operations: Store operations as [kind, arguments] lists
+        
+        Returns:
+            True if every operation was written
+        """
+        upserts: List[DiscordMessage] = []
+        try:
+            for kind, arguments in operations:
+                if kind == "upsert":
+                    upserts.append(arguments)
+                    continue
+                
+                if upserts:
+                    self.message_store.upsert_messages(upserts)
+                    upserts = []
+                
+                if kind == "heal":
+                    channel_id, result = arguments
+                    if result is not False:
+                        channel_name, messages = result
+                        self.message_store.set_channel_name(channel_id, channel_name)
+                        self.message_store.upsert_messages(messages)
+                elif kind == "update":
+                    channel_id, message_id, content, counts = arguments
+                    self.message_store.update_message(channel_id, message_id, content, **counts)
+                else:
+                    channel_id, message_ids = arguments
+                    self.message_store.delete_messages(channel_id, message_ids)
+            
+            if upserts:
+                self.message_store.upsert_messages(upserts)
+            logger.debug(f"Wrote {len(operations)} ingested message events to the store")
+            return True
+        except Exception as e:
+            logger.error(f"Error writing ingested message events to the store: {str(e)}")
+            return False
+    
+    async def _flush_periodically(self) -> None:
+        """
+        Write buffered events to the store every flush interval.
+        """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing ingested messages: {str(e)}")
+    
+    def _get_visible_channels(self) -> Dict[str, str]:
+        """
+        Get the ingested channels the bot can read, with their names.
+        
+        Returns:
+            Dictionary mapping channel IDs to channel names
+        """
+        client = self.writer.client
+        if self.channel_ids:
+            candidates = [client.get_channel(int(channel_id)) for channel_id in self.channel_ids]
+        else:
+            guild = client.get_guild(int(self.guild_id)) if self.guild_id else None
+            candidates = list(guild.text_channels) if guild is not None else []
+        
+        channels = {}
+        for channel in candidates:
+            if channel is None or not self._is_ingested(channel):
+                continue
+            guild = getattr(channel, 'guild', None)
+            if guild is not None and not channel.permissions_for(guild.me).read_message_history:
+                continue
+            channels[str(channel.id)] = channel.name
+        return channels
+    
+    async def heal_gaps(self) -> None:
+        """
+        Fetch over REST the messages posted while the gateway was disconnected.
+        
+        Each channel is fetched from its watermark, or for the whole collection
+        window if it has none or it is older than the window, and becomes live
+        once its messages are stored.
+        """
+        channels = self._get_visible_channels()
+        skipped = len(self.channel_ids) - len(channels) if self.channel_ids else 0
+        if skipped:
+            logger.warning(f"The bot cannot read {skipped} configured channels; they are collected over REST")
+        
+        logger.info(f"Healing gaps in {len(channels)} ingested channels")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def heal(channel_id: str, channel_name: str) -> None:
+            async with semaphore:
+                try:
+                    await self._heal_channel(channel_id, channel_name)
+                except Exception as e:
+                    logger.error(f"Error healing channel {channel_id}: {str(e)}")
+        
+        await asyncio.gather(*(heal(channel_id, name) for channel_id, name in channels.items()))
+        logger.info(f"{len(self._live_channels)} channels are ingested in real time")
+    
+    async def _heal_channel(self, channel_id: str, channel_name: str) -> None:
+        """
+        Fetch a channel's messages newer than its watermark over REST and queue them for the store.
+        
+        The fetched messages take the place in the queue of the moment the
+        fetch started, and the channel becomes live once they are written.
+        
+        Args:
+            channel_id: ID of the channel
+            channel_name: Name of the channel
+        
+        Raises:
+            RuntimeError: If part of the gap could not be fetched. The channel
+                then does not become live and keeps being collected over REST.
+        """
+        after = self.watermarks.get(channel_id)
+        if after is not None and snowflake_to_datetime(after) < utc_now() - timedelta(days=self.days):
+            after = None
+        
+        arguments = [channel_id, None]
+        self._pending.append(["heal", arguments])
+        try:
+            batch, _ = await self.reader.collect_message_batch(channel_id, self.days, after=after)
+            arguments[1] = (channel_name, batch.to_messages())
+        finally:
+            # A failed or cancelled fetch must not hold back the queue
+            if arguments[1] is None:
+                arguments[1] = False
+        
+        await self.flush()
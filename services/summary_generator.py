@@ -5,15 +5,23 @@ This service orchestrates the generation of summaries from collected messages.
 It coordinates between the message collector and summarizer components.
 """
 
+import asyncio
 import logging
-import os  # Add this import at the top
-from typing import List, Dict, Tuple, Optional
-from datetime import datetime
+from typing import List, Dict, Tuple, Optional, AsyncIterator
+from datetime import datetime, timedelta
 
 from models.message import DiscordMessage
 from models.summary import DiscordSummary
 from summarizers.base import BaseSummarizer
-from services.message_collector import MessageCollectorService
+from summarizers.pool import SummarizerPool
+from services.message_collector import MessageCollectorService, CollectionSnapshot
+from services.message_filter import MessageFilterPipeline
+from storage.batch_jobs import BatchJob
+from storage.message_store import MessageStore
+from storage.rolling_summaries import RollingSummary, RollingSummaryStore
+from storage.summary_cache import SummaryCache, build_cache_key
+from utils.prompts import PromptTemplates
+from utils.snowflake import utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -22,22 +30,129 @@ class SummaryGeneratorService:
     Service for generating summaries from collected messages.
     """
     
-    def __init__(self, message_collector: MessageCollectorService, summarizer: BaseSummarizer):
+    def __init__(
+        self,
+        message_collector: MessageCollectorService,
+        summarizer_pool: SummarizerPool,
+        message_store: Optional[MessageStore] = None,
+        max_concurrent_summaries: int = 8,
+        summary_cache: Optional[SummaryCache] = None,
+        rolling_summaries: Optional[RollingSummaryStore] = None,
+        rolling_summary_max_age_days: int = 7,
+        message_filter: Optional[MessageFilterPipeline] = None
+    ):
         """
         Initialize the summary generator service.
         
         Args:
             message_collector: Service for collecting messages
-            summarizer: Summarizer implementation
+            summarizer_pool: Long-lived summarizers, primary provider first
+            message_store: Local message database for offline summaries (optional)
+            max_concurrent_summaries: Maximum number of channels summarized in parallel
+            summary_cache: Cache consulted before calling any summarizer (optional)
+            rolling_summaries: Store of previous channel summaries that new
+                messages are folded into (optional)
+            rolling_summary_max_age_days: Age after which a rolling summary is
+                regenerated from scratch
+            message_filter: Pipeline removing noise from collected messages
+                before they are summarized (optional)
         """
         self.message_collector = message_collector
-        self.summarizer = summarizer
+        self.summarizer_pool = summarizer_pool
+        self.summarizer = summarizer_pool.primary
+        self.message_store = message_store
+        self.max_concurrent_summaries = max(1, max_concurrent_summaries)
+        self.summary_cache = summary_cache
+        self.rolling_summaries = rolling_summaries
+        self.rolling_summary_max_age_days = rolling_summary_max_age_days
+        self.message_filter = message_filter
+    
+    async def read_stored_window(
+        self,
+        days: int = 1,
+        channel_ids: Optional[List[str]] = None
+    ) -> Dict[str, Tuple[List[DiscordMessage], str]]:
+        """
+        Read a time window of messages from the local message store without calling Discord.
+        
+        Args:
+            days: Number of days to look back
+            channel_ids: Channels to read, defaults to the configured channels
+                or every stored channel if none are configured
+            
+        Returns:
+            Dictionary mapping channel IDs to tuples of (list of messages, channel name)
+        """
+        if self.message_store is None:
+            raise ValueError("No message store configured")
+        
+        if channel_ids is None:
+            channel_ids = self.message_collector.config.channel_ids or None
+        
+        since = utc_now() - timedelta(days=days)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.message_store.get_window, since, channel_ids)
+    
+    async def _iter_channel_messages(
+        self,
+        days: int,
+        from_store: bool
+    ) -> AsyncIterator[Tuple[str, List[DiscordMessage], str]]:
+        """
+        Iterate over the messages of every configured channel, from Discord or the local store.
+        
+        Args:
+            days: Number of days to look back
+            from_store: Read from the local message store instead of Discord
+            
+        Yields:
+            Tuples of (channel ID, list of messages, channel name)
+        """
+        if from_store:
+            window = await self.read_stored_window(days)
+            for channel_id, (messages, channel_name) in window.items():
+                yield channel_id, self._filter_messages(messages, channel_name), channel_name
+        else:
+            async for channel_id, messages, channel_name in self.message_collector.iter_from_config(days):
+                yield channel_id, self._filter_messages(messages, channel_name), channel_name
+    
+    def _filter_messages(self, messages: List[DiscordMessage], channel_name: str) -> List[DiscordMessage]:
+        """
+        Remove noise from the messages of a channel, if a filter pipeline is configured.
+        
+        Args:
+            messages: Collected messages
+            channel_name: Name of the channel
+            
+        Returns:
+            Messages to summarize
+        """
+        if self.message_filter is None:
+            return messages
+        return self.message_filter.apply(messages, channel_name)
+    
+    def create_snapshot(self, days: int = 1, from_store: bool = False) -> CollectionSnapshot:
+        """
+        Create a run-scoped collection snapshot shared by every summary in a run.
+        
+        Messages are collected lazily the first time the snapshot is iterated,
+        and every later consumer reuses them instead of collecting again.
+        
+        Args:
+            days: Number of days to look back
+            from_store: Read from the local message store instead of Discord
+            
+        Returns:
+            Collection snapshot
+        """
+        return CollectionSnapshot(self._iter_channel_messages(days, from_store))
     
     async def generate_channel_summary(
         self, 
         channel_id: str, 
         days: int = 1,
-        prompt_type: Optional[str] = None
+        prompt_type: Optional[str] = None,
+        from_store: bool = False
     ) -> Optional[DiscordSummary]:
         """
         Generate a summary for a single channel.
@@ -46,6 +161,7 @@ class SummaryGeneratorService:
             channel_id: ID of the channel to summarize
             days: Number of days to look back
             prompt_type: Type of prompt to use
+            from_store: Read messages from the local message store instead of Discord
             
         Returns:
             DiscordSummary object if successful, None otherwise
@@ -55,7 +171,12 @@ class SummaryGeneratorService:
         
         try:
             # Collect messages from the channel
-            messages, channel_name = await self.message_collector.collect_from_channel(channel_id, days)
+            if from_store:
+                window = await self.read_stored_window(days, [channel_id])
+                messages, channel_name = window[channel_id]
+            else:
+                messages, channel_name = await self.message_collector.collect_from_channel(channel_id, days)
+            messages = self._filter_messages(messages, channel_name)
             
             if not messages:
                 logger.warning(f"No messages found in channel {channel_name} for the past {days} day(s)")
@@ -91,156 +212,544 @@ class SummaryGeneratorService:
         except Exception as e:
             logger.error(f"Error generating summary for channel {channel_id}: {str(e)}")
             return None
-
-
+    
+    
     async def _generate_summary_with_fallback(
         self, 
-        messages, 
+        messages=None, 
         channel_name=None,  # Parameter should match what's expected in summarizers
-        prompt_type=None
+        prompt_type=None,
+        summaries=None,
+        previous_summary=None
     ):
         """
-        Generate a summary with fallback to an alternative LLM provider if the primary one fails.
+        Generate a summary with fallback to the pool's other LLM providers if the primary one fails.
         
         Args:
             messages: List of messages to summarize
             channel_name: Name of the channel
             prompt_type: Type of prompt to use
+            summaries: Existing summaries to merge instead of messages, e.g. channel summaries
+            previous_summary: Summary to fold the messages into (optional)
             
         Returns:
             Tuple of (summary text, provider name) if successful, (None, None) if all providers fail
         """
-        try:
-            # Try with the primary summarizer
-            summary_text = self.summarizer.generate_summary(
-                messages=messages,
-                channel_name=channel_name,  # Must match parameter name in summarizer
-                prompt_type=prompt_type
-            )
-            
-            if summary_text:
-                return summary_text, self.summarizer.provider_name
-                
-            # If primary summarizer failed, create and try a fallback summarizer
-            logger.warning("Primary summarizer failed, trying fallback...")
-            
-            # Determine current provider and create a fallback
-            import os
-            from config.settings import LLMProvider
-            from summarizers import create_summarizer
-            
-            # If current is Anthropic, fall back to DeepSeek, and vice versa
-            current_provider = self.summarizer.__class__.__name__
-            
-            if "Anthropic" in current_provider:
-                from config.settings import LLMConfig
-                fallback_config = LLMConfig(
-                    provider=LLMProvider.DEEPSEEK,
-                    api_key=os.getenv('DEEPSEEK_API_KEY')
+        cache_keys = {}
+        
+        def get_cache_key(summarizer):
+            if summarizer.provider_name not in cache_keys:
+                cache_keys[summarizer.provider_name] = self._get_cache_key(
+                    summarizer, messages, summaries, channel_name, prompt_type, previous_summary
+                )
+            return cache_keys[summarizer.provider_name]
+        
+        # Looked up apart from the summarization so cache hits don't count as provider latency
+        async def cached(summarizer):
+            cache_key = get_cache_key(summarizer)
+            if not cache_key:
+                return None
+            entry = await asyncio.get_running_loop().run_in_executor(None, self.summary_cache.get, cache_key)
+            if not entry:
+                return None
+            logger.info(f"Using cached {summarizer.provider_name} summary for {channel_name}")
+            return entry[0]
+        
+        async def summarize(summarizer):
+            cache_key = get_cache_key(summarizer)
+            if summaries is not None:
+                summary_text = await summarizer.reduce_summaries(summaries, channel_name=channel_name, prompt_type=prompt_type)
+            elif previous_summary is not None:
+                summary_text = await summarizer.update_summary(
+                    previous_summary,
+                    messages,
+                    channel_name=channel_name,
+                    prompt_type=prompt_type
                 )
             else:
-                from config.settings import LLMConfig
-                fallback_config = LLMConfig(
-                    provider=LLMProvider.ANTHROPIC,
-                    api_key=os.getenv('ANTHROPIC_API_KEY')
+                summary_text = await summarizer.generate_summary(
+                    messages=messages,
+                    channel_name=channel_name,  # Must match parameter name in summarizer
+                    prompt_type=prompt_type
                 )
             
-            # Check if we have the API key for fallback
-            if not fallback_config.api_key:
-                logger.error("No API key available for fallback LLM provider")
-                return None, None
-                
-            # Create fallback summarizer
-            fallback_summarizer = create_summarizer(fallback_config)
-            
-            # Try with fallback summarizer
-            fallback_summary = fallback_summarizer.generate_summary(
-                messages=messages,
-                channel_name=channel_name,  # Must match parameter name in summarizer
-                prompt_type=prompt_type
-            )
-            
-            if fallback_summary:
-                logger.info(f"Successfully generated summary using fallback provider {fallback_summarizer.provider_name}")
-                return fallback_summary, fallback_summarizer.provider_name
-                
-            # If we get here, both summarizers failed
-            logger.error("All summarizer providers failed")
-            return None, None
+            if cache_key and summary_text:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self.summary_cache.put, cache_key, summary_text, summarizer.provider_name
+                )
+            return summary_text
+        
+        result = await self.summarizer_pool.run(summarize, cached)
+        return result.text, result.provider_name
+    
+    def _get_cache_key(
+        self,
+        summarizer: BaseSummarizer,
+        messages: Optional[List[DiscordMessage]],
+        summaries: Optional[List[str]],
+        channel_name: Optional[str],
+        prompt_type: Optional[str],
+        previous_summary: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Build the summary cache key for a request, if caching is enabled.
+        
+        Args:
+            summarizer: Summarizer that would handle the request
+            messages: Messages to summarize
+            summaries: Existing summaries to merge instead of messages
+            channel_name: Name of the channel
+            prompt_type: Type of prompt to use
+            previous_summary: Summary the messages are folded into (optional)
             
-        except Exception as e:
-            logger.error(f"Error in fallback summarization: {str(e)}")
-            return None, None
+        Returns:
+            Cache key, or None if no cache is configured
+        """
+        if self.summary_cache is None:
+            return None
+        
+        if summaries is not None:
+            items = summaries
+        else:
+            # Sorted by time then ID, which works for IDs that are not snowflakes too
+            items = [
+                f"{message.id}:{message.content}"
+                for message in sorted(messages or [], key=lambda m: (m.timestamp_ms, m.id))
+            ]
+        
+        override_user_prompt = None
+        if previous_summary is not None:
+            items = [previous_summary] + items
+            override_user_prompt = PromptTemplates.ROLLING_USER_PROMPT
+        
+        prompts = PromptTemplates.get_prompts(
+            channel_name=channel_name,
+            prompt_type=prompt_type,
+            override_user_prompt=override_user_prompt
+        )
+        return build_cache_key(
+            items,
+            system_prompt=prompts['system_prompt'],
+            user_prompt=prompts['user_prompt'],
+            model=summarizer.model,
+            max_tokens=summarizer.max_output_tokens,
+            transcript_format=summarizer.transcript_format,
+            filter_settings=self.message_filter.settings if self.message_filter else ""
+        )
     
-    async def generate_all_channel_summaries(self, days: int = 1) -> Dict[str, Optional[DiscordSummary]]:
+    async def generate_all_channel_summaries(
+        self,
+        days: int = 1,
+        from_store: bool = False,
+        snapshot: Optional[CollectionSnapshot] = None
+    ) -> Dict[str, Optional[DiscordSummary]]:
         """
         Generate summaries for all configured channels.
         
         Args:
             days: Number of days to look back
+            from_store: Read messages from the local message store instead of Discord
+            snapshot: Run-scoped collection snapshot to read messages from,
+                defaults to a fresh collection
             
         Returns:
             Dictionary mapping channel IDs to summary objects
         """
         logger.info("Generating summaries for all configured channels")
         
-        # Collect messages from all configured channels
-        channel_messages = await self.message_collector.collect_from_config(days)
+        if snapshot is None:
+            snapshot = self.create_snapshot(days, from_store)
         
-        results = {}
+        semaphore = asyncio.Semaphore(self.max_concurrent_summaries)
         
-        # Generate a summary for each channel
-        for channel_id, (messages, channel_name) in channel_messages.items():
-            if not messages:
-                logger.warning(f"No messages found in channel {channel_name}")
-                results[channel_id] = None
-                continue
-            
-            logger.info(f"Generating summary for {channel_name} ({len(messages)} messages)")
+        async def summarize_channel(channel_id, messages, channel_name):
+            async with semaphore:
+                return channel_id, await self._summarize_channel(channel_id, messages, channel_name)
+        
+        # Start summarizing each channel as soon as its collection finishes
+        tasks = []
+        async for channel_id, messages, channel_name in snapshot.iter_channels():
+            tasks.append(asyncio.create_task(summarize_channel(channel_id, messages, channel_name)))
+        
+        results = dict(await asyncio.gather(*tasks))
+        
+        logger.info(f"Generated summaries for {sum(1 for s in results.values() if s)} out of {len(results)} channels")
+        if self.summarizer_pool.hedging:
+            self.summarizer_pool.log_hedge_stats()
+        return results
+    
+    async def _summarize_channel(
+        self,
+        channel_id: str,
+        messages: List[DiscordMessage],
+        channel_name: str
+    ) -> Optional[DiscordSummary]:
+        """
+        Summarize one channel's collected messages.
+        
+        Args:
+            channel_id: ID of the channel
+            messages: Messages collected from the channel
+            channel_name: Name of the channel
             
+        Returns:
+            DiscordSummary object if successful, None otherwise
+        """
+        if not messages:
+            logger.warning(f"No messages found in channel {channel_name}")
+            return None
+        
+        logger.info(f"Generating summary for {channel_name} ({len(messages)} messages)")
+        
+        try:
             # Determine prompt type based on channel name
             prompt_type = self._detect_prompt_type(channel_name)
             
-            # Generate summary with fallback
-            summary_text, provider_name = await self._generate_summary_with_fallback(
-                messages=messages,
-                channel_name=channel_name,
-                prompt_type=prompt_type
-            )
+            previous, new_messages = self._split_new_messages(channel_id, messages, channel_name)
+            
+            if previous and not new_messages:
+                summary_text, provider_name = previous.summary.content, previous.summary.provider_name
+            else:
+                # Generate summary with fallback
+                summary_text, provider_name = await self._generate_summary_with_fallback(
+                    messages=new_messages,
+                    channel_name=channel_name,
+                    prompt_type=prompt_type,
+                    previous_summary=previous.summary.content if previous else None
+                )
             
             if not summary_text:
                 logger.error(f"Failed to generate summary for {channel_name}")
-                results[channel_id] = None
-                continue
+                return None
             
             # Create summary object
             summary = self.summarizer.create_summary_object(
-            content=summary_text,
+                content=summary_text,
+                messages=messages,
+                channel_name=channel_name,
+                channel_id=channel_id,
+                provider_name=provider_name
+            )
+            
+            await self._record_rolling_summary(channel_id, summary, messages, previous)
+            
+            return summary
+        
+        except Exception as e:
+            logger.error(f"Error generating summary for channel {channel_id}: {str(e)}")
+            return None
+    
+    def stream_channel_summary(
+        self,
+        channel_id: str,
+        messages: List[DiscordMessage],
+        channel_name: str
+    ) -> Tuple[DiscordSummary, AsyncIterator[str]]:
+        """
+        Summarize one channel's collected messages, streaming the text as it is generated.
+        
+        The returned summary object is filled in once the stream is exhausted.
+        The primary provider is streamed; if it is unavailable or fails before
+        producing any text, the summary is generated with fallback and yielded whole.
+        
+        Args:
+            channel_id: ID of the channel
+            messages: Messages collected from the channel
+            channel_name: Name of the channel
+            
+        Returns:
+            Tuple of (summary object with empty content, async iterator of summary text deltas)
+        """
+        prompt_type = self._detect_prompt_type(channel_name)
+        previous, new_messages = self._split_new_messages(channel_id, messages, channel_name)
+        previous_summary = previous.summary.content if previous else None
+        
+        summary = self.summarizer.create_summary_object(
+            content="",
             messages=messages,
-            channel_name=channel_name,  # This needs to be changed to channel_name
-            channel_id=channel_id,
-            provider_name=provider_name
+            channel_name=channel_name,
+            channel_id=channel_id
         )
+        
+        async def deltas():
+            parts = []
             
-            results[channel_id] = summary
+            if previous and not new_messages:
+                summary.provider_name = previous.summary.provider_name
+                parts.append(previous.summary.content)
+                yield previous.summary.content
+            elif not self.summarizer.circuit_breaker.is_open:
+                cache_key = self._get_cache_key(self.summarizer, new_messages, None, channel_name, prompt_type, previous_summary)
+                cached = None
+                if cache_key:
+                    # SQLite calls are blocking, so keep them off the event loop
+                    cached = await asyncio.get_running_loop().run_in_executor(None, self.summary_cache.get, cache_key)
+                try:
+                    if cached:
+                        logger.info(f"Using cached {self.summarizer.provider_name} summary for {channel_name}")
+                        parts.append(cached[0])
+                        yield cached[0]
+                    else:
+                        async for delta in self.summarizer.stream_summary(
+                            new_messages,
+                            channel_name=channel_name,
+                            prompt_type=prompt_type,
+                            previous_summary=previous_summary
+                        ):
+                            parts.append(delta)
+                            yield delta
+                        if cache_key:
+                            await asyncio.get_running_loop().run_in_executor(
+                                None, self.summary_cache.put, cache_key, "".join(parts), self.summarizer.provider_name
+                            )
+                except Exception as e:
+                    # Text already posted can't be taken back, so only fall back before the first delta
+                    if parts:
+                        raise
+                    logger.warning(f"Streaming summary for {channel_name} failed: {str(e)}")
+            
+            if not parts:
+                summary_text, provider_name = await self._generate_summary_with_fallback(
+                    messages=new_messages,
+                    channel_name=channel_name,
+                    prompt_type=prompt_type,
+                    previous_summary=previous_summary
+                )
+                if not summary_text:
+                    raise RuntimeError(f"Failed to generate summary for {channel_name}")
+                summary.provider_name = provider_name
+                parts.append(summary_text)
+                yield summary_text
+            
+            summary.content = "".join(parts)
+            await self._record_rolling_summary(channel_id, summary, messages, previous)
         
-        logger.info(f"Generated summaries for {sum(1 for s in results.values() if s)} out of {len(results)} channels")
-        return results
+        return summary, deltas()
     
-    async def generate_combined_summary(self, days: int = 1) -> Optional[DiscordSummary]:
+    def _split_new_messages(
+        self,
+        channel_id: str,
+        messages: List[DiscordMessage],
+        channel_name: str
+    ) -> Tuple[Optional[RollingSummary], List[DiscordMessage]]:
+        """
+        Find a channel's previous rolling summary and the messages it does not cover yet.
+        
+        Args:
+            channel_id: ID of the channel
+            messages: Messages collected from the channel
+            channel_name: Name of the channel
+            
+        Returns:
+            Tuple of (previous rolling summary or None, messages to summarize)
+        """
+        previous = self._get_rolling_summary(channel_id)
+        if previous is None:
+            return None, messages
+        
+        new_messages = [m for m in messages if int(m.id) > int(previous.last_message_id)]
+        logger.info(
+            f"Folding {len(new_messages)} new messages from {channel_name} into its previous summary "
+            f"({len(messages) - len(new_messages)} already summarized)"
+        )
+        return previous, new_messages
+    
+    async def _record_rolling_summary(
+        self,
+        channel_id: str,
+        summary: DiscordSummary,
+        messages: List[DiscordMessage],
+        previous: Optional[RollingSummary]
+    ) -> None:
+        """
+        Store a channel's new summary as the base of its next rolling update, if enabled.
+        
+        Args:
+            channel_id: ID of the channel
+            summary: Newly generated summary
+            messages: Messages the summary covers
+            previous: Rolling summary the new one was folded into, if any
+        """
+        if self.rolling_summaries is None:
+            return
+        
+        last_message_id = str(max(int(m.id) for m in messages))
+        self.rolling_summaries.update(channel_id, summary, last_message_id, rebased=previous is None)
+        await asyncio.get_running_loop().run_in_executor(None, self.rolling_summaries.save)
+    
+    def _get_rolling_summary(self, channel_id: str) -> Optional[RollingSummary]:
+        """
+        Get the previous summary to fold a channel's new messages into, if rolling summaries are enabled.
+        
+        Args:
+            channel_id: ID of the channel
+            
+        Returns:
+            Rolling summary, or None if the channel should be summarized from scratch
+        """
+        if self.rolling_summaries is None:
+            return None
+        
+        previous = self.rolling_summaries.get(channel_id)
+        if previous is None:
+            return None
+        
+        # Regenerate from scratch periodically so older topics age out
+        if datetime.now() - previous.started_at > timedelta(days=self.rolling_summary_max_age_days):
+            logger.info(f"Rolling summary for channel {channel_id} is older than {self.rolling_summary_max_age_days} day(s), regenerating")
+            return None
+        
+        return previous
+    
+    async def submit_summary_batch(self, snapshot: CollectionSnapshot) -> Optional[BatchJob]:
+        """
+        Submit the summary requests of every channel as a single provider batch job.
+        
+        Channels too large for one prompt are submitted as one request per
+        chunk; their partial summaries are merged once the batch completes.
+        
+        Args:
+            snapshot: Run-scoped collection snapshot to read messages from
+            
+        Returns:
+            Submitted batch job, or None if there was nothing to summarize
+            
+        Raises:
+            ValueError: If the primary provider has no batch API
+        """
+        summarizer = self.summarizer
+        if not summarizer.supports_batches:
+            raise ValueError(f"{summarizer.provider_name} does not support batch requests")
+        requests = []
+        channels = {}
+        
+        async for channel_id, messages, channel_name in snapshot.iter_channels():
+            if not messages:
+                logger.warning(f"No messages found in channel {channel_name}")
+                continue
+            
+            prompt_type = self._detect_prompt_type(channel_name)
+            custom_ids = []
+            for index, (system_prompt, user_content) in enumerate(
+                summarizer.build_summary_requests(messages, channel_name=channel_name, prompt_type=prompt_type)
+            ):
+                custom_id = f"{channel_id}-{index}"
+                requests.append((custom_id, system_prompt, user_content))
+                custom_ids.append(custom_id)
+            
+            channels[channel_id] = {
+                "name": channel_name,
+                "prompt_type": prompt_type,
+                "message_count": len(messages),
+                "requests": custom_ids
+            }
+        
+        if not requests:
+            logger.warning("No messages found in any channel")
+            return None
+        
+        logger.info(f"Submitting {len(requests)} summary requests for {len(channels)} channels as a batch")
+        batch_id = await summarizer.submit_batch(requests)
+        return BatchJob(batch_id=batch_id, provider_name=summarizer.provider_name, channels=channels)
+    
+    async def wait_for_summary_batch(
+        self,
+        job: BatchJob,
+        poll_interval: float = 60.0
+    ) -> Dict[str, Optional[DiscordSummary]]:
+        """
+        Wait for a batch job to complete and turn its results into channel summaries.
+        
+        Args:
+            job: Submitted batch job
+            poll_interval: Seconds between status checks
+            
+        Returns:
+            Dictionary mapping channel IDs to summary objects
+            
+        Raises:
+            ValueError: If the job's provider is not configured or has no batch API
+        """
+        summarizer = self.summarizer_pool.get(job.provider_name)
+        if summarizer is None:
+            raise ValueError(f"Batch {job.batch_id} was submitted to {job.provider_name}, which is not configured")
+        if not summarizer.supports_batches:
+            raise ValueError(f"Batch {job.batch_id} was submitted to {job.provider_name}, which does not support batch requests")
+        
+        while not await summarizer.is_batch_complete(job.batch_id):
+            logger.info(f"Batch {job.batch_id} still processing, checking again in {poll_interval:.0f} seconds")
+            await asyncio.sleep(poll_interval)
+        
+        results = await summarizer.get_batch_results(job.batch_id)
+        logger.info(f"Batch {job.batch_id} completed with {sum(1 for r in results.values() if r.ok)} of {len(results)} requests succeeded")
+        
+        summaries = {}
+        for channel_id, channel in job.channels.items():
+            channel_name = channel["name"]
+            parts = [results[custom_id].text for custom_id in channel["requests"] if custom_id in results and results[custom_id].ok]
+            
+            if len(parts) < len(channel["requests"]):
+                logger.warning(f"{len(channel['requests']) - len(parts)} batch requests failed for {channel_name}")
+            
+            if not parts:
+                summaries[channel_id] = None
+                continue
+            
+            summary_text = parts[0]
+            if len(parts) > 1:
+                summary_text = await summarizer.reduce_summaries(
+                    parts,
+                    channel_name=channel_name,
+                    prompt_type=channel["prompt_type"],
+                    override_user_prompt=PromptTemplates.MERGE_USER_PROMPT
+                )
+            
+            summaries[channel_id] = summarizer.create_summary_object(
+                content=summary_text,
+                messages=[],
+                channel_name=channel_name,
+                channel_id=channel_id,
+                provider_name=job.provider_name,
+                message_count=channel["message_count"]
+            ) if summary_text else None
+        
+        return summaries
+    
+    async def generate_combined_summary(
+        self,
+        days: int = 1,
+        from_store: bool = False,
+        snapshot: Optional[CollectionSnapshot] = None,
+        channel_summaries: Optional[Dict[str, Optional[DiscordSummary]]] = None
+    ) -> Optional[DiscordSummary]:
         """
         Generate a combined summary for all channels.
         
+        When per-channel summaries are provided, the combined summary is built
+        hierarchically by reducing those summaries instead of re-sending every
+        raw message, so no channel is dropped and the cost of the combined
+        summary does not grow with message volume.
+        
         Args:
             days: Number of days to look back
+            from_store: Read messages from the local message store instead of Discord
+            snapshot: Run-scoped collection snapshot to read messages from,
+                defaults to a fresh collection
+            channel_summaries: Already generated per-channel summaries to reduce (optional)
             
         Returns:
             Combined summary object if successful, None otherwise
         """
+        if channel_summaries is not None:
+            return await self._reduce_channel_summaries(channel_summaries)
+        
         logger.info("Generating combined summary for all channels")
         
+        if snapshot is None:
+            snapshot = self.create_snapshot(days, from_store)
+        
         # Collect messages from all configured channels
-        channel_messages = await self.message_collector.collect_from_config(days)
+        channel_messages = await snapshot.get_all()
         
         # Combine all messages
         all_messages = []
@@ -252,7 +761,7 @@ class SummaryGeneratorService:
             return None
         
         # Sort messages by timestamp
-        all_messages.sort(key=lambda m: m.timestamp)
+        all_messages.sort(key=lambda m: m.timestamp_ms)
         
         logger.info(f"Generating combined summary for {len(all_messages)} messages from all channels")
         
@@ -278,6 +787,54 @@ class SummaryGeneratorService:
         
         return summary
     
+    async def _reduce_channel_summaries(
+        self,
+        channel_summaries: Dict[str, Optional[DiscordSummary]]
+    ) -> Optional[DiscordSummary]:
+        """
+        Build the combined summary by reducing per-channel summaries.
+        
+        Args:
+            channel_summaries: Per-channel summaries, keyed by channel ID
+            
+        Returns:
+            Combined summary object if successful, None otherwise
+        """
+        summaries = [summary for summary in channel_summaries.values() if summary]
+        if not summaries:
+            logger.warning("No channel summaries available to combine")
+            return None
+        
+        # Most active channels first
+        summaries.sort(key=lambda summary: summary.message_count, reverse=True)
+        total_messages = sum(summary.message_count for summary in summaries)
+        
+        logger.info(f"Generating combined summary from {len(summaries)} channel summaries ({total_messages} messages)")
+        
+        channel_sections = [
+            f"### #{summary.channel_name} ({summary.message_count} messages)\n{summary.content.strip()}"
+            for summary in summaries
+        ]
+        
+        summary_text, provider_name = await self._generate_summary_with_fallback(
+            channel_name="All Channels",
+            prompt_type="combined",
+            summaries=channel_sections
+        )
+        
+        if not summary_text:
+            logger.error("Failed to generate combined summary")
+            return None
+        
+        return self.summarizer.create_summary_object(
+            content=summary_text,
+            messages=[],
+            channel_name="All Channels",
+            channel_id="combined",
+            provider_name=provider_name,
+            message_count=total_messages
+        )
+    
     def _detect_prompt_type(self, channel_name: str) -> Optional[str]:
         """
         Detect the appropriate prompt type based on the channel name.
@@ -8,10 +8,14 @@ It coordinates all components to run on a schedule or on-demand.
 import logging
 import asyncio
 from datetime import datetime
+from typing import Dict, Optional
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from config.settings import AppConfig, SchedulerConfig
+from models.summary import DiscordSummary
+from services.message_collector import CollectionSnapshot
 from services.summary_generator import SummaryGeneratorService
+from storage.batch_jobs import BatchJobStore
 from clients.discord_writer import DiscordWriterClient
 
 logger = logging.getLogger(__name__)
@@ -26,7 +30,8 @@ class SummarySchedulerService:
         config: SchedulerConfig,
         summary_generator: SummaryGeneratorService,
         discord_writer: DiscordWriterClient,
-        destination_channel_id: int
+        destination_channel_id: int,
+        batch_jobs: Optional[BatchJobStore] = None
     ):
         """
         Initialize the scheduler service.
@@ -36,15 +41,21 @@ class SummarySchedulerService:
             summary_generator: Service for generating summaries
             discord_writer: Client for posting to Discord
             destination_channel_id: ID of the destination channel
+            batch_jobs: Store of the pending batch job, used in batch mode
         """
         self.config = config
         self.summary_generator = summary_generator
         self.discord_writer = discord_writer
         self.destination_channel_id = destination_channel_id
+        self.batch_jobs = batch_jobs
+        
+        # A scheduled run and the resumption of a pending batch must not overlap
+        self._batch_lock = asyncio.Lock()
         
         # Initialize scheduler
         self.scheduler = AsyncIOScheduler()
         self.is_running = False
+        self._resume_task: Optional[asyncio.Task] = None
     
     async def start(self) -> None:
         """
@@ -69,6 +80,10 @@ class SummarySchedulerService:
         # Start the scheduler
         self.scheduler.start()
         self.is_running = True
+        
+        # Resume polling a batch job submitted before a restart
+        if self.config.batch_mode and self.batch_jobs and self.batch_jobs.get():
+            self._resume_task = asyncio.create_task(self.generate_and_post_summaries())
     
     async def stop(self) -> None:
         """
@@ -80,6 +95,13 @@ class SummarySchedulerService:
         
         # Shut down the scheduler
         self.scheduler.shutdown()
+        
+        # The batch job stays persisted, so a cancelled resumption picks it up again on the next start
+        if self._resume_task is not None and not self._resume_task.done():
+            self._resume_task.cancel()
+            await asyncio.gather(self._resume_task, return_exceptions=True)
+        self._resume_task = None
+        
         self.is_running = False
         logger.info("Scheduler stopped")
     
@@ -88,28 +110,45 @@ class SummarySchedulerService:
         Generate and post summaries for all configured channels.
         """
         try:
+            if self._use_batch_mode():
+                await self.generate_and_post_batch_summaries()
+                return
+            
             logger.info("Starting scheduled summary generation")
             start_time = datetime.now()
+            self.summary_generator.summarizer_pool.reset_usage()
             
-            # Generate summaries for all channels
-            channel_summaries = await self.summary_generator.generate_all_channel_summaries(
-                days=self.config.days_to_collect
-            )
+            # Collect once per run and share the snapshot between all summaries
+            snapshot = self.summary_generator.create_snapshot(days=self.config.days_to_collect)
             
-            # Post each channel summary
-            for channel_id, summary in channel_summaries.items():
-                if summary:
-                    await self.discord_writer.post_summary(
-                        channel_id=self.destination_channel_id,
-                        summary=summary
-                    )
-                    # Add a small delay between posts
-                    await asyncio.sleep(1)
+            if self.config.stream_summaries:
+                # Post each channel summary while it is being generated
+                channel_summaries = await self.stream_channel_summaries(snapshot)
+            else:
+                # Generate summaries for all channels
+                channel_summaries = await self.summary_generator.generate_all_channel_summaries(
+                    days=self.config.days_to_collect,
+                    snapshot=snapshot
+                )
+                
+                # Post each channel summary
+                for channel_id, summary in channel_summaries.items():
+                    if summary:
+                        await self.discord_writer.post_summary(
+                            channel_id=self.destination_channel_id,
+                            summary=summary
+                        )
+                        # Add a small delay between posts
+                        await asyncio.sleep(1)
             
             # Generate and post combined summary if there are multiple channels
             if len(channel_summaries) > 1:
+                # Hierarchical mode reduces the channel summaries instead of the raw transcripts
+                hierarchical = self.config.combined_summary_mode == "hierarchical"
                 combined_summary = await self.summary_generator.generate_combined_summary(
-                    days=self.config.days_to_collect
+                    days=self.config.days_to_collect,
+                    snapshot=snapshot,
+                    channel_summaries=channel_summaries if hierarchical else None
                 )
                 
                 if combined_summary:
@@ -120,6 +159,7 @@ class SummarySchedulerService:
             
             elapsed_time = (datetime.now() - start_time).total_seconds()
             logger.info(f"Completed scheduled summary generation in {elapsed_time:.2f} seconds")
+            self.summary_generator.summarizer_pool.log_usage()
             
         except Exception as e:
             error_message = f"Error in scheduled summary generation: {str(e)}"
@@ -131,6 +171,118 @@ class SummarySchedulerService:
                 error_message=error_message
             )
     
+    def _use_batch_mode(self) -> bool:
+        """
+        Check whether summaries should be submitted as a batch job.
+        
+        Returns:
+            True if batch mode is enabled and the provider supports batches
+        """
+        if not self.config.batch_mode or self.batch_jobs is None:
+            return False
+        
+        if not self.summary_generator.summarizer.supports_batches and not self.batch_jobs.get():
+            logger.warning(
+                f"{self.summary_generator.summarizer.provider_name} does not support batches, "
+                f"generating summaries interactively"
+            )
+            return False
+        
+        return True
+    
+    async def generate_and_post_batch_summaries(self) -> None:
+        """
+        Submit all channel summaries as one batch job, wait for it and post the results.
+        
+        The job is persisted as soon as it is submitted, together with the
+        channels already posted, so a restart resumes polling the same batch
+        instead of submitting it again and never posts a summary twice.
+        """
+        async with self._batch_lock:
+            start_time = datetime.now()
+            self.summary_generator.summarizer_pool.reset_usage()
+            
+            job = self.batch_jobs.get()
+            if job:
+                logger.info(f"Resuming batch job {job.batch_id} submitted at {job.created_at}")
+            else:
+                logger.info("Starting scheduled batch summary generation")
+                snapshot = self.summary_generator.create_snapshot(days=self.config.days_to_collect)
+                job = await self.summary_generator.submit_summary_batch(snapshot)
+                if not job:
+                    return
+                self.batch_jobs.set(job)
+            
+            channel_summaries = await self.summary_generator.wait_for_summary_batch(
+                job,
+                poll_interval=self.config.batch_poll_seconds
+            )
+            
+            # Post each channel summary
+            for channel_id, summary in channel_summaries.items():
+                if summary and channel_id not in job.posted:
+                    await self.discord_writer.post_summary(
+                        channel_id=self.destination_channel_id,
+                        summary=summary
+                    )
+                    job.posted.append(channel_id)
+                    self.batch_jobs.save()
+                    # Add a small delay between posts
+                    await asyncio.sleep(1)
+            
+            # The raw transcripts are not kept, so the combined summary is always hierarchical
+            if len(channel_summaries) > 1 and "combined" not in job.posted:
+                combined_summary = await self.summary_generator.generate_combined_summary(
+                    channel_summaries=channel_summaries
+                )
+                
+                if combined_summary:
+                    await self.discord_writer.post_summary(
+                        channel_id=self.destination_channel_id,
+                        summary=combined_summary
+                    )
+                    job.posted.append("combined")
+                    self.batch_jobs.save()
+            
+            self.batch_jobs.set(None)
+            
+            elapsed_time = (datetime.now() - start_time).total_seconds()
+            logger.info(f"Completed batch summary generation in {elapsed_time:.2f} seconds")
+            self.summary_generator.summarizer_pool.log_usage()
+    
+    async def stream_channel_summaries(self, snapshot: CollectionSnapshot) -> Dict[str, Optional[DiscordSummary]]:
+        """
+        Generate every channel summary and post it to Discord while it is being generated.
+        
+        Args:
+            snapshot: Run-scoped collection snapshot to read messages from
+            
+        Returns:
+            Dictionary mapping channel IDs to the posted summary objects
+        """
+        semaphore = asyncio.Semaphore(self.summary_generator.max_concurrent_summaries)
+        
+        async def stream_channel(channel_id, messages, channel_name):
+            if not messages:
+                logger.warning(f"No messages found in channel {channel_name}")
+                return channel_id, None
+            
+            async with semaphore:
+                summary, deltas = self.summary_generator.stream_channel_summary(channel_id, messages, channel_name)
+                posted = await self.discord_writer.post_summary_stream(
+                    channel_id=self.destination_channel_id,
+                    summary=summary,
+                    deltas=deltas
+                )
+                return channel_id, summary if posted and summary.content else None
+        
+        # Start streaming each channel as soon as its collection finishes
+        tasks = []
+        async for channel_id, messages, channel_name in snapshot.iter_channels():
+            tasks.append(asyncio.create_task(stream_channel(channel_id, messages, channel_name)))
+        
+        return dict(await asyncio.gather(*tasks))
+    
     async def run_now(self) -> None:
         """
         Run the summary generation and posting immediately.
@@ -0,0 +1,144 @@
+"""
+Batch Job Store
+
+This module persists the provider batch job submitted by a nightly run, so
+that after a restart the scheduler can resume polling it and post its
+results instead of submitting (and paying for) the same requests again.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default location of the persisted batch job
+DATA_DIR = "data"
+STATE_FILE = os.path.join(DATA_DIR, "batch_jobs.json")
+
+@dataclass
+class BatchJob:
+    """
+    A submitted batch of channel summary requests.
+    
+    Each channel entry records what is needed to turn the batch results into
+    summaries without the original messages: the channel name, prompt type,
+    number of messages and the custom IDs of its requests (one per chunk).
+    """
+    batch_id: str
+    provider_name: str
+    channels: Dict[str, Dict]
+    created_at: datetime = None
+    posted: List[str] = field(default_factory=list)  # Channels whose summary was already posted
+    
+    def __post_init__(self):
+        """
+        Initialize default values after initialization.
+        """
+        if self.created_at is None:
+            self.created_at = datetime.now()
+    
+    def to_dict(self) -> dict:
+        """
+        Convert the job to a dictionary for serialization.
+        
+        Returns:
+            Dictionary representation of the job
+        """
+        return {
+            "batch_id": self.batch_id,
+            "provider_name": self.provider_name,
+            "channels": self.channels,
+            "created_at": self.created_at.isoformat(),
+            "posted": self.posted
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'BatchJob':
+        """
+        Create a job from a dictionary.
+        
+        Args:
+            data: Dictionary representation of a job
+        
+        Returns:
+            BatchJob object
+        """
+        return cls(
+            batch_id=data["batch_id"],
+            provider_name=data["provider_name"],
+            channels=data.get("channels", {}),
+            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None,
+            posted=data.get("posted", [])
+        )
+
+class BatchJobStore:
+    """
+    JSON-file backed record of the pending batch job, if any.
+    """
+    
+    def __init__(self, path: str = STATE_FILE):
+        """
+        Initialize the store and load any persisted job.
+        
+        Args:
+            path: Path of the JSON state file
+        """
+        self.path = path
+        self.job: Optional[BatchJob] = self._load()
+    
+    def _load(self) -> Optional[BatchJob]:
+        """
+        Load the pending job from disk.
+        
+        Returns:
+            Pending batch job, or None if there is none
+        """
+        if not os.path.exists(self.path):
+            return None
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return BatchJob.from_dict(data["job"]) if data.get("job") else None
+        except Exception as e:
+            logger.error(f"Error loading batch job from {self.path}: {e}")
+            return None
+    
+    def get(self) -> Optional[BatchJob]:
+        """
+        Get the pending batch job.
+        
+        Returns:
+            Pending batch job, or None if there is none
+        """
+        return self.job
+    
+    def set(self, job: Optional[BatchJob]) -> None:
+        """
+        Record (or clear, with None) the pending batch job and persist it.
+        
+        Args:
+            job: Batch job to record
+        """
+        self.job = job
+        self.save()
+    
+    def save(self) -> None:
+        """
+        Persist the pending job atomically.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"job": self.job.to_dict() if self.job else None}, f, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving batch job to {self.path}: {e}")
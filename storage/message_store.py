@@ -0,0 +1,289 @@
+"""
+Message Store
+
+This module provides a local persistent store for collected Discord messages,
+backed by SQLite in WAL mode. Messages are keyed by (channel_id, message_id)
+and indexed by timestamp so time windows can be read without calling Discord.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models.message import DiscordMessage, datetime_to_epoch_ms
+
+logger = logging.getLogger(__name__)
+
+# Default location of the message database
+DATA_DIR = "data"
+DATABASE_FILE = os.path.join(DATA_DIR, "messages.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    channel_id TEXT NOT NULL,
+    message_id INTEGER NOT NULL,
+    user_id TEXT NOT NULL,
+    username TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp_ms INTEGER NOT NULL,
+    attachments_count INTEGER NOT NULL DEFAULT 0,
+    embeds_count INTEGER NOT NULL DEFAULT 0,
+    mentions_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (channel_id, message_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_messages_channel_time ON messages (channel_id, timestamp_ms);
+CREATE INDEX IF NOT EXISTS idx_messages_time ON messages (timestamp_ms);
+
+CREATE TABLE IF NOT EXISTS channels (
+    channel_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+"""
+
+UPSERT_MESSAGE = """
+INSERT INTO messages (
+    channel_id, message_id, user_id, username, content, timestamp_ms,
+    attachments_count, embeds_count, mentions_count
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (channel_id, message_id) DO UPDATE SET
+    user_id = excluded.user_id,
+    username = excluded.username,
+    content = excluded.content,
+    attachments_count = excluded.attachments_count,
+    embeds_count = excluded.embeds_count,
+    mentions_count = excluded.mentions_count
+"""
+
+class MessageStore:
+    """
+    SQLite-backed store of Discord messages with channel and time indexes.
+    """
+
+    def __init__(self, path: str = DATABASE_FILE):
+        """
+        Open (and create if needed) the message database.
+
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One connection shared across threads, serialised by a lock;
+        # WAL mode lets other processes read while we write
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        logger.debug(f"Opened message store at {path}")
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+    def upsert_messages(self, messages: Iterable[DiscordMessage]) -> int:
+        """
+        Insert or update messages in a single transaction.
+
+        Upserts are idempotent: storing the same message twice, or from two
+        concurrent collectors, never creates duplicate rows.
+
+        Args:
+            messages: Messages to store
+
+        Returns:
+            Number of messages written
+        """
+        rows = [
+            (
+                message.channel_id,
+                int(message.id),
+                message.user_id,
+                message.username,
+                message.content,
+                message.timestamp_ms,
+                message.attachments_count,
+                message.embeds_count,
+                message.mentions_count,
+            )
+            for message in messages
+        ]
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(UPSERT_MESSAGE, rows)
+
+        return len(rows)
+
+    def update_message(
+        self,
+        channel_id: str,
+        message_id: str,
+        content: str,
+        attachments_count: Optional[int] = None,
+        embeds_count: Optional[int] = None,
+        mentions_count: Optional[int] = None
+    ) -> bool:
+        """
+        Update the content of a stored message after it was edited.
+
+        Args:
+            channel_id: ID of the channel
+            message_id: ID of the message
+            content: New content
+            attachments_count: New number of attachments, unchanged if None
+            embeds_count: New number of embeds, unchanged if None
+            mentions_count: New number of user mentions, unchanged if None
+
+        Returns:
+            True if the message was stored and has been updated
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE messages SET content = ?, "
+                "attachments_count = COALESCE(?, attachments_count), "
+                "embeds_count = COALESCE(?, embeds_count), "
+                "mentions_count = COALESCE(?, mentions_count) "
+                "WHERE channel_id = ? AND message_id = ?",
+                (content, attachments_count, embeds_count, mentions_count, channel_id, int(message_id))
+            )
+        return cursor.rowcount > 0
+
+    def delete_messages(self, channel_id: str, message_ids: Iterable[str]) -> int:
+        """
+        Delete messages of a channel in a single transaction.
+
+        Args:
+            channel_id: ID of the channel
+            message_ids: IDs of the messages to delete
+
+        Returns:
+            Number of stored messages deleted
+        """
+        rows = [(channel_id, int(message_id)) for message_id in message_ids]
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany("DELETE FROM messages WHERE channel_id = ? AND message_id = ?", rows)
+            return self._conn.total_changes - before
+
+    def set_channel_name(self, channel_id: str, name: str) -> None:
+        """
+        Record the display name of a channel.
+
+        Args:
+            channel_id: ID of the channel
+            name: Channel name
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO channels (channel_id, name) VALUES (?, ?) "
+                "ON CONFLICT (channel_id) DO UPDATE SET name = excluded.name",
+                (channel_id, name)
+            )
+
+    def get_channel_name(self, channel_id: str) -> Optional[str]:
+        """
+        Get the recorded display name of a channel.
+
+        Args:
+            channel_id: ID of the channel
+
+        Returns:
+            Channel name, or None if unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name FROM channels WHERE channel_id = ?", (channel_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_messages(
+        self,
+        channel_id: str,
+        since: datetime,
+        until: Optional[datetime] = None
+    ) -> List[DiscordMessage]:
+        """
+        Read a channel's messages within a time window.
+
+        Args:
+            channel_id: ID of the channel
+            since: Start of the window (inclusive)
+            until: End of the window (exclusive), defaults to no upper bound
+
+        Returns:
+            List of messages ordered oldest first
+        """
+        query = (
+            "SELECT message_id, content, username, user_id, timestamp_ms, channel_id, "
+            "attachments_count, embeds_count, mentions_count "
+            "FROM messages WHERE channel_id = ? AND timestamp_ms >= ?"
+        )
+        params: List = [channel_id, datetime_to_epoch_ms(since)]
+        if until is not None:
+            query += " AND timestamp_ms < ?"
+            params.append(datetime_to_epoch_ms(until))
+        query += " ORDER BY timestamp_ms, message_id"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            DiscordMessage(
+                id=str(row[0]),
+                content=row[1],
+                username=row[2],
+                user_id=row[3],
+                timestamp=row[4],
+                channel_id=row[5],
+                attachments_count=row[6],
+                embeds_count=row[7],
+                mentions_count=row[8],
+            )
+            for row in rows
+        ]
+
+    def get_window(
+        self,
+        since: datetime,
+        channel_ids: Optional[List[str]] = None
+    ) -> Dict[str, Tuple[List[DiscordMessage], str]]:
+        """
+        Read every stored channel's messages newer than a point in time.
+
+        Args:
+            since: Start of the window (inclusive)
+            channel_ids: Channels to read, defaults to every channel with messages in the window
+
+        Returns:
+            Dictionary mapping channel IDs to tuples of (list of messages, channel name)
+        """
+        if channel_ids is None:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT DISTINCT channel_id FROM messages WHERE timestamp_ms >= ?",
+                    (datetime_to_epoch_ms(since),)
+                ).fetchall()
+            channel_ids = [row[0] for row in rows]
+
+        results = {}
+        for channel_id in channel_ids:
+            channel_name = self.get_channel_name(channel_id) or f"Channel {channel_id}"
+            results[channel_id] = (self.get_messages(channel_id, since), channel_name)
+
+        return results
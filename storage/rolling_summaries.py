@@ -0,0 +1,129 @@
+"""
+Rolling Summary Store
+
+This module persists the latest summary of each channel together with the
+newest message it covers, so that later runs can fold only the messages
+posted since into it instead of summarizing the whole window again.
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from models.summary import DiscordSummary
+
+logger = logging.getLogger(__name__)
+
+# Default location of the persisted rolling summaries
+DATA_DIR = "data"
+STATE_FILE = os.path.join(DATA_DIR, "rolling_summaries.json")
+
+@dataclass
+class RollingSummary:
+    """
+    A channel's latest summary and the point up to which it is current.
+    """
+    summary: DiscordSummary
+    last_message_id: str
+    started_at: datetime  # When the summary was last generated from scratch
+
+class RollingSummaryStore:
+    """
+    JSON-file backed mapping of channel IDs to their rolling summaries.
+    """
+    
+    def __init__(self, path: str = STATE_FILE):
+        """
+        Initialize the store and load any persisted summaries.
+        
+        Args:
+            path: Path of the JSON state file
+        """
+        self.path = path
+        self.summaries: Dict[str, RollingSummary] = self._load()
+        # Saves run in executor threads and share one temporary file
+        self._save_lock = threading.Lock()
+    
+    def _load(self) -> Dict[str, RollingSummary]:
+        """
+        Load rolling summaries from disk.
+        
+        Returns:
+            Dictionary mapping channel IDs to rolling summaries
+        """
+        if not os.path.exists(self.path):
+            return {}
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {
+                str(channel_id): RollingSummary(
+                    summary=DiscordSummary.from_dict(entry["summary"]),
+                    last_message_id=str(entry["last_message_id"]),
+                    started_at=datetime.fromisoformat(entry["started_at"])
+                )
+                for channel_id, entry in data.get("summaries", {}).items()
+            }
+        except Exception as e:
+            logger.error(f"Error loading rolling summaries from {self.path}: {e}")
+            return {}
+    
+    def get(self, channel_id: str) -> Optional[RollingSummary]:
+        """
+        Get the rolling summary of a channel.
+        
+        Args:
+            channel_id: ID of the channel
+            
+        Returns:
+            Rolling summary, or None if the channel was never summarized
+        """
+        return self.summaries.get(channel_id)
+    
+    def update(self, channel_id: str, summary: DiscordSummary, last_message_id: str, rebased: bool) -> None:
+        """
+        Record a channel's new summary.
+        
+        Args:
+            channel_id: ID of the channel
+            summary: Newly generated summary
+            last_message_id: ID of the newest message the summary covers
+            rebased: Whether the summary was generated from scratch rather than
+                folded into the previous one
+        """
+        previous = self.summaries.get(channel_id)
+        started_at = summary.generation_time if rebased or previous is None else previous.started_at
+        self.summaries[channel_id] = RollingSummary(summary, last_message_id, started_at)
+    
+    def save(self) -> None:
+        """
+        Persist the rolling summaries atomically.
+        
+        Blocking; async callers should run it in an executor.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        temp_path = f"{self.path}.tmp"
+        try:
+            with self._save_lock:
+                # Copy under the lock so a later save never writes older summaries
+                data = {
+                    channel_id: {
+                        "summary": rolling.summary.to_dict(),
+                        "last_message_id": rolling.last_message_id,
+                        "started_at": rolling.started_at.isoformat()
+                    }
+                    for channel_id, rolling in list(self.summaries.items())
+                }
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"summaries": data}, f, indent=2)
+                os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving rolling summaries to {self.path}: {e}")
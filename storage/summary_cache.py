@@ -0,0 +1,169 @@
+"""
+Summary Cache
+
+This module provides a persistent, content-addressed cache of generated
+summaries. Entries are keyed by a hash of the summarized content, the
+resolved prompts, the model and its output limit, the transcript format and
+the message filter settings, so an identical request never pays for a
+second LLM call. Entries expire after a TTL and the least
+recently used entries are evicted beyond a maximum size.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default location of the cache database
+DATA_DIR = "data"
+DATABASE_FILE = os.path.join(DATA_DIR, "summary_cache.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary_cache (
+    cache_key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    provider_name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_accessed REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_cache_last_accessed ON summary_cache (last_accessed);
+"""
+
+def build_cache_key(
+    items: Iterable[str],
+    system_prompt: str,
+    user_prompt: str,
+    model: str,
+    max_tokens: int,
+    transcript_format: str = "full",
+    filter_settings: str = ""
+) -> str:
+    """
+    Build a content-addressed cache key for a summary request.
+
+    Args:
+        items: Content being summarized, e.g. "<message id>:<content>" per message
+        system_prompt: Resolved system prompt
+        user_prompt: Resolved user prompt template
+        model: Model name
+        max_tokens: Maximum number of output tokens
+        transcript_format: Format the messages are sent in, "full" or "compact"
+        filter_settings: Settings of the filters the messages went through, if any
+
+    Returns:
+        Hex digest identifying the request
+    """
+    digest = hashlib.sha256()
+    for part in (model, str(max_tokens), transcript_format, filter_settings, system_prompt, user_prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    for item in items:
+        digest.update(item.encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+class SummaryCache:
+    """
+    SQLite-backed summary cache with TTL expiry and LRU eviction.
+    """
+
+    def __init__(self, path: str = DATABASE_FILE, ttl_seconds: float = 72 * 3600, max_entries: int = 1000):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path: Path of the SQLite database file
+            ttl_seconds: Time after which an entry expires
+            max_entries: Maximum number of entries kept
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+    def get(self, cache_key: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up a cached summary.
+
+        Args:
+            cache_key: Key built with build_cache_key
+
+        Returns:
+            Tuple of (summary content, provider name), or None on a miss
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT content, provider_name, created_at FROM summary_cache WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            if now - row[2] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM summary_cache WHERE cache_key = ?", (cache_key,))
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE summary_cache SET last_accessed = ? WHERE cache_key = ?",
+                (now, cache_key)
+            )
+
+        self.hits += 1
+        return row[0], row[1]
+
+    def put(self, cache_key: str, content: str, provider_name: str) -> None:
+        """
+        Store a summary, evicting expired and least recently used entries.
+
+        Args:
+            cache_key: Key built with build_cache_key
+            content: Summary content
+            provider_name: Name of the provider that generated the summary
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO summary_cache (cache_key, content, provider_name, created_at, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (cache_key) DO UPDATE SET content = excluded.content, "
+                "provider_name = excluded.provider_name, created_at = excluded.created_at, "
+                "last_accessed = excluded.last_accessed",
+                (cache_key, content, provider_name, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM summary_cache WHERE created_at < ?",
+                (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                "DELETE FROM summary_cache WHERE cache_key IN ("
+                "SELECT cache_key FROM summary_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
@@ -0,0 +1,99 @@
+"""
+Collection Watermark Store
+
+This module persists the newest message ID seen in each channel (its
+"high-water mark") so that later collection runs only need to fetch
+messages created after it.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default location of the persisted watermarks
+DATA_DIR = "data"
+STATE_FILE = os.path.join(DATA_DIR, "collection_state.json")
+
+class WatermarkStore:
+    """
+    JSON-file backed mapping of channel IDs to their newest seen message ID.
+    """
+    
+    def __init__(self, path: str = STATE_FILE):
+        """
+        Initialize the store and load any persisted watermarks.
+        
+        Args:
+            path: Path of the JSON state file
+        """
+        self.path = path
+        self.watermarks: Dict[str, str] = self._load()
+        # Saves run in executor threads and share one temporary file
+        self._save_lock = threading.Lock()
+    
+    def _load(self) -> Dict[str, str]:
+        """
+        Load watermarks from disk.
+        
+        Returns:
+            Dictionary mapping channel IDs to message IDs
+        """
+        if not os.path.exists(self.path):
+            return {}
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {str(channel_id): str(message_id) for channel_id, message_id in data.get("watermarks", {}).items()}
+        except Exception as e:
+            logger.error(f"Error loading collection watermarks from {self.path}: {e}")
+            return {}
+    
+    def get(self, channel_id: str) -> Optional[str]:
+        """
+        Get the high-water mark of a channel.
+        
+        Args:
+            channel_id: ID of the channel
+            
+        Returns:
+            Newest seen message ID, or None if the channel was never collected
+        """
+        return self.watermarks.get(channel_id)
+    
+    def update(self, channel_id: str, message_id: str) -> None:
+        """
+        Advance the high-water mark of a channel. Older IDs are ignored.
+        
+        Args:
+            channel_id: ID of the channel
+            message_id: ID of a message seen in the channel
+        """
+        current = self.watermarks.get(channel_id)
+        if current is None or int(message_id) > int(current):
+            self.watermarks[channel_id] = message_id
+    
+    def save(self) -> None:
+        """
+        Persist the watermarks atomically.
+        
+        Blocking; async callers should run it in an executor.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        temp_path = f"{self.path}.tmp"
+        try:
+            with self._save_lock:
+                # Copy under the lock so a later save never writes older marks
+                watermarks = dict(self.watermarks)
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"watermarks": watermarks}, f, indent=2)
+                os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving collection watermarks to {self.path}: {e}")
@@ -1,7 +1,7 @@
 """
 Summarizer Factory Module
 
-This module provides a factory function for creating LLM summarizers and
+This module provides factory functions for creating LLM summarizers and
 handles the dynamic selection of appropriate summarizer classes based on 
 the configured provider.
 """
@@ -11,8 +11,10 @@ from typing import Optional
 
 from config.settings import LLMProvider, LLMConfig
 from summarizers.base import BaseSummarizer
+from summarizers.health import CircuitBreaker
 from summarizers.deepseek import DeepSeekSummarizer
 from summarizers.anthropic import AnthropicSummarizer
+from summarizers.pool import SummarizerPool
 
 logger = logging.getLogger(__name__)
 
@@ -31,11 +33,54 @@ def create_summarizer(config: LLMConfig) -> BaseSummarizer:
     """
     logger.info(f"Creating summarizer for provider: {config.provider}")
     
+    circuit_breaker = CircuitBreaker(
+        config.provider.value,
+        failure_rate_threshold=config.breaker_failure_rate,
+        slow_call_seconds=config.request_timeout / 2,
+        cooldown_seconds=config.breaker_cooldown_seconds
+    )
+    
+    transcript_format = config.transcript_formats.get(config.provider, "full")
+    
     if config.provider == LLMProvider.DEEPSEEK:
-        return DeepSeekSummarizer(config.api_key)
+        return DeepSeekSummarizer(
+            config.api_key, config.max_concurrent_requests, config.request_timeout, circuit_breaker, transcript_format
+        )
     elif config.provider == LLMProvider.ANTHROPIC:
-        return AnthropicSummarizer(config.api_key)
+        return AnthropicSummarizer(
+            config.api_key, config.max_concurrent_requests, config.request_timeout, circuit_breaker, transcript_format
+        )
     else:
         error_msg = f"Unsupported LLM provider: {config.provider}"
         logger.error(error_msg)
-        raise ValueError(error_msg)
\ No newline at end of file
+        raise ValueError(error_msg)
+
+def create_summarizer_pool(config: LLMConfig) -> SummarizerPool:
+    """
+    Create a pool with a summarizer for the configured provider, followed by
+    one for every other provider that has an API key.
+    
+    Args:
+        config: LLM configuration
+        
+    Returns:
+        SummarizerPool: Pool of instantiated summarizers, primary first
+    """
+    summarizers = [create_summarizer(config)]
+    
+    for provider in LLMProvider:
+        api_key = config.fallback_api_keys.get(provider)
+        if provider == config.provider or not api_key:
+            continue
+        summarizers.append(create_summarizer(LLMConfig(
+            provider=provider,
+            api_key=api_key,
+            max_concurrent_requests=config.max_concurrent_requests,
+            request_timeout=config.request_timeout,
+            breaker_failure_rate=config.breaker_failure_rate,
+            breaker_cooldown_seconds=config.breaker_cooldown_seconds,
+            transcript_formats=config.transcript_formats
+        )))
+    
+    logger.info(f"Summarizer pool: {', '.join(s.provider_name for s in summarizers)}")
+    return SummarizerPool(summarizers, hedging=config.hedging, hedge_percentile=config.hedge_percentile)
@@ -1,71 +1,134 @@
 import logging
-from anthropic import Anthropic
-from summarizers.base import BaseSummarizer
-from utils.prompts import PromptTemplates
+import textwrap
+from anthropic import AsyncAnthropic
+from models.summary import SummaryResult
+from summarizers.base import BatchSummarizer
 
 logger = logging.getLogger(__name__)
 
-class AnthropicSummarizer(BaseSummarizer):
+# Marks the end of a prompt prefix that Anthropic should cache
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Shortest prefix Anthropic caches for Sonnet models; a breakpoint on a shorter
+# one is ignored. The default prompts are below it, so caching only applies to
+# longer custom prompts, and other prompts are sent as they are
+MIN_CACHEABLE_TOKENS = 1024
+
+class AnthropicSummarizer(BatchSummarizer):
     """Anthropic Claude implementation of the summarizer"""
     
-    def __init__(self, api_key):
+    model = "claude-3-7-sonnet-20250219"
+    max_output_tokens = 1000
+    max_input_tokens = 30000  # Claude has a 200k token context window
+    
+    def __init__(self, api_key, max_concurrent_requests=4, request_timeout=120.0, circuit_breaker=None, transcript_format="full"):
         """
         Initialize with API key
         
         Args:
             api_key (str): Anthropic API key
+            max_concurrent_requests (int): Maximum number of in-flight API requests
+            request_timeout (float): Maximum duration of a single API request in seconds
+            circuit_breaker (CircuitBreaker): Circuit breaker tracking the provider's health
+            transcript_format (str): Format of the message transcripts sent, "full" or "compact"
         """
-        super().__init__(api_key)
-        self.client = Anthropic(api_key=api_key)
+        super().__init__(api_key, max_concurrent_requests, request_timeout, circuit_breaker, transcript_format)
+        self.client = AsyncAnthropic(api_key=api_key)
+    
+    def _build_user_content(self, system_prompt, user_prompt_template, text):
+        # Static instructions first so they extend the cached prefix after the
+        # system prompt; the text that changes on every call goes last
+        instructions = textwrap.dedent(
+            user_prompt_template.replace("{text}", "(provided at the end of this message)")
+        ).strip()
         
-    def generate_summary(
-        self, 
-        messages,  # Changed from message_texts to messages
-        channel_name=None,
-        prompt_type=None, 
-        override_system_prompt=None, 
-        override_user_prompt=None
-    ):
-        try:
-            # Convert DiscordMessage objects to text format
-            message_texts = [message.formatted_content for message in messages]
-            combined_text = "\n".join(message_texts)
-            
-            # Truncate text if too long
-            max_tokens = 25000  # Increased for Claude
-            if len(combined_text) > max_tokens:
-                logger.warning(f"Truncating message text from {len(combined_text)} to {max_tokens} characters")
-                combined_text = combined_text[-max_tokens:]
-            
-            # Get appropriate prompts with potential overrides
-            prompts = PromptTemplates.get_prompts(
-                channel_name=channel_name,  # Parameter name matches what PromptTemplates expects
-                prompt_type=prompt_type,
-                override_system_prompt=override_system_prompt,
-                override_user_prompt=override_user_prompt
-            )
-            
-            # API call with prompts
-            response = self.client.messages.create(
-                model="claude-3-7-sonnet-20250219",
-                max_tokens=1000,
-                system=prompts['system_prompt'],
-                messages=[
-                    {
-                        "role": "user",
-                        "content": PromptTemplates.format_user_prompt(
-                            combined_text, 
-                            channel_name=channel_name,  # Parameter name matches what PromptTemplates expects
-                            prompt_type=prompt_type,
-                            override_system_prompt=override_system_prompt,
-                            override_user_prompt=override_user_prompt
-                        )
-                    }
-                ]
-            )
+        # Too short to be cached: keep the text where the prompt puts it
+        if self.count_tokens(system_prompt + instructions) < MIN_CACHEABLE_TOKENS:
+            return super()._build_user_content(system_prompt, user_prompt_template, text)
+        
+        # The system prompt and the instructions are identical for every call of
+        # a prompt type, so one breakpoint after the instructions caches both
+        return [
+            {
+                "type": "text",
+                "text": instructions,
+                "cache_control": CACHE_CONTROL
+            },
+            {
+                "type": "text",
+                "text": text
+            }
+        ]
+    
+    def _build_request(self, system_prompt, user_prompt):
+        return {
+            "model": self.model,
+            "max_tokens": self.max_output_tokens,
+            "system": system_prompt,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": user_prompt
+                }
+            ]
+        }
+    
+    def _record_response_usage(self, usage):
+        self.record_usage(
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cache_read_input_tokens=getattr(usage, "cache_read_input_tokens", 0),
+            cache_creation_input_tokens=getattr(usage, "cache_creation_input_tokens", 0)
+        )
+    
+    async def _complete(self, system_prompt, user_prompt):
+        # API call with prompts
+        response = await self.client.messages.create(**self._build_request(system_prompt, user_prompt))
+        
+        self._record_response_usage(response.usage)
+        return response.content[0].text
+    
+    async def _stream(self, system_prompt, user_prompt):
+        # Streaming API call with prompts
+        async with self.client.messages.stream(**self._build_request(system_prompt, user_prompt)) as stream:
+            async for text in stream.text_stream:
+                yield text
             
-            return response.content[0].text
+            final_message = await stream.get_final_message()
+            self._record_response_usage(final_message.usage)
+    
+    async def submit_batch(self, requests):
+        # Message Batches API: same request parameters, processed asynchronously
+        batch = await self.client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": custom_id,
+                    "params": self._build_request(system_prompt, user_prompt)
+                }
+                for custom_id, system_prompt, user_prompt in requests
+            ]
+        )
+        
+        logger.info(f"Submitted Anthropic message batch {batch.id} with {len(requests)} requests")
+        return batch.id
+    
+    async def is_batch_complete(self, batch_id):
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+    
+    async def get_batch_results(self, batch_id):
+        results = {}
+        async for entry in await self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                message = entry.result.message
+                self._record_response_usage(message.usage)
+                results[entry.custom_id] = SummaryResult(text=message.content[0].text, provider_name=self.provider_name)
+            else:
+                # errored, canceled or expired
+                results[entry.custom_id] = SummaryResult(
+                    text=None,
+                    provider_name=self.provider_name,
+                    error=f"batch request {entry.result.type}"
+                )
         
-        except Exception as e:
-            logger.error(f'Summary generation error: {e}')
-            return f"Unable to generate summary. Error: {str(e)}"
\ No newline at end of file
+        return results
@@ -5,28 +5,88 @@ This module defines the abstract base class for summarizers.
 All LLM-specific summarizer implementations should inherit from this class.
 """
 
+import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple, Union
 
 from models.message import DiscordMessage
-from models.summary import DiscordSummary
+from models.summary import DiscordSummary, SummaryResult
+from summarizers.chunking import estimate_tokens, pack_lines
+from summarizers.health import CircuitBreaker
+from summarizers.transcript import FULL, encode_transcript
+from utils.prompts import PromptTemplates
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class TokenUsage:
+    """
+    Token counts reported by a provider, accumulated over requests.
+    """
+    requests: int = 0
+    input_tokens: int = 0  # Input tokens billed at the full rate
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0  # Input tokens served from the provider's prompt cache
+    cache_creation_input_tokens: int = 0  # Input tokens written to the provider's prompt cache
+    transcript_tokens: int = 0  # Estimated tokens of the compact transcripts sent
+    full_transcript_tokens: int = 0  # Estimated tokens the same transcripts take in the full format
+    
+    @property
+    def cache_hit_ratio(self) -> float:
+        """
+        Get the share of input tokens served from the prompt cache.
+        
+        Returns:
+            Cache hit ratio between 0 and 1
+        """
+        total = self.input_tokens + self.cache_read_input_tokens + self.cache_creation_input_tokens
+        return self.cache_read_input_tokens / total if total else 0.0
+    
+    @property
+    def transcript_reduction(self) -> float:
+        """
+        Get the share of transcript tokens saved by the compact format.
+        
+        Returns:
+            Token reduction ratio between 0 and 1
+        """
+        if not self.full_transcript_tokens:
+            return 0.0
+        return 1 - self.transcript_tokens / self.full_transcript_tokens
+
 class BaseSummarizer(ABC):
     """
     Abstract base class for summarizers.
     """
     
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrent_requests: int = 4,
+        request_timeout: float = 120.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        transcript_format: str = FULL
+    ):
         """
         Initialize the summarizer with an API key.
         
         Args:
             api_key: API key for the LLM provider
+            max_concurrent_requests: Maximum number of in-flight requests to the provider
+            request_timeout: Maximum duration of a single request in seconds
+            circuit_breaker: Circuit breaker tracking the provider's health (optional)
+            transcript_format: Format of the message transcripts sent, "full" or "compact"
         """
         self.api_key = api_key
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.request_timeout = request_timeout
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(self.provider_name)
+        self.transcript_format = transcript_format
+        self.token_usage = TokenUsage()
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
     
     @property
     def provider_name(self) -> str:
@@ -38,11 +98,139 @@ class BaseSummarizer(ABC):
         """
         return self.__class__.__name__.replace('Summarizer', '')
     
+    # Model identifier and output limit sent with every request
+    model: str = ""
+    max_output_tokens: int = 1000
+    
+    # Token budget for the text inserted into a single prompt. Larger inputs
+    # are split into chunks that are summarized separately and then merged.
+    max_input_tokens: int = 8000
+    
+    @property
+    def tokenizer_profile(self) -> str:
+        """
+        Get the name of the tokenizer profile used to estimate token counts.
+        
+        Returns:
+            Tokenizer profile name
+        """
+        return self.provider_name.lower()
+    
+    def count_tokens(self, text: str) -> int:
+        """
+        Estimate the number of tokens in a text for this provider.
+        
+        Args:
+            text: Text to measure
+            
+        Returns:
+            Estimated token count
+        """
+        return estimate_tokens(text, self.tokenizer_profile)
+    
+    @property
+    def request_semaphore(self) -> asyncio.Semaphore:
+        """
+        Get the semaphore capping in-flight requests to this provider.
+        
+        Returns:
+            Semaphore shared by every call made through this summarizer
+        """
+        if self._request_semaphore is None:
+            self._request_semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        return self._request_semaphore
+    
+    async def close(self) -> None:
+        """
+        Close the provider API client, if the summarizer holds one.
+        """
+        client = getattr(self, 'client', None)
+        if client is not None:
+            await client.close()
+    
+    def record_usage(
+        self,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_read_input_tokens: int = 0,
+        cache_creation_input_tokens: int = 0
+    ) -> None:
+        """
+        Add the token usage reported for one request to the running totals.
+        
+        Args:
+            input_tokens: Input tokens billed at the full rate
+            output_tokens: Output tokens
+            cache_read_input_tokens: Input tokens served from the prompt cache
+            cache_creation_input_tokens: Input tokens written to the prompt cache
+        """
+        self.token_usage.requests += 1
+        self.token_usage.input_tokens += input_tokens or 0
+        self.token_usage.output_tokens += output_tokens or 0
+        self.token_usage.cache_read_input_tokens += cache_read_input_tokens or 0
+        self.token_usage.cache_creation_input_tokens += cache_creation_input_tokens or 0
+    
+    def _build_user_content(
+        self,
+        system_prompt: str,
+        user_prompt_template: str,
+        text: str
+    ) -> Union[str, List[Dict[str, Any]]]:
+        """
+        Build the user message from the prompt template and the text to summarize.
+        
+        Providers can override this to return structured content, e.g. to
+        order and mark parts of the prompt for caching.
+        
+        Args:
+            system_prompt: System prompt sent with the message
+            user_prompt_template: User prompt template with a {text} placeholder
+            text: Text to insert into the template
+            
+        Returns:
+            User message content
+        """
+        return user_prompt_template.format(text=text)
+    
     @abstractmethod
-    def generate_summary(
+    async def _complete(self, system_prompt: str, user_prompt: Union[str, List[Dict[str, Any]]]) -> str:
+        """
+        Send a single prompt to the LLM.
+        
+        Args:
+            system_prompt: System prompt
+            user_prompt: User message content built by _build_user_content
+            
+        Returns:
+            Response text
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        pass
+    
+    async def _stream(self, system_prompt: str, user_prompt: Union[str, List[Dict[str, Any]]]) -> AsyncIterator[str]:
+        """
+        Send a single prompt to the LLM and stream the response.
+        
+        Providers without streaming support yield the complete response at once.
+        
+        Args:
+            system_prompt: System prompt
+            user_prompt: User message content built by _build_user_content
+            
+        Yields:
+            Response text deltas
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        yield await self._complete(system_prompt, user_prompt)
+    
+    async def generate_summary(
         self,
         messages: List[DiscordMessage], 
-        channel_name: str,  
+        channel_name: Optional[str] = None,  
         prompt_type: Optional[str] = None, 
         override_system_prompt: Optional[str] = None, 
         override_user_prompt: Optional[str] = None
@@ -60,16 +248,423 @@ class BaseSummarizer(ABC):
         Returns:
             Generated summary text or None if generation fails
         """
-        pass
+        chunks = self._chunk_transcript(messages, self.max_input_tokens)
+        
+        if len(chunks) <= 1:
+            logger.info(f"Sending {len(messages)} messages to {self.provider_name} API")
+            return await self.summarize_text(
+                chunks[0] if chunks else "",
+                channel_name=channel_name,
+                prompt_type=prompt_type,
+                override_system_prompt=override_system_prompt,
+                override_user_prompt=override_user_prompt
+            )
+        
+        # Too large for one prompt: summarize each chunk in parallel, then merge
+        logger.info(f"Splitting {len(messages)} messages into {len(chunks)} chunks for {self.provider_name}")
+        
+        results = await asyncio.gather(*(
+            self.summarize_text(
+                chunk,
+                channel_name=channel_name,
+                prompt_type=prompt_type,
+                override_system_prompt=override_system_prompt,
+                override_user_prompt=override_user_prompt
+            )
+            for chunk in chunks
+        ))
+        partial_summaries = [summary for summary in results if summary]
+        
+        if not partial_summaries:
+            return None
+        
+        return await self.reduce_summaries(
+            partial_summaries,
+            channel_name=channel_name,
+            prompt_type=prompt_type,
+            override_system_prompt=override_system_prompt,
+            override_user_prompt=PromptTemplates.MERGE_USER_PROMPT
+        )
+    
+    async def reduce_summaries(
+        self,
+        summaries: List[str],
+        channel_name: Optional[str] = None,
+        prompt_type: Optional[str] = None,
+        override_system_prompt: Optional[str] = None,
+        override_user_prompt: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Merge several summaries into one, in as many rounds as the token budget requires.
+        
+        Args:
+            summaries: Summaries to merge, in order
+            channel_name: Name of the topic or channel
+            prompt_type: Type of prompt to use (optional)
+            override_system_prompt: Custom system prompt (optional)
+            override_user_prompt: Custom user prompt (optional)
+            
+        Returns:
+            Merged summary text, or None if generation fails or a round of
+            merging leaves as many groups as the previous one
+        """
+        async def merge(group: List[str]) -> Optional[str]:
+            return await self.summarize_text(
+                "\n\n".join(group),
+                channel_name=channel_name,
+                prompt_type=prompt_type,
+                override_system_prompt=override_system_prompt,
+                override_user_prompt=override_user_prompt
+            )
+        
+        previous_group_count = None
+        while True:
+            groups = pack_lines(summaries, self.max_input_tokens, self.tokenizer_profile, separator="\n\n")
+            if len(groups) <= 1:
+                return await merge(summaries)
+            
+            # Merged summaries too long to share a group would be merged forever
+            if previous_group_count is not None and len(groups) >= previous_group_count:
+                logger.error(f"Merging {len(summaries)} summaries made no progress: still {len(groups)} groups")
+                return None
+            previous_group_count = len(groups)
+            
+            logger.info(f"Merging {len(summaries)} summaries in {len(groups)} groups")
+            results = await asyncio.gather(*(merge(group) for group in groups))
+            summaries = [summary for summary in results if summary]
+            
+            if not summaries:
+                return None
+    
+    async def update_summary(
+        self,
+        previous_summary: str,
+        messages: List[DiscordMessage],
+        channel_name: Optional[str] = None,
+        prompt_type: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Fold new messages into a previously generated summary.
+        
+        Only the new messages and the previous summary are sent, so the cost
+        of an update does not depend on how much was already summarized.
+        
+        Args:
+            previous_summary: Summary covering the earlier messages
+            messages: Messages posted since the previous summary
+            channel_name: Name of the topic or channel
+            prompt_type: Type of prompt to use (optional)
+            
+        Returns:
+            Updated summary text or None if generation fails
+        """
+        if not messages:
+            return previous_summary
+        
+        budget = self.max_input_tokens - self.count_tokens(previous_summary)
+        chunks = self._chunk_transcript(messages, budget) if budget > 0 else []
+        
+        if len(chunks) == 1:
+            logger.info(f"Folding {len(messages)} new messages into the previous summary with {self.provider_name}")
+            new_content = "New Messages:\n" + chunks[0]
+        else:
+            # Too many new messages to send next to the previous summary:
+            # summarize them on their own first, then fold that summary in
+            new_summary = await self.generate_summary(messages, channel_name=channel_name, prompt_type=prompt_type)
+            if not new_summary:
+                return None
+            new_content = "Summary of New Messages:\n" + new_summary
+        
+        return await self.summarize_text(
+            self._format_rolling_text(previous_summary, new_content),
+            channel_name=channel_name,
+            prompt_type=prompt_type,
+            override_user_prompt=PromptTemplates.ROLLING_USER_PROMPT
+        )
+    
+    @staticmethod
+    def _format_rolling_text(previous_summary: str, new_content: str) -> str:
+        """
+        Format the text of a rolling summary update.
+        
+        Args:
+            previous_summary: Summary covering the earlier messages
+            new_content: Labelled new messages, or a labelled summary of them
+            
+        Returns:
+            Text to insert into the rolling user prompt
+        """
+        return f"Previous Summary:\n{previous_summary.strip()}\n\n{new_content}"
+    
+    async def stream_summary(
+        self,
+        messages: List[DiscordMessage],
+        channel_name: Optional[str] = None,
+        prompt_type: Optional[str] = None,
+        previous_summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate a summary from Discord messages, streaming the text as it is generated.
+        
+        Args:
+            messages: List of messages to summarize
+            channel_name: Name of the topic or channel
+            prompt_type: Type of prompt to use (optional)
+            previous_summary: Summary to fold the messages into (optional)
+            
+        Yields:
+            Summary text deltas
+            
+        Raises:
+            Exception: If generation fails
+        """
+        budget = self.max_input_tokens - (self.count_tokens(previous_summary) if previous_summary else 0)
+        chunks = self._chunk_transcript(messages, budget) if budget > 0 else []
+        
+        if len(chunks) <= 1 and budget > 0:
+            text = chunks[0] if chunks else ""
+            override_user_prompt = None
+            if previous_summary is not None:
+                text = self._format_rolling_text(previous_summary, "New Messages:\n" + text)
+                override_user_prompt = PromptTemplates.ROLLING_USER_PROMPT
+            
+            async for delta in self.stream_text(
+                text,
+                channel_name=channel_name,
+                prompt_type=prompt_type,
+                override_user_prompt=override_user_prompt
+            ):
+                yield delta
+            return
+        
+        # Chunked summaries need every partial summary first, so they are yielded whole
+        if previous_summary is None:
+            summary_text = await self.generate_summary(messages, channel_name=channel_name, prompt_type=prompt_type)
+        else:
+            summary_text = await self.update_summary(previous_summary, messages, channel_name=channel_name, prompt_type=prompt_type)
+        
+        if not summary_text:
+            raise RuntimeError(f"{self.provider_name} failed to generate a summary")
+        yield summary_text
+    
+    async def stream_text(
+        self,
+        text: str,
+        channel_name: Optional[str] = None,
+        prompt_type: Optional[str] = None,
+        override_system_prompt: Optional[str] = None,
+        override_user_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a single summarization request, guarded by the provider's circuit breaker.
+        
+        Args:
+            text: Text to insert into the user prompt
+            channel_name: Name of the topic or channel
+            prompt_type: Type of prompt to use (optional)
+            override_system_prompt: Custom system prompt (optional)
+            override_user_prompt: Custom user prompt (optional)
+            
+        Yields:
+            Summary text deltas
+            
+        Raises:
+            Exception: If the circuit is open, the API call fails, or no delta
+                arrives within the request timeout
+        """
+        prompts = PromptTemplates.get_prompts(
+            channel_name=channel_name,
+            prompt_type=prompt_type,
+            override_system_prompt=override_system_prompt,
+            override_user_prompt=override_user_prompt
+        )
+        
+        user_prompt = self._build_user_content(prompts['system_prompt'], prompts['user_prompt'], text)
+        
+        async with self.request_semaphore:
+            if not self.circuit_breaker.allow_request():
+                raise RuntimeError(f"{self.provider_name} circuit is {self.circuit_breaker.state.value}")
+            
+            start_time = time.monotonic()
+            stream = self._stream(prompts['system_prompt'], user_prompt)
+            try:
+                while True:
+                    try:
+                        delta = await asyncio.wait_for(stream.__anext__(), timeout=self.request_timeout)
+                    except StopAsyncIteration:
+                        break
+                    if delta:
+                        yield delta
+            except Exception as e:
+                self.circuit_breaker.record_failure(time.monotonic() - start_time)
+                logger.error(f'{self.provider_name} streaming error: {str(e) or e.__class__.__name__}')
+                raise
+            except BaseException:
+                # Cancelled or abandoned by the consumer: no outcome to record
+                self.circuit_breaker.release_request()
+                raise
+            finally:
+                await stream.aclose()
+        
+        self.circuit_breaker.record_success(time.monotonic() - start_time)
+    
+    async def summarize_text(
+        self,
+        text: str,
+        channel_name: Optional[str] = None,
+        prompt_type: Optional[str] = None,
+        override_system_prompt: Optional[str] = None,
+        override_user_prompt: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Generate a summary from already formatted text, such as a transcript
+        or a set of previously generated summaries.
+        
+        Args:
+            text: Text to insert into the user prompt
+            channel_name: Name of the topic or channel
+            prompt_type: Type of prompt to use (optional)
+            override_system_prompt: Custom system prompt (optional)
+            override_user_prompt: Custom user prompt (optional)
+            
+        Returns:
+            Generated summary text or None if generation fails
+        """
+        result = await self.request_summary(
+            text,
+            channel_name=channel_name,
+            prompt_type=prompt_type,
+            override_system_prompt=override_system_prompt,
+            override_user_prompt=override_user_prompt
+        )
+        return result.text
+    
+    async def request_summary(
+        self,
+        text: str,
+        channel_name: Optional[str] = None,
+        prompt_type: Optional[str] = None,
+        override_system_prompt: Optional[str] = None,
+        override_user_prompt: Optional[str] = None
+    ) -> SummaryResult:
+        """
+        Send a single summarization request, guarded by the provider's circuit breaker.
+        
+        Args:
+            text: Text to insert into the user prompt
+            channel_name: Name of the topic or channel
+            prompt_type: Type of prompt to use (optional)
+            override_system_prompt: Custom system prompt (optional)
+            override_user_prompt: Custom user prompt (optional)
+            
+        Returns:
+            Result holding either the summary text or the error
+        """
+        try:
+            # Get appropriate prompts with potential overrides
+            prompts = PromptTemplates.get_prompts(
+                channel_name=channel_name,
+                prompt_type=prompt_type,
+                override_system_prompt=override_system_prompt,
+                override_user_prompt=override_user_prompt
+            )
+            
+            user_prompt = self._build_user_content(prompts['system_prompt'], prompts['user_prompt'], text)
+        except Exception as e:
+            logger.error(f'Error building prompt for {self.provider_name}: {e}')
+            return SummaryResult(text=None, provider_name=self.provider_name, error=str(e))
+        
+        # Cap in-flight requests so parallel channels and chunks don't trip provider rate limits
+        async with self.request_semaphore:
+            # Checked after queueing so requests waiting on a failing provider fail fast
+            if not self.circuit_breaker.allow_request():
+                return SummaryResult(
+                    text=None,
+                    provider_name=self.provider_name,
+                    error=f"{self.provider_name} circuit is {self.circuit_breaker.state.value}"
+                )
+            
+            start_time = time.monotonic()
+            try:
+                summary_text = await asyncio.wait_for(
+                    self._complete(prompts['system_prompt'], user_prompt),
+                    timeout=self.request_timeout
+                )
+            except Exception as e:
+                latency = time.monotonic() - start_time
+                self.circuit_breaker.record_failure(latency)
+                error = str(e) or e.__class__.__name__
+                logger.error(f'{self.provider_name} summary generation error: {error}')
+                return SummaryResult(text=None, provider_name=self.provider_name, error=error, latency=latency)
+            except BaseException:
+                # Cancelled, e.g. as the losing hedge: no outcome to record
+                self.circuit_breaker.release_request()
+                raise
+        
+        latency = time.monotonic() - start_time
+        self.circuit_breaker.record_success(latency)
+        return SummaryResult(text=summary_text, provider_name=self.provider_name, latency=latency)
+    
+    # Whether the provider offers an asynchronous batch API, see BatchSummarizer
+    supports_batches: bool = False
+    
+    def build_request(
+        self,
+        text: str,
+        channel_name: Optional[str] = None,
+        prompt_type: Optional[str] = None,
+        override_system_prompt: Optional[str] = None,
+        override_user_prompt: Optional[str] = None
+    ) -> Tuple[str, Union[str, List[Dict[str, Any]]]]:
+        """
+        Build the prompts of a summarization request without sending it, e.g. for a batch.
+        
+        Args:
+            text: Text to insert into the user prompt
+            channel_name: Name of the topic or channel
+            prompt_type: Type of prompt to use (optional)
+            override_system_prompt: Custom system prompt (optional)
+            override_user_prompt: Custom user prompt (optional)
+            
+        Returns:
+            Tuple of (system prompt, user message content)
+        """
+        prompts = PromptTemplates.get_prompts(
+            channel_name=channel_name,
+            prompt_type=prompt_type,
+            override_system_prompt=override_system_prompt,
+            override_user_prompt=override_user_prompt
+        )
+        return prompts['system_prompt'], self._build_user_content(prompts['system_prompt'], prompts['user_prompt'], text)
+    
+    def build_summary_requests(
+        self,
+        messages: List[DiscordMessage],
+        channel_name: Optional[str] = None,
+        prompt_type: Optional[str] = None
+    ) -> List[Tuple[str, Union[str, List[Dict[str, Any]]]]]:
+        """
+        Build the prompts summarizing messages, one request per chunk that fits the token budget.
+        
+        Args:
+            messages: List of messages to summarize
+            channel_name: Name of the topic or channel
+            prompt_type: Type of prompt to use (optional)
+            
+        Returns:
+            List of (system prompt, user message content) tuples
+        """
+        chunks = self._chunk_transcript(messages, self.max_input_tokens)
+        return [self.build_request(chunk, channel_name, prompt_type) for chunk in chunks]
     
-
     def create_summary_object(
         self, 
         content: str, 
         messages: List[DiscordMessage], 
         channel_name: str,  # Change from channel_name to channel_name for consistency
         channel_id: str,
-        provider_name: Optional[str] = None
+        provider_name: Optional[str] = None,
+        message_count: Optional[int] = None
     ) -> DiscordSummary:
         # Use the provided provider name or default to the class provider name
         actual_provider = provider_name or self.provider_name
@@ -79,41 +674,84 @@ class BaseSummarizer(ABC):
             title=f"Discord Summary: {channel_name}",  # Update this too
             channel_id=channel_id,
             channel_name=channel_name,  # And this
-            message_count=len(messages),
+            message_count=message_count if message_count is not None else len(messages),
             provider_name=actual_provider
         )
     
-    def _format_messages_for_prompt(self, messages: List[DiscordMessage]) -> str:
+    def _chunk_transcript(self, messages: List[DiscordMessage], max_tokens: int) -> List[str]:
         """
-        Format messages for inclusion in the prompt.
+        Encode messages in the summarizer's transcript format and split them into chunks.
         
         Args:
-            messages: List of messages to format
+            messages: List of messages to encode
+            max_tokens: Token budget per chunk
             
         Returns:
-            Formatted message text
+            Transcript chunks in chronological order, each starting with the transcript header
         """
-        # Sort messages by timestamp
-        sorted_messages = sorted(messages, key=lambda m: m.timestamp)
+        transcript = encode_transcript(messages, self.transcript_format)
+        header = "\n".join(transcript.header)
+        budget = max(1, max_tokens - (self.count_tokens(header) + 1 if header else 0))
+        chunks = ["\n".join(chunk) for chunk in transcript.pack(budget, self.tokenizer_profile)]
         
-        # Format each message and join with newlines
-        return "\n".join(message.formatted_content for message in sorted_messages)
+        if self.transcript_format != FULL and messages:
+            # Measure what the compact format saves over the full one
+            full_tokens = self.count_tokens("\n".join(encode_transcript(messages, FULL).lines))
+            compact_tokens = sum(self.count_tokens(chunk) for chunk in chunks) + len(chunks) * self.count_tokens(header)
+            self.token_usage.transcript_tokens += compact_tokens
+            self.token_usage.full_transcript_tokens += full_tokens
+            logger.debug(
+                f"{self.transcript_format} transcript of {len(messages)} messages: "
+                f"{compact_tokens} tokens instead of {full_tokens}"
+            )
+        
+        return [f"{header}\n{chunk}" if header else chunk for chunk in chunks]
+
+class BatchSummarizer(BaseSummarizer):
+    """
+    Summarizer of a provider with an asynchronous batch API.
     
-    def _truncate_messages(self, formatted_messages: str, max_length: int = 10000) -> str:
+    Callers check supports_batches before submitting, since only these
+    summarizers have the batch methods.
+    """
+    
+    supports_batches = True
+    
+    @abstractmethod
+    async def submit_batch(self, requests: List[Tuple[str, str, Union[str, List[Dict[str, Any]]]]]) -> str:
         """
-        Truncate messages to fit within token limits.
+        Submit requests as a single provider batch job.
         
         Args:
-            formatted_messages: Formatted message text
-            max_length: Maximum number of characters
+            requests: Tuples of (custom ID, system prompt, user message content)
             
         Returns:
-            Truncated message text
+            Provider batch ID
+        """
+        pass
+    
+    @abstractmethod
+    async def is_batch_complete(self, batch_id: str) -> bool:
         """
-        if len(formatted_messages) <= max_length:
-            return formatted_messages
+        Check whether a batch job has finished processing.
         
-        # Simple truncation - keep the most recent messages
-        # In a real implementation, we might want a more sophisticated approach
-        logger.warning(f"Truncating message text from {len(formatted_messages)} to {max_length} characters")
-        return formatted_messages[-max_length:]
\ No newline at end of file
+        Args:
+            batch_id: Provider batch ID
+            
+        Returns:
+            True once every request in the batch has ended
+        """
+        pass
+    
+    @abstractmethod
+    async def get_batch_results(self, batch_id: str) -> Dict[str, SummaryResult]:
+        """
+        Get the results of a finished batch job.
+        
+        Args:
+            batch_id: Provider batch ID
+            
+        Returns:
+            Dictionary mapping custom IDs to request results
+        """
+        pass
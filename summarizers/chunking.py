@@ -0,0 +1,134 @@
+"""
+Token-Aware Chunking
+
+This module estimates token counts per LLM provider with a local, offline
+approximation of their tokenizers, and packs whole lines (messages or
+summaries) into chunks that fit a token budget.
+"""
+
+import math
+import re
+from typing import Callable, List
+
+# Pre-tokenization similar to BPE tokenizers: words, numbers, runs of
+# punctuation, whitespace runs and individual non-ASCII characters
+TOKEN_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d\x80-\U0010FFFF]+|\s+|[\x80-\U0010FFFF]")
+
+# Average characters per token for plain words, and a correction factor
+# applied to the whole estimate, calibrated per provider tokenizer
+TOKENIZER_PROFILES = {
+    "anthropic": {"chars_per_token": 4.0, "factor": 1.15},
+    "deepseek": {"chars_per_token": 4.2, "factor": 1.05},
+}
+DEFAULT_PROFILE = {"chars_per_token": 4.0, "factor": 1.1}
+
+def estimate_tokens(text: str, provider: str = "") -> int:
+    """
+    Estimate the number of tokens a provider's tokenizer would produce for a text.
+
+    Args:
+        text: Text to measure
+        provider: Provider name used to select the tokenizer profile
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+
+    profile = TOKENIZER_PROFILES.get(provider.lower(), DEFAULT_PROFILE)
+    chars_per_token = profile["chars_per_token"]
+
+    tokens = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        first = piece[0]
+        if first.isalpha() and first.isascii():
+            tokens += math.ceil(len(piece) / chars_per_token)
+        elif first.isdigit():
+            # Numbers are split into groups of up to three digits
+            tokens += math.ceil(len(piece) / 3)
+        elif first.isspace():
+            # Single spaces merge into the following word; newlines and runs don't
+            tokens += 0 if piece == " " else 1
+        elif first.isascii():
+            tokens += math.ceil(len(piece) / 2)
+        else:
+            # Non-ASCII characters (emoji, CJK, accents) cost about one token each
+            tokens += 1
+
+    return math.ceil(tokens * profile["factor"])
+
+def pack_lines(
+    lines: List[str],
+    max_tokens: int,
+    provider: str = "",
+    separator: str = "\n"
+) -> List[List[str]]:
+    """
+    Greedily pack whole lines into chunks that fit within a token budget.
+
+    Lines are never split across chunks; a single line larger than the budget
+    is cut down to fit in a chunk of its own.
+
+    Args:
+        lines: Lines to pack, in order
+        max_tokens: Token budget per chunk
+        provider: Provider name used to select the tokenizer profile
+        separator: Separator the lines will be joined with
+
+    Returns:
+        List of chunks, each a list of lines
+    """
+    count: Callable[[str], int] = lambda text: estimate_tokens(text, provider)
+    separator_tokens = count(separator)
+
+    chunks: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for line in lines:
+        line_tokens = count(line)
+
+        if line_tokens > max_tokens:
+            line = truncate_to_tokens(line, max_tokens, provider)
+            line_tokens = count(line)
+
+        added_tokens = line_tokens + (separator_tokens if current else 0)
+        if current and current_tokens + added_tokens > max_tokens:
+            chunks.append(current)
+            current, current_tokens = [], 0
+            added_tokens = line_tokens
+
+        current.append(line)
+        current_tokens += added_tokens
+
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+def truncate_to_tokens(text: str, max_tokens: int, provider: str = "") -> str:
+    """
+    Cut a text down to at most a number of tokens, keeping its beginning.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Maximum number of tokens to keep
+        provider: Provider name used to select the tokenizer profile
+
+    Returns:
+        Truncated text
+    """
+    if estimate_tokens(text, provider) <= max_tokens:
+        return text
+
+    # Binary search on the character length
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle], provider) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+
+    return text[:low]
@@ -1,7 +1,6 @@
 import logging
-from openai import OpenAI
+from openai import AsyncOpenAI
 from summarizers.base import BaseSummarizer
-from utils.prompts import PromptTemplates
 
 # Get logger
 logger = logging.getLogger(__name__)
@@ -9,74 +8,80 @@ logger = logging.getLogger(__name__)
 class DeepSeekSummarizer(BaseSummarizer):
     """DeepSeek implementation of the summarizer using OpenAI-compatible format"""
     
-    def __init__(self, api_key):
+    model = "deepseek-chat"
+    max_output_tokens = 1000
+    max_input_tokens = 16000  # DeepSeek has smaller context window
+    
+    def __init__(self, api_key, max_concurrent_requests=4, request_timeout=120.0, circuit_breaker=None, transcript_format="full"):
         """
         Initialize with API key
         
         Args:
             api_key (str): DeepSeek API key
+            max_concurrent_requests (int): Maximum number of in-flight API requests
+            request_timeout (float): Maximum duration of a single API request in seconds
+            circuit_breaker (CircuitBreaker): Circuit breaker tracking the provider's health
+            transcript_format (str): Format of the message transcripts sent, "full" or "compact"
         """
-        super().__init__(api_key)
-        self.client = OpenAI(
+        super().__init__(api_key, max_concurrent_requests, request_timeout, circuit_breaker, transcript_format)
+        self.client = AsyncOpenAI(
             api_key=api_key,
             base_url="https://api.deepseek.com"
         )
     
-    def generate_summary(
-        self, 
-        messages,  # Changed from message_texts to messages
-        channel_name=None,
-        prompt_type=None, 
-        override_system_prompt=None, 
-        override_user_prompt=None
-    ):
-        try:
-            # Convert DiscordMessage objects to text format
-            message_texts = [message.formatted_content for message in messages]
-            combined_text = "\n".join(message_texts)
-                
-            # Limit combined text length
-            max_tokens = 12000  # DeepSeek has smaller context window
-            if len(combined_text) > max_tokens:
-                logger.warning(f"Truncating message text from {len(combined_text)} to {max_tokens} characters")
-                combined_text = combined_text[-max_tokens:]
-            
-            # Get appropriate prompts with potential overrides
-            prompts = PromptTemplates.get_prompts(
-                channel_name=channel_name,  # Parameter name matches what PromptTemplates expects
-                prompt_type=prompt_type,
-                override_system_prompt=override_system_prompt,
-                override_user_prompt=override_user_prompt
-            )
-            
-            # Log message count
-            logger.info(f"Sending {len(message_texts)} messages to DeepSeek API")
-            
-            # Use OpenAI-compatible format for DeepSeek
-            response = self.client.chat.completions.create(
-                model="deepseek-chat",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": prompts['system_prompt']
-                    },
-                    {
-                        "role": "user", 
-                        "content": PromptTemplates.format_user_prompt(
-                            combined_text, 
-                            channel_name=channel_name,  # Parameter name matches what PromptTemplates expects
-                            prompt_type=prompt_type,
-                            override_system_prompt=override_system_prompt,
-                            override_user_prompt=override_user_prompt
-                        )
-                    }
-                ],
-                max_tokens=1000
-            )
-            
-            logger.info("Successfully received response from DeepSeek API")
-            return response.choices[0].message.content
+    async def _complete(self, system_prompt, user_prompt):
+        # Use OpenAI-compatible format for DeepSeek
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system", 
+                    "content": system_prompt
+                },
+                {
+                    "role": "user", 
+                    "content": user_prompt
+                }
+            ],
+            max_tokens=self.max_output_tokens
+        )
+        
+        logger.info("Successfully received response from DeepSeek API")
+        self._record_response_usage(response.usage)
+        return response.choices[0].message.content
+    
+    def _record_response_usage(self, usage):
+        # DeepSeek caches prompt prefixes automatically and reports the hits
+        if usage is None:
+            return
+        cache_hit_tokens = getattr(usage, "prompt_cache_hit_tokens", 0) or 0
+        self.record_usage(
+            input_tokens=usage.prompt_tokens - cache_hit_tokens,
+            output_tokens=usage.completion_tokens,
+            cache_read_input_tokens=cache_hit_tokens
+        )
+    
+    async def _stream(self, system_prompt, user_prompt):
+        # Same request with streaming enabled
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {
+                    "role": "system", 
+                    "content": system_prompt
+                },
+                {
+                    "role": "user", 
+                    "content": user_prompt
+                }
+            ],
+            max_tokens=self.max_output_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
         
-        except Exception as e:
-            logger.error(f'DeepSeek summary generation error: {e}')
-            return f"Unable to generate summary with DeepSeek. Error: {str(e)}"
\ No newline at end of file
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if getattr(chunk, "usage", None):
+                self._record_response_usage(chunk.usage)
@@ -0,0 +1,208 @@
+"""
+Provider Health Tracking
+
+This module implements a per-provider circuit breaker. It tracks the error
+rate and latency of recent LLM requests; when a provider degrades, requests
+to it are rejected immediately for a cool-down period instead of each one
+waiting out a failing call, and then a limited number of trial requests
+decide whether it has recovered.
+"""
+
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(Enum):
+    """
+    States of a circuit breaker.
+    """
+    CLOSED = "closed"  # Requests flow normally
+    OPEN = "open"  # Requests are rejected until the cool-down ends
+    HALF_OPEN = "half_open"  # A limited number of trial requests are let through
+
+class CircuitBreaker:
+    """
+    Circuit breaker driven by the error rate of a sliding window of requests.
+    
+    Requests slower than the slow call threshold count as failures, so a
+    provider that hangs trips the breaker just like one that errors.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 4,
+        window_size: int = 20,
+        slow_call_seconds: float = 60.0,
+        cooldown_seconds: float = 60.0,
+        half_open_max_calls: int = 1
+    ):
+        """
+        Initialize the circuit breaker in the closed state.
+        
+        Args:
+            name: Name of the provider, used in logs
+            failure_rate_threshold: Share of failed requests in the window that opens the circuit
+            minimum_calls: Number of requests in the window before the failure rate is evaluated
+            window_size: Number of most recent requests considered
+            slow_call_seconds: Latency above which a request counts as failed
+            cooldown_seconds: Time the circuit stays open before trial requests are allowed
+            half_open_max_calls: Number of concurrent trial requests while half-open
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.half_open_max_calls = half_open_max_calls
+        
+        # (failed, latency in seconds) of the most recent requests
+        self._outcomes: deque = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+    
+    @property
+    def state(self) -> CircuitState:
+        """
+        Get the current state, moving from open to half-open once the cool-down has passed.
+        
+        Returns:
+            Circuit state
+        """
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+            logger.info(f"{self.name} circuit half-open, allowing trial requests")
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+    
+    @property
+    def is_open(self) -> bool:
+        """
+        Check whether requests are currently rejected without a trial.
+        
+        Returns:
+            True if the circuit is open
+        """
+        return self.state == CircuitState.OPEN
+    
+    @property
+    def failure_rate(self) -> float:
+        """
+        Get the share of failed requests in the window.
+        
+        Returns:
+            Failure rate between 0 and 1
+        """
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for failed, _ in self._outcomes if failed) / len(self._outcomes)
+    
+    @property
+    def average_latency(self) -> Optional[float]:
+        """
+        Get the average latency of the requests in the window.
+        
+        Returns:
+            Average latency in seconds, or None if no request was recorded
+        """
+        if not self._outcomes:
+            return None
+        return sum(latency for _, latency in self._outcomes) / len(self._outcomes)
+    
+    @property
+    def health_score(self) -> float:
+        """
+        Score the provider's health from its state, failure rate and latency.
+        
+        Returns:
+            Score between 0 (unusable) and 1 (healthy)
+        """
+        state = self.state
+        if state == CircuitState.OPEN:
+            return 0.0
+        
+        score = 1.0 - self.failure_rate
+        average_latency = self.average_latency
+        if average_latency:
+            score *= min(1.0, self.slow_call_seconds / (2 * average_latency))
+        if state == CircuitState.HALF_OPEN:
+            score *= 0.5
+        return score
+    
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may be sent, reserving a trial slot when half-open.
+        
+        Returns:
+            True if the request may be sent
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        return False
+    
+    def release_request(self) -> None:
+        """
+        Release a request that ended without an outcome, such as a cancelled
+        hedge or an abandoned stream, freeing its trial slot when half-open.
+        """
+        if self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+    
+    def record_success(self, latency: float) -> None:
+        """
+        Record a successful request.
+        
+        Args:
+            latency: Duration of the request in seconds
+        """
+        if latency > self.slow_call_seconds:
+            logger.warning(f"{self.name} request took {latency:.1f} seconds")
+            self.record_failure(latency)
+            return
+        
+        if self._state == CircuitState.HALF_OPEN:
+            logger.info(f"{self.name} trial request succeeded, closing circuit")
+            self._state = CircuitState.CLOSED
+            self._outcomes.clear()
+        
+        self._outcomes.append((False, latency))
+    
+    def record_failure(self, latency: float) -> None:
+        """
+        Record a failed request, opening the circuit if the failure rate is too high.
+        
+        Args:
+            latency: Duration of the request in seconds
+        """
+        self._outcomes.append((True, latency))
+        
+        if self._state == CircuitState.HALF_OPEN:
+            logger.warning(f"{self.name} trial request failed, reopening circuit")
+            self._open()
+        elif (
+            self._state == CircuitState.CLOSED
+            and len(self._outcomes) >= self.minimum_calls
+            and self.failure_rate >= self.failure_rate_threshold
+        ):
+            logger.warning(
+                f"{self.name} failure rate {self.failure_rate:.0%} over the last {len(self._outcomes)} requests, "
+                f"opening circuit for {self.cooldown_seconds:.0f} seconds"
+            )
+            self._open()
+    
+    def _open(self) -> None:
+        """
+        Open the circuit and start the cool-down.
+        """
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
@@ -0,0 +1,342 @@
+"""
+Summarizer Pool
+
+This module holds one long-lived summarizer per configured LLM provider, so
+their API clients and connection pools are created once at startup and
+reused by every request, including fallbacks to another provider.
+
+With hedging enabled, a request the primary provider has not answered
+within a percentile of its recent durations is also sent to the next
+provider; whichever answers first wins and the other request is cancelled.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from models.summary import SummaryResult
+from summarizers.base import BaseSummarizer, TokenUsage
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class HedgeStats:
+    """
+    Hedging counters of a single provider.
+    """
+    requests: int = 0  # Requests sent to the provider as primary
+    hedged: int = 0  # Requests to the provider that were hedged to another one
+    hedge_requests: int = 0  # Hedge requests received from another provider
+    wins: int = 0  # Hedged races won by this provider
+    
+    @property
+    def hedge_rate(self) -> float:
+        """
+        Get the share of the provider's requests that were hedged.
+        
+        Returns:
+            Hedge rate between 0 and 1
+        """
+        return self.hedged / self.requests if self.requests else 0.0
+
+class SummarizerPool:
+    """
+    Ordered set of warm summarizers: the primary provider first, then fallbacks.
+    """
+    
+    def __init__(
+        self,
+        summarizers: List[BaseSummarizer],
+        hedging: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_default_delay: float = 30.0,
+        min_latency_samples: int = 5
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            summarizers: Summarizers in the order they should be tried, primary first
+            hedging: Send slow requests to the next provider as well
+            hedge_percentile: Percentile of the provider's recent request durations after which a request is hedged
+            hedge_default_delay: Hedge delay in seconds until enough durations are recorded
+            min_latency_samples: Number of recorded request durations needed to use the percentile
+        
+        Raises:
+            ValueError: If no summarizer is given
+        """
+        if not summarizers:
+            raise ValueError("A summarizer pool needs at least one summarizer")
+        self.summarizers = summarizers
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_default_delay = hedge_default_delay
+        self.min_latency_samples = min_latency_samples
+        
+        self.hedge_stats: Dict[str, HedgeStats] = {s.provider_name: HedgeStats() for s in summarizers}
+        # Durations of recent successful requests run through the pool, per provider
+        self.latencies: Dict[str, Deque[float]] = {s.provider_name: deque(maxlen=100) for s in summarizers}
+    
+    @property
+    def primary(self) -> BaseSummarizer:
+        """
+        Get the summarizer of the configured provider.
+        
+        Returns:
+            Primary summarizer
+        """
+        return self.summarizers[0]
+    
+    @property
+    def fallbacks(self) -> List[BaseSummarizer]:
+        """
+        Get the summarizers tried when the primary one fails.
+        
+        Returns:
+            Fallback summarizers, in order
+        """
+        return self.summarizers[1:]
+    
+    def get(self, provider_name: str) -> Optional[BaseSummarizer]:
+        """
+        Get the summarizer of a provider.
+        
+        Args:
+            provider_name: Name of the provider
+            
+        Returns:
+            Summarizer, or None if the provider is not in the pool
+        """
+        for summarizer in self.summarizers:
+            if summarizer.provider_name == provider_name:
+                return summarizer
+        return None
+    
+    def hedge_delay(self, summarizer: BaseSummarizer) -> float:
+        """
+        Get the time to wait for a provider before hedging a request.
+        
+        The delay comes from the provider's recent successful operations,
+        timed like the hedge timer: including the wait for a request slot and
+        every chunk and merge request, so a slow operation is compared with
+        whole operations rather than with single API round trips. Cache hits
+        and failures are not recorded, so they don't pull the delay down.
+        
+        Args:
+            summarizer: Summarizer the request was sent to
+        
+        Returns:
+            Delay in seconds
+        """
+        latencies = sorted(self.latencies[summarizer.provider_name])
+        if len(latencies) < self.min_latency_samples:
+            return self.hedge_default_delay
+        
+        index = max(0, math.ceil(self.hedge_percentile / 100 * len(latencies)) - 1)
+        return latencies[index]
+    
+    async def _attempt(
+        self,
+        operation: Callable[[BaseSummarizer], Awaitable[Optional[str]]],
+        summarizer: BaseSummarizer,
+        cached: Optional[Callable[[BaseSummarizer], Awaitable[Optional[str]]]] = None
+    ) -> SummaryResult:
+        """
+        Run an operation with one summarizer, capturing its outcome.
+        
+        Args:
+            operation: Coroutine function taking a summarizer and returning summary text,
+                or None on failure
+            summarizer: Summarizer to run the operation with
+            cached: Coroutine function taking a summarizer and returning its cached
+                summary text, or None on a cache miss (optional)
+        
+        Returns:
+            Result holding either the summary text or the error
+        """
+        start_time = time.monotonic()
+        cache_hit = False
+        try:
+            summary_text = await cached(summarizer) if cached else None
+            cache_hit = summary_text is not None
+            if not cache_hit:
+                summary_text = await operation(summarizer)
+            error = None if summary_text else "no summary generated"
+        except Exception as e:
+            logger.error(f"Error summarizing with {summarizer.provider_name}: {str(e)}")
+            summary_text, error = None, str(e)
+        latency = time.monotonic() - start_time
+        if error is None and not cache_hit:
+            self.latencies[summarizer.provider_name].append(latency)
+        return SummaryResult(text=summary_text, provider_name=summarizer.provider_name, error=error, latency=latency)
+    
+    async def _run_hedged(
+        self,
+        operation: Callable[[BaseSummarizer], Awaitable[Optional[str]]],
+        primary: BaseSummarizer,
+        secondary: BaseSummarizer,
+        cached: Optional[Callable[[BaseSummarizer], Awaitable[Optional[str]]]] = None
+    ) -> List[SummaryResult]:
+        """
+        Run an operation with a primary summarizer, hedging to a secondary one if it is slow.
+        
+        Args:
+            operation: Coroutine function taking a summarizer and returning summary text,
+                or None on failure
+            primary: Summarizer tried first
+            secondary: Summarizer the request is hedged to
+            cached: Coroutine function taking a summarizer and returning its cached
+                summary text, or None on a cache miss (optional)
+        
+        Returns:
+            Results of the attempts; the last one is the winner if any succeeded
+        """
+        self.hedge_stats[primary.provider_name].requests += 1
+        primary_task = asyncio.create_task(self._attempt(operation, primary, cached))
+        
+        delay = self.hedge_delay(primary)
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done:
+            return [primary_task.result()]
+        
+        logger.info(f"{primary.provider_name} has not answered after {delay:.1f} seconds, hedging to {secondary.provider_name}")
+        self.hedge_stats[primary.provider_name].hedged += 1
+        self.hedge_stats[secondary.provider_name].hedge_requests += 1
+        secondary_task = asyncio.create_task(self._attempt(operation, secondary, cached))
+        
+        results = []
+        pending = {primary_task, secondary_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                results.append(result)
+                if not result.ok:
+                    continue
+                
+                # Cancel the losing request so it stops holding a connection and a request slot
+                for loser in pending:
+                    loser.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                
+                self.hedge_stats[result.provider_name].wins += 1
+                return results
+        
+        return results
+    
+    async def run(
+        self,
+        operation: Callable[[BaseSummarizer], Awaitable[Optional[str]]],
+        cached: Optional[Callable[[BaseSummarizer], Awaitable[Optional[str]]]] = None
+    ) -> SummaryResult:
+        """
+        Run an operation with the primary summarizer, falling back to the others if it fails.
+        
+        Providers whose circuit breaker is open are skipped without sending a request.
+        
+        Args:
+            operation: Coroutine function taking a summarizer and returning summary text,
+                or None on failure
+            cached: Coroutine function taking a summarizer and returning its cached
+                summary text, or None on a cache miss (optional)
+        
+        Returns:
+            Result holding the summary text and the provider that generated it,
+            or the errors of every provider if all of them failed
+        """
+        errors = []
+        available = []
+        for summarizer in self.summarizers:
+            if summarizer.circuit_breaker.is_open:
+                logger.info(f"Skipping {summarizer.provider_name}: circuit breaker is open")
+                errors.append(f"{summarizer.provider_name}: circuit open")
+            else:
+                available.append(summarizer)
+        
+        index = 0
+        while index < len(available):
+            summarizer = available[index]
+            if summarizer is not self.primary:
+                logger.warning(f"Trying fallback provider {summarizer.provider_name}...")
+            
+            if self.hedging and index + 1 < len(available):
+                results = await self._run_hedged(operation, summarizer, available[index + 1], cached)
+                # Both providers were tried if the request was hedged
+                index += len(results) if len(results) > 1 else 1
+            else:
+                results = [await self._attempt(operation, summarizer, cached)]
+                index += 1
+            
+            result = results[-1]
+            if result.ok:
+                if result.provider_name != self.primary.provider_name:
+                    logger.info(f"Successfully generated summary using fallback provider {result.provider_name}")
+                return result
+            
+            errors.extend(f"{r.provider_name}: {r.error}" for r in results)
+        
+        if not self.fallbacks:
+            logger.error("Summarizer failed and no API key is available for a fallback LLM provider")
+        else:
+            logger.error("All summarizer providers failed")
+        return SummaryResult(text=None, provider_name=None, error="; ".join(errors))
+    
+    def health(self) -> Dict[str, float]:
+        """
+        Get the health score of every provider in the pool.
+        
+        Returns:
+            Dictionary mapping provider names to health scores between 0 and 1
+        """
+        return {summarizer.provider_name: summarizer.circuit_breaker.health_score for summarizer in self.summarizers}
+    
+    def log_hedge_stats(self) -> None:
+        """
+        Log the hedge rate and wins of every provider.
+        """
+        for provider_name, stats in self.hedge_stats.items():
+            logger.info(
+                f"{provider_name} hedging: {stats.hedged}/{stats.requests} requests hedged "
+                f"({stats.hedge_rate:.0%}), {stats.hedge_requests} hedge requests received, {stats.wins} races won"
+            )
+    
+    def reset_usage(self) -> None:
+        """
+        Reset the token usage totals of every provider, e.g. at the start of a run.
+        """
+        for summarizer in self.summarizers:
+            summarizer.token_usage = TokenUsage()
+    
+    def log_usage(self) -> None:
+        """
+        Log the token usage of every provider that handled requests, including prompt cache hits.
+        """
+        for summarizer in self.summarizers:
+            usage = summarizer.token_usage
+            if not usage.requests:
+                continue
+            logger.info(
+                f"{summarizer.provider_name} usage: {usage.requests} requests, {usage.input_tokens} input tokens, "
+                f"{usage.cache_read_input_tokens} cache read tokens ({usage.cache_hit_ratio:.0%} of input), "
+                f"{usage.cache_creation_input_tokens} cache write tokens, {usage.output_tokens} output tokens"
+            )
+            if usage.full_transcript_tokens:
+                logger.info(
+                    f"{summarizer.provider_name} {summarizer.transcript_format} transcripts: "
+                    f"{usage.transcript_tokens} tokens instead of {usage.full_transcript_tokens} "
+                    f"({usage.transcript_reduction:.0%} reduction)"
+                )
+    
+    async def close(self) -> None:
+        """
+        Close the API clients of every summarizer.
+        """
+        for summarizer in self.summarizers:
+            try:
+                await summarizer.close()
+            except Exception as e:
+                logger.error(f"Error closing {summarizer.provider_name} client: {e}")
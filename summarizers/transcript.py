@@ -0,0 +1,305 @@
+"""
+Transcript Encoding
+
+This module turns Discord messages into the transcript lines sent to an
+LLM. The full format repeats the date, time and username on every line;
+the compact format groups consecutive messages by the same author, uses
+times relative to the start of the transcript, aliases long usernames
+and collapses repeated links and emoji, so the same conversation costs
+fewer input tokens.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from models.message import DiscordMessage
+from models.message_batch import MessageBatch
+from summarizers.chunking import pack_lines
+
+FULL = "full"
+COMPACT = "compact"
+TRANSCRIPT_FORMATS = (FULL, COMPACT)
+
+URL_PATTERN = re.compile(r"https?://\S+")
+# Custom Discord emoji, e.g. <:pepe:123456789> or <a:party:123456789>
+CUSTOM_EMOJI_PATTERN = re.compile(r"<a?:(\w+):\d+>")
+# The same emoji (or short symbol) repeated three or more times in a row
+EMOJI_RUN_PATTERN = re.compile(r"(:\w+:|[\u2600-\u27bf\U0001f000-\U0001faff]\ufe0f?)(?:\s*\1){2,}")
+
+@dataclass
+class Transcript:
+    """
+    Encoded transcript of a list of messages.
+
+    Header lines (time origin, alias legend) are needed to read every line,
+    so they are repeated at the top of each chunk the lines are split into.
+    Lines referring back to a link posted on an earlier line also keep a
+    version with the link written out, for chunks that don't include it.
+    """
+    lines: List[str]
+    header: List[str] = field(default_factory=list)
+    # Line index -> (index of the earliest line referred back to, line with the links written out)
+    expanded_lines: Dict[int, Tuple[int, str]] = field(default_factory=dict)
+
+    def pack(self, max_tokens: int, provider: str = "") -> List[List[str]]:
+        """
+        Pack the lines into chunks that fit within a token budget.
+
+        Link back-references only point into the chunk they appear in; those
+        to a line of an earlier chunk are written out as the link again.
+        Chunks are sized as if every link were written out, so they never
+        exceed the budget.
+
+        Args:
+            max_tokens: Token budget per chunk
+            provider: Provider name used to select the tokenizer profile
+
+        Returns:
+            List of chunks, each a list of lines
+        """
+        expanded = [self.expanded_lines.get(index, (index, line))[1] for index, line in enumerate(self.lines)]
+        chunks = pack_lines(expanded, max_tokens, provider)
+
+        start = 0
+        for chunk in chunks:
+            for position, line in enumerate(chunk):
+                index = start + position
+                referred = self.expanded_lines.get(index)
+                # Truncated lines are left as they were cut
+                if referred is not None and referred[0] >= start and line == referred[1]:
+                    chunk[position] = self.lines[index]
+            start += len(chunk)
+        return chunks
+
+def encode_transcript(messages: List[DiscordMessage], transcript_format: str = FULL) -> Transcript:
+    """
+    Encode messages in the given transcript format.
+
+    Args:
+        messages: Messages to encode
+        transcript_format: "full" or "compact"
+
+    Returns:
+        Encoded transcript, in chronological order
+    """
+    if transcript_format == COMPACT:
+        return encode_compact(messages)
+    return encode_full(messages)
+
+def encode_full(messages: Union[List[DiscordMessage], MessageBatch]) -> Transcript:
+    """
+    Encode messages as one "[timestamp] username: content" line each.
+
+    The messages are sorted and formatted as a columnar batch, which is
+    faster than formatting each message object even counting the packing.
+    Messages whose IDs are not snowflakes, e.g. from imports or tests, are
+    formatted one by one instead.
+
+    Args:
+        messages: Messages to encode, as a list or a batch
+
+    Returns:
+        Encoded transcript, in chronological order
+    """
+    if not isinstance(messages, MessageBatch):
+        try:
+            messages = MessageBatch.from_messages(messages)
+        except ValueError:
+            sorted_messages = sorted(messages, key=lambda m: m.timestamp_ms)
+            return Transcript(lines=[message.formatted_content for message in sorted_messages])
+    return Transcript(lines=messages.sorted().format_lines())
+
+def encode_compact(
+    messages: List[DiscordMessage],
+    group_gap_seconds: int = 600,
+    max_group_size: int = 20,
+    alias_min_length: int = 12
+) -> Transcript:
+    """
+    Encode messages in the compact transcript format.
+
+    Consecutive messages by the same author become one line, unless they are
+    further apart than the group gap. Each line starts with the time elapsed
+    since the first message, e.g. "+1:05" for one hour and five minutes.
+
+    Args:
+        messages: Messages to encode
+        group_gap_seconds: Maximum time between two messages of the same group
+        max_group_size: Maximum number of messages per line
+        alias_min_length: Usernames at least this long and posting more than
+            one group are replaced by a short alias
+
+    Returns:
+        Encoded transcript, in chronological order
+    """
+    sorted_messages = sorted(messages, key=lambda m: m.timestamp_ms)
+    if not sorted_messages:
+        return Transcript(lines=[])
+
+    origin = sorted_messages[0].timestamp
+    groups = _group_messages(sorted_messages, group_gap_seconds, max_group_size)
+    aliases = _build_aliases(groups, alias_min_length)
+
+    seen_links: Dict[str, Tuple[str, int]] = {}
+    lines: List[str] = []
+    expanded_lines: Dict[int, Tuple[int, str]] = {}
+    for group in groups:
+        line_index = len(lines)
+        earliest = line_index
+        contents = []
+        for message in group:
+            offset = _format_offset(message.timestamp, origin)
+            content, referred = _compact_content(message.content, seen_links, offset, line_index)
+            if not content:
+                continue
+            expanded = content
+            if referred < line_index:
+                # Same content with no table of earlier links, for chunks missing them
+                expanded, _ = _compact_content(message.content, {}, offset, line_index)
+                earliest = min(earliest, referred)
+            # Repeated messages ("gm", "gm", "gm") collapse into a count
+            if contents and contents[-1][0] == content:
+                contents[-1][2] += 1
+            else:
+                contents.append([content, expanded, 1])
+
+        if not contents:
+            continue
+
+        username = group[0].username
+        prefix = f"{_format_offset(group[0].timestamp, origin)} {aliases.get(username, username)}: "
+        lines.append(prefix + _join_contents((content, count) for content, _, count in contents))
+        if earliest < line_index:
+            expanded_lines[line_index] = (earliest, prefix + _join_contents((expanded, count) for _, expanded, count in contents))
+
+    header = [f"Times are hours:minutes since {origin.strftime('%Y-%m-%d %H:%M')}; \" | \" separates messages"]
+    if aliases:
+        header.append("Aliases: " + ", ".join(f"{alias}={username}" for username, alias in aliases.items()))
+
+    return Transcript(lines=lines, header=header, expanded_lines=expanded_lines)
+
+def _group_messages(
+    messages: List[DiscordMessage],
+    group_gap_seconds: int,
+    max_group_size: int
+) -> List[List[DiscordMessage]]:
+    """
+    Group consecutive messages by the same author.
+
+    Args:
+        messages: Messages in chronological order
+        group_gap_seconds: Maximum time between two messages of the same group
+        max_group_size: Maximum number of messages per group
+
+    Returns:
+        List of message groups
+    """
+    groups: List[List[DiscordMessage]] = []
+    for message in messages:
+        if groups:
+            last = groups[-1]
+            if (
+                last[-1].user_id == message.user_id
+                and len(last) < max_group_size
+                and message.timestamp_ms - last[-1].timestamp_ms <= group_gap_seconds * 1000
+            ):
+                last.append(message)
+                continue
+        groups.append([message])
+    return groups
+
+def _build_aliases(groups: List[List[DiscordMessage]], alias_min_length: int) -> Dict[str, str]:
+    """
+    Assign short aliases to long usernames that appear in several groups.
+
+    Args:
+        groups: Message groups
+        alias_min_length: Minimum username length worth aliasing
+
+    Returns:
+        Dictionary mapping usernames to aliases, in order of first appearance
+    """
+    counts: Dict[str, int] = {}
+    for group in groups:
+        username = group[0].username
+        counts[username] = counts.get(username, 0) + 1
+
+    aliases = {}
+    for username, count in counts.items():
+        if len(username) >= alias_min_length and count > 1:
+            aliases[username] = f"@{len(aliases) + 1}"
+    return aliases
+
+def _join_contents(contents) -> str:
+    """
+    Join the contents of a message group into the text of one line.
+
+    Args:
+        contents: (content, repeat count) pairs, in order
+
+    Returns:
+        Line text
+    """
+    return " | ".join(content if count == 1 else f"{content} (x{count})" for content, count in contents)
+
+def _compact_content(content: str, seen_links: Dict[str, Tuple[str, int]], offset: str, line_index: int) -> Tuple[str, int]:
+    """
+    Shrink the content of one message.
+
+    Args:
+        content: Message content
+        seen_links: Links already posted in the transcript, mapped to when
+            and on which line they were first posted
+        offset: Relative time of the message
+        line_index: Index of the line the message is on
+
+    Returns:
+        Tuple of (compacted content, index of the earliest line it refers
+        back to, or line_index if none)
+    """
+    referred = line_index
+
+    def replace_link(match: re.Match) -> str:
+        nonlocal referred
+        link = match.group(0)
+        first_posted: Optional[Tuple[str, int]] = seen_links.get(link)
+        if first_posted is None:
+            seen_links[link] = (offset, line_index)
+            return link
+        referred = min(referred, first_posted[1])
+        return f"[link from {first_posted[0]}]"
+
+    content = URL_PATTERN.sub(replace_link, content)
+    content = CUSTOM_EMOJI_PATTERN.sub(r":\1:", content)
+    content = EMOJI_RUN_PATTERN.sub(lambda match: f"{match.group(1)}x{_count_run(match)}", content)
+
+    # Newlines and whitespace runs would break the one-line-per-group layout
+    return " ".join(content.split()), referred
+
+def _count_run(match: re.Match) -> int:
+    """
+    Count the repetitions in a matched emoji run.
+
+    Args:
+        match: Match of EMOJI_RUN_PATTERN
+
+    Returns:
+        Number of times the emoji is repeated
+    """
+    return match.group(0).count(match.group(1))
+
+def _format_offset(timestamp: datetime, origin: datetime) -> str:
+    """
+    Format the time elapsed since the start of the transcript.
+
+    Args:
+        timestamp: Time of the message
+        origin: Time of the first message
+
+    Returns:
+        Offset such as "+0:05" or "+26:40"
+    """
+    minutes = int((timestamp - origin).total_seconds() // 60)
+    return f"+{minutes // 60}:{minutes % 60:02d}"
@@ -0,0 +1,28 @@
+"""
+Tests for the Anthropic prompt layout.
+"""
+
+import unittest
+
+from summarizers.anthropic import AnthropicSummarizer, CACHE_CONTROL
+
+class AnthropicPromptLayoutTest(unittest.TestCase):
+    def setUp(self):
+        self.summarizer = AnthropicSummarizer("key")
+    
+    def test_short_prompt_is_sent_unchanged(self):
+        system_prompt, user_prompt = self.summarizer.build_request("transcript")
+        
+        self.assertIsInstance(user_prompt, str)
+        self.assertIn("transcript", user_prompt)
+        self.assertNotIn("provided at the end of this message", user_prompt)
+    
+    def test_long_prompt_is_cached_ahead_of_the_text(self):
+        long_system_prompt = "Summarize the channel carefully. " * 400
+        system_prompt, user_prompt = self.summarizer.build_request("transcript", override_system_prompt=long_system_prompt)
+        
+        self.assertEqual(user_prompt[0]["cache_control"], CACHE_CONTROL)
+        self.assertEqual(user_prompt[-1]["text"], "transcript")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Tests for submitting, polling and collecting summary batch jobs.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from config.settings import SchedulerConfig
+from models.message import DiscordMessage
+from services.message_collector import CollectionSnapshot
+from services.summary_generator import SummaryGeneratorService
+from services.summary_scheduler import SummarySchedulerService
+from storage.batch_jobs import BatchJob, BatchJobStore
+from summarizers.anthropic import AnthropicSummarizer
+from summarizers.pool import SummarizerPool
+from tests.test_summarizer_pool import PrimarySummarizer
+
+class FakeBatches:
+    """
+    Stand-in for the Anthropic Message Batches API.
+    
+    Batches end after a given number of status checks. Every request
+    succeeds except those whose custom ID is listed as failing.
+    """
+    
+    def __init__(self, checks_until_ended: int = 2, failing_ids=()):
+        self.checks_until_ended = checks_until_ended
+        self.failing_ids = set(failing_ids)
+        self.submitted = []
+        self.checks = 0
+    
+    async def create(self, requests):
+        self.submitted = requests
+        return SimpleNamespace(id="batch-1")
+    
+    async def retrieve(self, batch_id):
+        self.checks += 1
+        ended = self.checks >= self.checks_until_ended
+        return SimpleNamespace(processing_status="ended" if ended else "in_progress")
+    
+    async def results(self, batch_id):
+        async def entries():
+            for request in self.submitted:
+                custom_id = request["custom_id"]
+                if custom_id in self.failing_ids:
+                    yield SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type="errored"))
+                    continue
+                message = SimpleNamespace(
+                    content=[SimpleNamespace(text=f"summary of {custom_id}")],
+                    usage=SimpleNamespace(input_tokens=100, output_tokens=10)
+                )
+                yield SimpleNamespace(custom_id=custom_id, result=SimpleNamespace(type="succeeded", message=message))
+        return entries()
+
+def batch_summarizer(batches: FakeBatches) -> AnthropicSummarizer:
+    summarizer = AnthropicSummarizer("key")
+    summarizer.client = SimpleNamespace(messages=SimpleNamespace(batches=batches))
+    return summarizer
+
+def make_message(channel_id: str, index: int) -> DiscordMessage:
+    return DiscordMessage(
+        id=str((index + 1) << 22),
+        content=f"message {index} in {channel_id}",
+        username="alice",
+        user_id="7",
+        timestamp=1700000000000 + index * 1000,
+        channel_id=channel_id
+    )
+
+async def two_channels():
+    yield "1", [make_message("1", index) for index in range(3)], "general"
+    yield "2", [make_message("2", index) for index in range(3)], "trading"
+
+class SummaryBatchTest(unittest.IsolatedAsyncioTestCase):
+    async def test_submit_poll_and_collect_results(self):
+        batches = FakeBatches(checks_until_ended=3, failing_ids={"2-0"})
+        generator = SummaryGeneratorService(None, SummarizerPool([batch_summarizer(batches)]))
+        
+        job = await generator.submit_summary_batch(CollectionSnapshot(two_channels()))
+        
+        self.assertEqual(job.batch_id, "batch-1")
+        self.assertEqual(job.provider_name, "Anthropic")
+        self.assertEqual([request["custom_id"] for request in batches.submitted], ["1-0", "2-0"])
+        self.assertEqual(job.channels["1"]["requests"], ["1-0"])
+        
+        summaries = await generator.wait_for_summary_batch(job, poll_interval=0)
+        
+        self.assertEqual(batches.checks, 3)
+        self.assertEqual(summaries["1"].content, "summary of 1-0")
+        self.assertEqual(summaries["1"].message_count, 3)
+        self.assertIsNone(summaries["2"])
+    
+    async def test_submitted_job_survives_a_restart(self):
+        batches = FakeBatches()
+        generator = SummaryGeneratorService(None, SummarizerPool([batch_summarizer(batches)]))
+        job = await generator.submit_summary_batch(CollectionSnapshot(two_channels()))
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "batch_jobs.json")
+            store = BatchJobStore(path)
+            store.set(job)
+            job.posted.append("1")
+            store.save()
+            
+            resumed = BatchJobStore(path).get()
+        
+        self.assertEqual(resumed.batch_id, job.batch_id)
+        self.assertEqual(resumed.channels, job.channels)
+        self.assertEqual(resumed.posted, ["1"])
+        
+        summaries = await generator.wait_for_summary_batch(resumed, poll_interval=0)
+        self.assertEqual(summaries["2"].content, "summary of 2-0")
+    
+    async def test_provider_without_batch_api_is_refused(self):
+        generator = SummaryGeneratorService(None, SummarizerPool([PrimarySummarizer(0.01)]))
+        
+        with self.assertRaises(ValueError):
+            await generator.submit_summary_batch(CollectionSnapshot(two_channels()))
+
+class BatchResumptionTest(unittest.IsolatedAsyncioTestCase):
+    async def test_stop_cancels_resumed_polling(self):
+        batches = FakeBatches(checks_until_ended=1000)
+        generator = SummaryGeneratorService(None, SummarizerPool([batch_summarizer(batches)]))
+        
+        with tempfile.TemporaryDirectory() as directory:
+            store = BatchJobStore(os.path.join(directory, "batch_jobs.json"))
+            store.set(BatchJob(batch_id="batch-1", provider_name="Anthropic", channels={}))
+            config = SchedulerConfig(summary_hour=0, summary_minute=0, batch_mode=True, batch_poll_seconds=3600)
+            scheduler = SummarySchedulerService(config, generator, None, 1, batch_jobs=store)
+            
+            await scheduler.start()
+            resume_task = scheduler._resume_task
+            while not batches.checks:
+                await asyncio.sleep(0)
+            await scheduler.stop()
+            
+            self.assertTrue(resume_task.cancelled())
+            self.assertEqual(BatchJobStore(store.path).get().batch_id, "batch-1")
+
+if __name__ == "__main__":
+    unittest.main()
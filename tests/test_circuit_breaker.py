@@ -0,0 +1,63 @@
+"""
+Tests for the provider circuit breaker.
+"""
+
+import asyncio
+import unittest
+
+from summarizers.base import BaseSummarizer
+from summarizers.health import CircuitBreaker, CircuitState
+
+class HangingSummarizer(BaseSummarizer):
+    """
+    Summarizer whose requests never complete until cancelled.
+    """
+    
+    async def _complete(self, system_prompt, user_prompt):
+        await asyncio.sleep(3600)
+        return "summary"
+    
+    async def _stream(self, system_prompt, user_prompt):
+        await asyncio.sleep(3600)
+        yield "summary"
+
+def half_open_breaker() -> CircuitBreaker:
+    """
+    Build a breaker that has tripped and finished its cool-down.
+    """
+    breaker = CircuitBreaker("Hanging", minimum_calls=1, cooldown_seconds=0.0)
+    breaker.record_failure(0.1)
+    assert breaker.state == CircuitState.HALF_OPEN
+    return breaker
+
+class CircuitBreakerCancellationTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cancelled_request_releases_trial_slot(self):
+        summarizer = HangingSummarizer("key", circuit_breaker=half_open_breaker())
+        task = asyncio.create_task(summarizer.request_summary("text"))
+        await asyncio.sleep(0)
+        self.assertFalse(summarizer.circuit_breaker.allow_request())
+        
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        
+        self.assertEqual(summarizer.circuit_breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(summarizer.circuit_breaker.allow_request())
+    
+    async def test_abandoned_stream_releases_trial_slot(self):
+        summarizer = HangingSummarizer("key", circuit_breaker=half_open_breaker())
+        
+        async def consume():
+            async for _ in summarizer.stream_text("text"):
+                pass
+        
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        
+        self.assertTrue(summarizer.circuit_breaker.allow_request())
+
+if __name__ == "__main__":
+    unittest.main()
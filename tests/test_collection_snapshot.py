@@ -0,0 +1,46 @@
+"""
+Tests for the run-scoped collection snapshot.
+"""
+
+import asyncio
+import unittest
+
+from services.message_collector import CollectionSnapshot
+
+async def slow_source(channel_count: int, calls: list):
+    """
+    Yield empty channels one at a time, recording every channel collected.
+    """
+    for index in range(channel_count):
+        await asyncio.sleep(0.01)
+        calls.append(str(index))
+        yield str(index), [], f"channel-{index}"
+
+class CollectionSnapshotTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_consumers_share_one_collection(self):
+        calls = []
+        snapshot = CollectionSnapshot(slow_source(3, calls))
+        
+        async def consume():
+            return [channel_id async for channel_id, _, _ in snapshot.iter_channels()]
+        
+        first, second = await asyncio.gather(consume(), consume())
+        
+        self.assertEqual(first, ["0", "1", "2"])
+        self.assertEqual(second, ["0", "1", "2"])
+        self.assertEqual(calls, ["0", "1", "2"])
+    
+    async def test_consumer_stopping_early_does_not_end_collection(self):
+        calls = []
+        snapshot = CollectionSnapshot(slow_source(3, calls))
+        
+        channels = snapshot.iter_channels()
+        async for _ in channels:
+            break
+        await channels.aclose()
+        
+        self.assertEqual(list(await snapshot.get_all()), ["0", "1", "2"])
+        self.assertEqual(calls, ["0", "1", "2"])
+
+if __name__ == "__main__":
+    unittest.main()
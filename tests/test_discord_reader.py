@@ -0,0 +1,60 @@
+"""
+Tests for collecting a channel's time window over sub-ranges.
+"""
+
+import re
+import unittest
+from datetime import timedelta
+
+from clients.discord_reader import DiscordReaderClient
+from utils.snowflake import datetime_to_snowflake, utc_now
+
+class FakeChannelReader(DiscordReaderClient):
+    """
+    Reader serving one channel's messages from memory instead of the API.
+    """
+    
+    def __init__(self, message_count: int):
+        super().__init__("token", max_range_fetches=4)
+        start = datetime_to_snowflake(utc_now() - timedelta(hours=2))
+        step = (1 << 22) * 3000  # One message every 3 seconds
+        self.message_ids = [start + index * step for index in range(message_count)]
+        # Cursors whose page request fails
+        self.failing_cursors = range(0)
+        self.requested_cursors = []
+    
+    async def _make_request(self, endpoint, method="GET", payload=None):
+        if endpoint.startswith("/channels/") and "/messages" not in endpoint:
+            return {"name": "busy-channel"}
+        
+        after = int(re.search(r"after=(\d+)", endpoint).group(1))
+        self.requested_cursors.append(after)
+        if after in self.failing_cursors:
+            return None
+        
+        newer = [message_id for message_id in self.message_ids if message_id > after][:100]
+        return [
+            {"id": str(message_id), "content": f"message {message_id}", "channel_id": "1", "author": {"id": "7", "username": "user"}}
+            for message_id in reversed(newer)
+        ]
+
+class CollectWindowTest(unittest.IsolatedAsyncioTestCase):
+    async def test_busy_channel_is_collected_in_sub_ranges(self):
+        reader = FakeChannelReader(2000)
+        
+        batch, channel_name = await reader.collect_message_batch("1", days=1)
+        
+        self.assertEqual(channel_name, "busy-channel")
+        self.assertEqual([int(message.id) for message in batch.to_messages()], reader.message_ids)
+    
+    async def test_failing_page_fails_the_whole_window(self):
+        # Pages in the middle of the window fail; the newest sub-range still succeeds
+        reader = FakeChannelReader(2000)
+        reader.failing_cursors = range(reader.message_ids[900], reader.message_ids[1100])
+        
+        with self.assertRaises(RuntimeError):
+            await reader.collect_message_batch("1", days=1)
+        self.assertTrue(any(cursor >= reader.message_ids[1500] for cursor in reader.requested_cursors))
+
+if __name__ == "__main__":
+    unittest.main()
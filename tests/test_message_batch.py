@@ -0,0 +1,55 @@
+"""
+Tests for the columnar message batch.
+"""
+
+import unittest
+
+from models.message import DiscordMessage
+from models.message_batch import MessageBatch
+from summarizers.transcript import encode_full
+
+def raw_message(message_id: int, content: str) -> dict:
+    return {
+        "id": str(message_id),
+        "content": content,
+        "channel_id": "1",
+        "author": {"id": "7", "username": "crypto_user_7"},
+        "attachments": [],
+        "embeds": [],
+        "mentions": []
+    }
+
+class FromPagesTest(unittest.TestCase):
+    def test_malformed_message_is_skipped(self):
+        malformed = raw_message(1 << 23, "no author")
+        malformed["author"] = None
+        page = [raw_message(1 << 22, "first"), malformed, raw_message(3 << 22, "last")]
+        
+        with self.assertLogs("models.message_batch", level="WARNING"):
+            batch = MessageBatch.from_pages([page])
+        
+        messages = batch.to_messages()
+        self.assertEqual([message.content for message in messages], ["first", "last"])
+        self.assertEqual([message.id for message in messages], [str(1 << 22), str(3 << 22)])
+        self.assertEqual({message.username for message in messages}, {"crypto_user_7"})
+
+class NonSnowflakeIdTest(unittest.TestCase):
+    def setUp(self):
+        self.messages = [
+            DiscordMessage(id="imported-2", content="second", username="bob", user_id="bob", timestamp=1700000060000, channel_id="general"),
+            DiscordMessage(id="imported-1", content="first", username="alice", user_id="alice", timestamp=1700000000000, channel_id="general"),
+        ]
+    
+    def test_from_messages_rejects_non_snowflake_ids(self):
+        with self.assertRaises(ValueError):
+            MessageBatch.from_messages(self.messages)
+    
+    def test_full_transcript_formats_non_snowflake_ids(self):
+        transcript = encode_full(self.messages)
+        self.assertEqual(transcript.lines, [
+            "[2023-11-14 22:13:20] alice: first",
+            "[2023-11-14 22:14:20] bob: second",
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
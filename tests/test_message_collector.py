@@ -0,0 +1,46 @@
+"""
+Tests for incremental message collection.
+"""
+
+import os
+import tempfile
+import unittest
+
+from config.settings import DiscordReaderConfig
+from services.message_collector import MessageCollectorService
+from storage.message_store import MessageStore
+from storage.watermarks import WatermarkStore
+from tests.test_discord_reader import FakeChannelReader
+
+class IncrementalCollectionTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.message_store = MessageStore(os.path.join(self.directory.name, "messages.db"))
+        self.watermarks = WatermarkStore(os.path.join(self.directory.name, "collection_state.json"))
+        self.reader = FakeChannelReader(2000)
+        self.collector = MessageCollectorService(
+            self.reader,
+            DiscordReaderConfig(user_token="token", guild_id=None, channel_ids=["1"], incremental=True),
+            watermarks=self.watermarks,
+            message_store=self.message_store
+        )
+    
+    async def asyncTearDown(self):
+        self.message_store.close()
+        self.directory.cleanup()
+    
+    async def test_watermark_does_not_move_after_partial_fetch(self):
+        self.reader.failing_cursors = range(self.reader.message_ids[900], self.reader.message_ids[1100])
+        
+        with self.assertRaises(RuntimeError):
+            await self.collector.collect_from_channel("1")
+        self.assertIsNone(self.watermarks.get("1"))
+        
+        # The next run fetches the whole window again
+        self.reader.failing_cursors = range(0)
+        messages, _ = await self.collector.collect_from_channel("1")
+        self.assertEqual(len(messages), 2000)
+        self.assertEqual(self.watermarks.get("1"), str(self.reader.message_ids[-1]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for the message filters.
+"""
+
+import random
+import unittest
+
+from models.message import DiscordMessage
+from services.message_filter import LowInformationFilter, NearDuplicateFilter
+
+def make_message(index: int, content: str) -> DiscordMessage:
+    return DiscordMessage(
+        id=str(index),
+        content=content,
+        username=f"user_{index}",
+        user_id=str(index),
+        timestamp=1700000000000 + index * 1000,
+        channel_id="1"
+    )
+
+class NonEnglishMessageTest(unittest.TestCase):
+    def test_low_information_keeps_non_english_messages(self):
+        messages = [
+            make_message(0, "Привет, как дела с новым токеном? Цена упала на 20%"),
+            make_message(1, "Le prix a chuté après l'annonce du déblocage"),
+            make_message(2, "gm"),
+        ]
+        kept = LowInformationFilter().filter(messages)
+        self.assertEqual([message.id for message in kept], ["0", "1"])
+    
+    def test_near_duplicate_tells_non_english_messages_apart(self):
+        post = (
+            "Срочно! Новый аирдроп для всех держателей токена, заходите на сайт проекта и подключайте кошелёк "
+            "до конца недели, осталось 500 мест. Команда обещает листинг на крупной бирже в следующем месяце, "
+            "а ранние участники получат бонус к наградам за стейкинг. Не пропустите шанс, подробности и правила "
+            "участия в закреплённом сообщении канала, вопросы задавайте модераторам"
+        )
+        messages = [
+            make_message(0, post),
+            make_message(1, "Команда объявила о разблокировке токенов на следующей неделе, цена может упасть"),
+            make_message(2, post.replace("недели", "месяца")),
+        ]
+        kept = NearDuplicateFilter().filter(messages)
+        self.assertEqual([message.id for message in kept], ["0", "1"])
+
+class NearDuplicateIndexTest(unittest.TestCase):
+    def test_banded_index_finds_every_fingerprint_within_the_distance(self):
+        rng = random.Random(7)
+        near_duplicate_filter = NearDuplicateFilter(max_distance=3)
+        
+        # Clusters of fingerprints differing from a center in up to 6 bits,
+        # so that lookups hit both sides of the maximum distance
+        fingerprints = []
+        for _ in range(50):
+            center = rng.getrandbits(64)
+            for _ in range(20):
+                fingerprint = center
+                for bit in rng.sample(range(64), rng.randint(0, 6)):
+                    fingerprint ^= 1 << bit
+                fingerprints.append(fingerprint)
+        rng.shuffle(fingerprints)
+        
+        index = {}
+        kept = []
+        for fingerprint in fingerprints:
+            expected = any((fingerprint ^ other).bit_count() <= 3 for other in kept)
+            self.assertEqual(near_duplicate_filter._has_near_duplicate(index, fingerprint), expected)
+            if not expected:
+                near_duplicate_filter._add_to_index(index, fingerprint)
+                kept.append(fingerprint)
+    
+    def test_edited_copy_of_a_long_post_is_dropped(self):
+        post = " ".join(f"word{index}" for index in range(80))
+        messages = [
+            make_message(0, post),
+            make_message(1, "gm everyone, what do you think about the unlock next week and the new listing"),
+            make_message(2, post.replace("word40", "edited")),
+        ]
+        kept = NearDuplicateFilter().filter(messages)
+        self.assertEqual([message.id for message in kept], ["0", "1"])
+
+if __name__ == "__main__":
+    unittest.main()
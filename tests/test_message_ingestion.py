@@ -0,0 +1,53 @@
+"""
+Tests for healing the gaps of realtime ingestion over REST.
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import timedelta
+
+from services.message_ingestion import MessageIngestionService
+from storage.message_store import MessageStore
+from storage.watermarks import WatermarkStore
+from tests.test_discord_reader import FakeChannelReader
+from utils.snowflake import utc_now
+
+class HealChannelTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.message_store = MessageStore(os.path.join(self.directory.name, "messages.db"))
+        self.reader = FakeChannelReader(2000)
+        self.service = MessageIngestionService(
+            writer=None,
+            reader=self.reader,
+            message_store=self.message_store,
+            watermarks=WatermarkStore(os.path.join(self.directory.name, "ingestion_state.json")),
+            channel_ids=["1"]
+        )
+        self.service.connected = True
+    
+    async def asyncTearDown(self):
+        self.message_store.close()
+        self.directory.cleanup()
+    
+    async def test_healed_channel_becomes_live(self):
+        await self.service._heal_channel("1", "busy-channel")
+        
+        self.assertTrue(self.service.is_live("1"))
+        self.assertEqual(len(self.message_store.get_messages("1", utc_now() - timedelta(days=1))), 2000)
+        self.assertEqual(self.service.watermarks.get("1"), str(self.reader.message_ids[-1]))
+    
+    async def test_failed_heal_does_not_make_channel_live(self):
+        self.reader.failing_cursors = range(self.reader.message_ids[900], self.reader.message_ids[1100])
+        
+        with self.assertRaises(RuntimeError):
+            await self.service._heal_channel("1", "busy-channel")
+        await self.service.flush()
+        
+        self.assertFalse(self.service.is_live("1"))
+        self.assertIsNone(self.service.watermarks.get("1"))
+        self.assertEqual(self.service._pending, [])
+
+if __name__ == "__main__":
+    unittest.main()
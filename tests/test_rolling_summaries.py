@@ -0,0 +1,32 @@
+"""
+Tests for persisting rolling summaries.
+"""
+
+import os
+import tempfile
+import unittest
+
+from services.message_collector import CollectionSnapshot
+from services.summary_generator import SummaryGeneratorService
+from storage.rolling_summaries import RollingSummaryStore
+from summarizers.pool import SummarizerPool
+from tests.test_batch_summaries import two_channels
+from tests.test_summarizer_pool import PrimarySummarizer
+
+class RollingSummaryStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def test_parallel_channel_summaries_are_all_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = RollingSummaryStore(os.path.join(directory, "rolling_summaries.json"))
+            generator = SummaryGeneratorService(
+                None, SummarizerPool([PrimarySummarizer(0.01)]), rolling_summaries=store
+            )
+            
+            await generator.generate_all_channel_summaries(snapshot=CollectionSnapshot(two_channels()))
+            
+            saved = RollingSummaryStore(store.path)
+            self.assertEqual(sorted(saved.summaries), ["1", "2"])
+            self.assertEqual(saved.get("1").last_message_id, str(3 << 22))
+            self.assertFalse(os.path.exists(f"{store.path}.tmp"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Tests for merging summaries in rounds.
+"""
+
+import unittest
+
+from summarizers.base import BaseSummarizer
+
+class VerboseSummarizer(BaseSummarizer):
+    """
+    Summarizer whose summaries fill most of its input budget, so merged
+    summaries never fit together in one request.
+    """
+    
+    max_input_tokens = 200
+    
+    def __init__(self):
+        super().__init__("key")
+        self.requests = 0
+    
+    async def _complete(self, system_prompt, user_prompt):
+        self.requests += 1
+        return "word " * 150
+
+class ReduceSummariesTest(unittest.IsolatedAsyncioTestCase):
+    async def test_merging_stops_when_it_makes_no_progress(self):
+        summarizer = VerboseSummarizer()
+        
+        with self.assertLogs("summarizers.base", level="ERROR"):
+            merged = await summarizer.reduce_summaries(["short summary " * 20] * 12)
+        
+        self.assertIsNone(merged)
+        self.assertLess(summarizer.requests, 30)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests for hedging in the summarizer pool.
+"""
+
+import asyncio
+import unittest
+
+from summarizers.base import BaseSummarizer
+from summarizers.pool import SummarizerPool
+
+class SleepingSummarizer(BaseSummarizer):
+    """
+    Summarizer whose requests take a fixed time.
+    """
+    
+    def __init__(self, delay: float):
+        super().__init__("key")
+        self.delay = delay
+        self.cancelled = 0
+    
+    async def _complete(self, system_prompt, user_prompt):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return f"summary from {self.provider_name}"
+    
+    async def _stream(self, system_prompt, user_prompt):
+        yield await self._complete(system_prompt, user_prompt)
+
+class PrimarySummarizer(SleepingSummarizer):
+    pass
+
+class SecondarySummarizer(SleepingSummarizer):
+    pass
+
+async def three_requests(summarizer: BaseSummarizer) -> str:
+    """
+    Operation sending three requests in a row, like a chunked summary.
+    """
+    for _ in range(3):
+        summary_text = await summarizer.summarize_text("text")
+    return summary_text
+
+class SummarizerPoolHedgingTest(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        primary, secondary = PrimarySummarizer(5.0), SecondarySummarizer(0.01)
+        pool = SummarizerPool([primary, secondary], hedging=True, hedge_default_delay=0.05)
+        
+        result = await pool.run(lambda summarizer: summarizer.summarize_text("text"))
+        
+        self.assertEqual(result.provider_name, "Secondary")
+        self.assertEqual(primary.cancelled, 1)
+        self.assertEqual(pool.hedge_stats["Primary"].hedged, 1)
+        self.assertEqual(pool.hedge_stats["Secondary"].wins, 1)
+    
+    async def test_hedge_delay_compares_whole_operations(self):
+        primary, secondary = PrimarySummarizer(0.05), SecondarySummarizer(0.01)
+        pool = SummarizerPool([primary, secondary], hedging=True, hedge_default_delay=5.0, min_latency_samples=1)
+        
+        result = await pool.run(three_requests)
+        
+        # Timed like the hedge timer: the whole operation, not each of its 0.05 second requests
+        self.assertEqual(result.provider_name, "Primary")
+        self.assertGreaterEqual(pool.hedge_delay(primary), 0.15)
+    
+    async def test_cache_hits_are_not_recorded(self):
+        primary, secondary = PrimarySummarizer(0.01), SecondarySummarizer(0.01)
+        pool = SummarizerPool([primary, secondary], hedging=True)
+        
+        async def cached(summarizer):
+            return "cached summary"
+        
+        result = await pool.run(lambda summarizer: summarizer.summarize_text("text"), cached)
+        
+        self.assertEqual(result.text, "cached summary")
+        self.assertEqual(len(pool.latencies["Primary"]), 0)
+        self.assertEqual(pool.hedge_delay(primary), pool.hedge_default_delay)
+
+if __name__ == "__main__":
+    unittest.main()
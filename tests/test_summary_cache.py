@@ -0,0 +1,34 @@
+"""
+Tests for the summary cache keys.
+"""
+
+import unittest
+
+from storage.summary_cache import build_cache_key
+
+def key(**overrides) -> str:
+    parameters = {
+        "items": ["1:gm", "2:price is up"],
+        "system_prompt": "system",
+        "user_prompt": "user {text}",
+        "model": "model",
+        "max_tokens": 1000,
+    }
+    parameters.update(overrides)
+    return build_cache_key(**parameters)
+
+class CacheKeyTest(unittest.TestCase):
+    def test_identical_requests_share_a_key(self):
+        self.assertEqual(key(), key())
+    
+    def test_transcript_format_changes_the_key(self):
+        self.assertNotEqual(key(transcript_format="full"), key(transcript_format="compact"))
+    
+    def test_filter_settings_change_the_key(self):
+        self.assertNotEqual(
+            key(filter_settings="near_duplicate(max_distance=3, min_tokens=5)"),
+            key(filter_settings="near_duplicate(max_distance=5, min_tokens=5)")
+        )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests for the compact transcript format.
+"""
+
+import re
+import unittest
+
+from models.message import DiscordMessage
+from summarizers.chunking import estimate_tokens
+from summarizers.transcript import encode_compact
+
+CONVERSATION = [
+    ("alice", "chart https://example.com/chart.png"),
+    ("bob", "nice"),
+    ("carol", "which one?"),
+    ("alice", "again https://example.com/chart.png"),
+    ("bob", "https://example.com/chart.png looks bullish"),
+]
+
+def conversation_messages():
+    return [
+        DiscordMessage(
+            id=str((index + 1) << 22),
+            content=content,
+            username=username,
+            user_id=username,
+            timestamp=1700000000000 + index * 60000,
+            channel_id="1"
+        )
+        for index, (username, content) in enumerate(CONVERSATION)
+    ]
+
+class CompactTranscriptTest(unittest.TestCase):
+    def test_link_back_references_stay_within_one_chunk(self):
+        transcript = encode_compact(conversation_messages())
+        budget = max(estimate_tokens(line) for line in transcript.lines[:3]) * 2
+        
+        chunks = transcript.pack(budget)
+        
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(transcript.lines))
+        for chunk in chunks:
+            self.assertTrue(all(estimate_tokens(line) <= budget for line in chunk))
+            for offset in re.findall(r"\[link from (\+\d+:\d\d)\]", "\n".join(chunk)):
+                self.assertTrue(any(line.startswith(offset) and "https://" in line for line in chunk))
+        self.assertIn("https://example.com/chart.png", "\n".join(chunks[-1]))
+    
+    def test_single_chunk_keeps_back_references(self):
+        transcript = encode_compact(conversation_messages())
+        
+        chunks = transcript.pack(10000)
+        
+        self.assertEqual(chunks, [transcript.lines])
+        self.assertEqual("\n".join(transcript.lines).count("https://"), 1)
+        self.assertEqual("\n".join(transcript.lines).count("[link from +0:00]"), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+"""
+Tests for the collection watermark store.
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from storage.watermarks import WatermarkStore
+
+class WatermarkStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_executor_saves_keep_newest_marks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = WatermarkStore(os.path.join(directory, "collection_state.json"))
+            loop = asyncio.get_running_loop()
+            
+            saves = []
+            for index in range(50):
+                store.update(str(index % 5), str(index + 1))
+                saves.append(loop.run_in_executor(None, store.save))
+            await asyncio.gather(*saves)
+            
+            self.assertEqual(WatermarkStore(store.path).watermarks, store.watermarks)
+            self.assertFalse(os.path.exists(f"{store.path}.tmp"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,8 @@ class PromptTemplates:
     Attributes:
         DEFAULT_SYSTEM_PROMPT (str): A generic system prompt for basic summarization.
         DEFAULT_USER_PROMPT (str): A standard template for formatting user input.
+        MERGE_USER_PROMPT (str): A template for merging partial summaries of one conversation.
+        ROLLING_USER_PROMPT (str): A template for folding new messages into a previous summary.
         SPECIALIZED_PROMPTS (Dict[str, Dict[str, str]]): A collection of context-specific prompts.
     """
 
@@ -54,6 +56,34 @@ class PromptTemplates:
     - Present information in a structured, easy-to-understand format
     """
 
+    MERGE_USER_PROMPT: str = """
+    The following are partial summaries of consecutive segments of the same
+    conversation, in chronological order. Merge them into a single summary.
+
+    Partial Summaries:
+    {text}
+
+    Merge Requirements:
+    - Combine information about the same topic from different segments
+    - Keep every concrete metric, strategy and link from the partial summaries
+    - Remove repetition between segments
+    - Present information in a structured, easy-to-understand format
+    """
+
+    ROLLING_USER_PROMPT: str = """
+    Below is the previous summary of this conversation, followed by what was
+    posted since it was written. Update the summary so it covers both.
+
+    {text}
+
+    Update Requirements:
+    - Integrate new information into the existing structure of the summary
+    - Update metrics, strategies and decisions that changed; keep those that did not
+    - Keep every relevant link from the previous summary and the new messages
+    - Drop topics from the previous summary only if the new messages make them obsolete
+    - Present information in a structured, easy-to-understand format
+    """
+
     SPECIALIZED_PROMPTS: Dict[str, Dict[str, str]] = {
         'general': {
             'system_prompt': DEFAULT_SYSTEM_PROMPT,
@@ -131,6 +161,33 @@ class PromptTemplates:
             - Organize information by asset or market segment for clarity
             - Prioritize actionable trading or investment information
             """
+        },
+        'combined': {
+            'system_prompt': """
+            You are an editor producing a single cross-channel digest from summaries
+            that have already been written for individual Discord channels.
+
+            Editing Priorities:
+            1. Surface the most important developments across all channels first
+            2. Merge topics that were discussed in more than one channel
+            3. Preserve specific data, figures, strategies and links from the summaries
+            4. Note which channel each key point came from
+            5. Drop repetition and low-value detail rather than important channels
+            """,
+            'user_prompt': """
+            Combine the following per-channel summaries into one overview of
+            everything that happened across the server.
+
+            Channel Summaries:
+            {text}
+
+            Digest Requirements:
+            - Start with the key highlights across all channels
+            - Group related information by topic, citing the source channels
+            - Keep every concrete metric, strategy and link that matters
+            - Make sure no channel with significant activity is left out
+            - Present information in a structured, easy-to-understand format
+            """
         }
     }
 
@@ -188,6 +245,9 @@ class PromptTemplates:
             # Fallback to general prompts
             prompts = cls.SPECIALIZED_PROMPTS['general']
         
+        # Copy so that overrides never modify the shared templates
+        prompts = dict(prompts)
+        
         # Apply prompt overrides
         if override_system_prompt is not None:
             prompts['system_prompt'] = override_system_prompt
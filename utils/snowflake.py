@@ -0,0 +1,83 @@
+"""
+Discord Snowflake Utilities
+
+Discord IDs are snowflakes whose upper 42 bits encode the creation time in
+milliseconds since the Discord epoch (2015-01-01T00:00:00Z). These helpers
+convert between snowflakes and the naive UTC datetimes used by the models.
+"""
+
+from datetime import datetime, timezone
+from typing import List, Tuple, Union
+
+DISCORD_EPOCH_MS = 1420070400000
+
+def snowflake_to_datetime(snowflake: Union[str, int]) -> datetime:
+    """
+    Get the creation time encoded in a snowflake.
+    
+    Args:
+        snowflake: Discord snowflake ID
+        
+    Returns:
+        Naive datetime in UTC
+    """
+    milliseconds = (int(snowflake) >> 22) + DISCORD_EPOCH_MS
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+def snowflake_to_epoch_ms(snowflake: Union[str, int]) -> int:
+    """
+    Get the creation time encoded in a snowflake as epoch milliseconds.
+    
+    Args:
+        snowflake: Discord snowflake ID
+        
+    Returns:
+        Milliseconds since the Unix epoch
+    """
+    return (int(snowflake) >> 22) + DISCORD_EPOCH_MS
+
+def datetime_to_snowflake(moment: datetime) -> int:
+    """
+    Get the smallest snowflake that could have been created at a given time.
+    
+    Args:
+        moment: Datetime to convert; naive datetimes are interpreted as UTC
+        
+    Returns:
+        Snowflake ID usable as a pagination cursor
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    milliseconds = int(moment.timestamp() * 1000) - DISCORD_EPOCH_MS
+    return max(0, milliseconds) << 22
+
+def split_snowflake_range(start: int, end: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split a snowflake range into contiguous sub-ranges covering equal time spans.
+    
+    Sub-range boundaries fall on whole milliseconds, so every message of the
+    range belongs to exactly one sub-range.
+    
+    Args:
+        start: First snowflake of the range, inclusive
+        end: Snowflake ending the range, exclusive
+        parts: Number of sub-ranges wanted
+        
+    Returns:
+        List of (start, end) snowflake pairs, oldest first; fewer than parts
+        if the range spans fewer milliseconds
+    """
+    start_ms, end_ms = start >> 22, -(-end >> 22)
+    parts = max(1, min(parts, end_ms - start_ms))
+    
+    bounds = [start] + [(start_ms + (end_ms - start_ms) * i // parts) << 22 for i in range(1, parts)] + [end]
+    return [(low, high) for low, high in zip(bounds, bounds[1:]) if low < high]
+
+def utc_now() -> datetime:
+    """
+    Get the current time as a naive UTC datetime, comparable with message timestamps.
+    
+    Returns:
+        Current naive datetime in UTC
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)